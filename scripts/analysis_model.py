@@ -0,0 +1,235 @@
+"""
+Modelo tipado e compacto das análises de currículo
+"""
+
+import sys
+import json
+import zlib
+import marshal
+from typing import Any, Dict, Iterable, Tuple, Union
+
+# Primeiro byte da serialização binária
+FORMAT_MARSHAL = 1            # Só em memória (chaves de cache): o marshal muda entre versões do Python
+FORMAT_MARSHAL_ZLIB = 2       # Gravado por versões anteriores; lido apenas para conversão
+FORMAT_JSON_ZLIB = 3          # Formato persistente
+
+def _strings(values: Iterable[Any]) -> Tuple[str, ...]:
+    """Converte uma lista de textos em tupla de strings"""
+    return tuple(str(value) for value in values or ())
+
+def _keywords(values: Iterable[Any]) -> Tuple[str, ...]:
+    """
+    Converte uma lista de palavras-chave em tupla de strings internadas
+    
+    As palavras-chave se repetem entre análises; internadas, cada uma fica uma
+    única vez em memória. Texto livre do modelo (sugestões, feedback) não é
+    internado: strings internadas nunca são liberadas.
+    """
+    return tuple(sys.intern(str(value)) for value in values or ())
+
+class _Record:
+    """Base dos registros com __slots__ (igualdade e repr pelos campos)"""
+    
+    __slots__ = ()
+    
+    def to_tuple(self) -> tuple:
+        """Campos do registro em ordem, apenas com tipos básicos"""
+        raise NotImplementedError
+    
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self.to_tuple() == other.to_tuple()
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class CriterionResult(_Record):
+    """Avaliação de um critério textual (clareza ou estrutura)"""
+    
+    __slots__ = ("score", "feedback", "suggestions")
+    
+    def __init__(self, score: float, feedback: str = "", suggestions: Iterable[str] = ()):
+        self.score = score
+        self.feedback = str(feedback or "")
+        self.suggestions = _strings(suggestions)
+    
+    def to_tuple(self) -> tuple:
+        return (self.score, self.feedback, self.suggestions)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Estrutura original (JSON do modelo)"""
+        return {"score": self.score, "feedback": self.feedback, "suggestions": list(self.suggestions)}
+
+class KeywordResult(_Record):
+    """Avaliação das palavras-chave"""
+    
+    __slots__ = ("score", "present", "missing", "suggestions")
+    
+    def __init__(self, score: float, present: Iterable[str] = (), missing: Iterable[str] = (),
+                 suggestions: Iterable[str] = ()):
+        self.score = score
+        self.present = _keywords(present)
+        self.missing = _keywords(missing)
+        self.suggestions = _strings(suggestions)
+    
+    def to_tuple(self) -> tuple:
+        return (self.score, self.present, self.missing, self.suggestions)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Estrutura original (JSON do modelo)"""
+        return {
+            "score": self.score,
+            "missing": list(self.missing),
+            "present": list(self.present),
+            "suggestions": list(self.suggestions)
+        }
+
+class Analysis(_Record):
+    """Análise completa de um currículo"""
+    
+    __slots__ = ("overall_score", "clarity", "structure", "keywords", "improvements", "strengths", "summary")
+    
+    def __init__(self, overall_score: float, clarity: CriterionResult, structure: CriterionResult,
+                 keywords: KeywordResult, improvements: Iterable[str] = (), strengths: Iterable[str] = (),
+                 summary: str = ""):
+        self.overall_score = overall_score
+        self.clarity = clarity
+        self.structure = structure
+        self.keywords = keywords
+        self.improvements = _strings(improvements)
+        self.strengths = _strings(strengths)
+        self.summary = str(summary or "")
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Analysis":
+        """
+        Cria o modelo a partir do JSON validado do Gemini
+        
+        Args:
+            data: Análise no formato de validate_analysis_response
+        
+        Returns:
+            Analysis: Análise tipada
+        """
+        clarity = data['clarity']
+        structure = data['structure']
+        keywords = data['keywords']
+        return cls(
+            data['overallScore'],
+            CriterionResult(clarity['score'], clarity.get('feedback', ""), clarity.get('suggestions', ())),
+            CriterionResult(structure['score'], structure.get('feedback', ""), structure.get('suggestions', ())),
+            KeywordResult(keywords['score'], keywords.get('present', ()), keywords.get('missing', ()),
+                          keywords.get('suggestions', ())),
+            data.get('improvements', ()),
+            data.get('strengths', ()),
+            data.get('summary', "")
+        )
+    
+    @classmethod
+    def coerce(cls, value: Union["Analysis", Dict[str, Any]]) -> "Analysis":
+        """Aceita uma análise tipada ou o dicionário equivalente"""
+        return value if isinstance(value, cls) else cls.from_dict(value)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Estrutura original (JSON do modelo), para exportação e relatórios"""
+        return {
+            "overallScore": self.overall_score,
+            "clarity": self.clarity.to_dict(),
+            "structure": self.structure.to_dict(),
+            "keywords": self.keywords.to_dict(),
+            "improvements": list(self.improvements),
+            "strengths": list(self.strengths),
+            "summary": self.summary
+        }
+    
+    def to_tuple(self) -> tuple:
+        return (
+            self.overall_score, self.clarity.to_tuple(), self.structure.to_tuple(), self.keywords.to_tuple(),
+            self.improvements, self.strengths, self.summary
+        )
+    
+    @classmethod
+    def from_tuple(cls, values: tuple) -> "Analysis":
+        """
+        Reconstrói a análise a partir de to_tuple
+        
+        Os campos são atribuídos sem nova conversão: as tuplas lidas por marshal
+        já vêm com as palavras-chave internadas.
+        """
+        overall, clarity, structure, keywords, improvements, strengths, summary = values
+        analysis = cls.__new__(cls)
+        analysis.overall_score = overall
+        analysis.clarity = CriterionResult.__new__(CriterionResult)
+        analysis.clarity.score, analysis.clarity.feedback, analysis.clarity.suggestions = clarity
+        analysis.structure = CriterionResult.__new__(CriterionResult)
+        analysis.structure.score, analysis.structure.feedback, analysis.structure.suggestions = structure
+        analysis.keywords = KeywordResult.__new__(KeywordResult)
+        (analysis.keywords.score, analysis.keywords.present,
+         analysis.keywords.missing, analysis.keywords.suggestions) = keywords
+        analysis.improvements = improvements
+        analysis.strengths = strengths
+        analysis.summary = summary
+        return analysis
+    
+    @property
+    def scores(self) -> Tuple[float, float, float, float]:
+        """Notas (geral, clareza, estrutura, palavras-chave)"""
+        return (self.overall_score, self.clarity.score, self.structure.score, self.keywords.score)
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serialização binária para gravação (banco e snapshots)
+        
+        JSON compacto comprimido com zlib: legível por qualquer versão do Python.
+        
+        Returns:
+            bytes: Byte de formato seguido do conteúdo
+        """
+        payload = json.dumps(self.to_tuple(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return bytes((FORMAT_JSON_ZLIB,)) + zlib.compress(payload, 6)
+    
+    def to_key(self) -> bytes:
+        """
+        Serialização rápida para chaves de cache dentro do processo
+        
+        Usa marshal, várias vezes mais rápido que JSON, mas cujo formato não é
+        garantido entre versões do Python: nunca grave o resultado em disco.
+        
+        Returns:
+            bytes: Byte de formato seguido do conteúdo
+        """
+        return bytes((FORMAT_MARSHAL,)) + marshal.dumps(self.to_tuple())
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Analysis":
+        """
+        Lê uma análise gravada por to_bytes ou to_key
+        
+        Args:
+            data: Bytes serializados
+        
+        Returns:
+            Analysis: Análise tipada
+        """
+        data = bytes(data)
+        if not data:
+            raise ValueError("Análise serializada vazia")
+        fmt, payload = data[0], data[1:]
+        if fmt == FORMAT_JSON_ZLIB:
+            return cls.from_tuple(_to_tuples(json.loads(zlib.decompress(payload))))
+        if fmt == FORMAT_MARSHAL_ZLIB:
+            payload = zlib.decompress(payload)
+        elif fmt != FORMAT_MARSHAL:
+            raise ValueError(f"Formato de análise desconhecido: {fmt}")
+        return cls.from_tuple(marshal.loads(payload))
+
+def _to_tuples(values: list) -> tuple:
+    """Converte as listas lidas do JSON de volta nas tuplas de to_tuple"""
+    overall, clarity, structure, keywords, improvements, strengths, summary = values
+    return (
+        overall,
+        (clarity[0], clarity[1], tuple(clarity[2])),
+        (structure[0], structure[1], tuple(structure[2])),
+        (keywords[0], _keywords(keywords[1]), _keywords(keywords[2]), tuple(keywords[3])),
+        tuple(improvements), tuple(strengths), summary
+    )
@@ -0,0 +1,86 @@
+"""
+Estatísticas agregadas sobre as análises armazenadas do SmartCV
+"""
+
+import numpy as np
+from typing import Dict, Any, Optional, Sequence
+
+from storage import AnalysisStore, SCORE_COLUMNS
+from utils import LEVEL_KEYS, SCORE_LEVELS, classify_scores
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+def load_score_matrix(store: AnalysisStore, batch_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Carrega as pontuações de todas as análises em arrays por critério
+    
+    Args:
+        store: Armazenamento de análises
+        batch_size: Registros por lote
+        
+    Returns:
+        dict: {'id': array, 'overall': array, 'clarity': array, ...}
+    """
+    chunks = [np.array(batch, dtype=np.float64) for batch in store.iter_score_rows(batch_size)]
+    matrix = np.concatenate(chunks) if chunks else np.empty((0, len(SCORE_COLUMNS) + 1))
+    
+    columns = {"id": matrix[:, 0].astype(np.int64)}
+    for position, criterion in enumerate(SCORE_COLUMNS, start=1):
+        columns[criterion] = matrix[:, position]
+    return columns
+
+def summarize_scores(scores: np.ndarray, percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+                     bins: int = 10) -> Dict[str, Any]:
+    """
+    Calcula estatísticas descritivas de um vetor de pontuações
+    
+    Args:
+        scores: Pontuações (0-100)
+        percentiles: Percentis a calcular
+        bins: Número de faixas do histograma entre 0 e 100
+        
+    Returns:
+        dict: Contagem, média, percentis, histograma e distribuição por nível
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    counts, edges = np.histogram(scores, bins=bins, range=(0, 100))
+    level_counts = np.bincount(classify_scores(scores), minlength=len(LEVEL_KEYS))
+    
+    if scores.size == 0:
+        return {
+            "count": 0, "mean": None, "std": None, "min": None, "max": None,
+            "percentiles": {p: None for p in percentiles},
+            "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+            "levels": {SCORE_LEVELS[key]["level"]: 0 for key in LEVEL_KEYS}
+        }
+    
+    values = np.percentile(scores, percentiles)
+    return {
+        "count": int(scores.size),
+        "mean": float(scores.mean()),
+        "std": float(scores.std()),
+        "min": float(scores.min()),
+        "max": float(scores.max()),
+        "percentiles": {p: float(v) for p, v in zip(percentiles, values)},
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+        "levels": {SCORE_LEVELS[key]["level"]: int(n) for key, n in zip(LEVEL_KEYS, level_counts)}
+    }
+
+def compute_score_statistics(store: AnalysisStore, percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+                             bins: int = 10) -> Dict[str, Dict[str, Any]]:
+    """
+    Calcula estatísticas agregadas por critério sobre todo o armazenamento
+    
+    Args:
+        store: Armazenamento de análises
+        percentiles: Percentis a calcular
+        bins: Número de faixas do histograma
+        
+    Returns:
+        dict: Estatísticas por critério ('overall', 'clarity', 'structure', 'keywords')
+    """
+    matrix = load_score_matrix(store)
+    return {
+        criterion: summarize_scores(matrix[criterion], percentiles, bins)
+        for criterion in SCORE_COLUMNS
+    }
@@ -1,11 +1,31 @@
 import streamlit as st
-import google.generativeai as genai
-import PyPDF2
 import io
-import json
+import hashlib
 from datetime import datetime
 import os
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Optional
+
+from analysis_model import Analysis
+from archive import TextArchive
+from cache import WarmCache, open_caches, start_snapshots
+from concurrency import AdaptiveLimiter
+from config import (ARCHIVE_CONFIG, DEDUP_CONFIG, FAKE_GEMINI_LATENCY, GEMINI_MODEL, METRICS_CONFIG,
+                    MODEL_ROUTING, OCR_CONFIG, PROFILING_CONFIG, SEARCH_CONFIG, SPECULATION_CONFIG)
+from dedup import DuplicateIndex
+from metrics import request_trace, span, timed, start_metrics_server
+from ocr import fill_missing_pages, needs_ocr, ocr_available
+from pipeline import AnalysisError
+from profiler import profile_request
+from results_html import (RESULT_TABS, RESULTS_CSS, TAB_RENDERERS, analysis_key, overview_html,
+                          report_text, summary_report_text)
+from router import ModelRouter, build_fake_models, build_gemini_models, routing_tiers
+from scheduler import (AnalysisScheduler, DeadlineExceededError, LoadShedError, PRIORITY_INTERACTIVE,
+                       PRIORITY_SPECULATIVE)
+from search import SearchIndex
+from speculation import Speculation, SpeculationGate
+from storage import AnalysisStore, content_hash
+from utils import SCORE_LEVELS, get_level_key, clean_extracted_text
 
 # Configuração da página
 st.set_page_config(
@@ -16,7 +36,7 @@ st.set_page_config(
 )
 
 # CSS customizado
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -72,236 +92,444 @@ st.markdown("""
         font-weight: bold;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 class CVAnalyzer:
     def __init__(self):
-        self.gemini_model = None
-        self.setup_gemini()
+        self.api_key = os.getenv("GEMINI_API_KEY") or st.secrets.get("GEMINI_API_KEY")
+        self.setup_error = None if self.api_key else "⚠️ Chave da API Google Gemini não configurada!"
+        self._gemini_model = None
+        self.router = None
+        self.scheduler = None
+        self.limiter = AdaptiveLimiter()  # Compartilhado: a cota da API é única para todos os modelos
+        self.speculation_gate = SpeculationGate()
+        self._setup_lock = threading.Lock()
+    
+    @property
+    def is_configured(self) -> bool:
+        """Indica se há chave de API e nenhuma falha de configuração"""
+        return bool(self.api_key) and not self.setup_error
+    
+    @property
+    def gemini_model(self):
+        """Cliente Gemini, criado no primeiro uso"""
+        if self._gemini_model is None and self.is_configured:
+            self.setup_gemini()
+        return self._gemini_model
     
     def setup_gemini(self):
-        """Configura o cliente Google Gemini"""
-        api_key = os.getenv("GEMINI_API_KEY") or st.secrets.get("GEMINI_API_KEY")
-        if api_key:
+        """Configura o cliente Google Gemini (a biblioteca só é importada aqui)"""
+        with self._setup_lock:
+            if self._gemini_model is not None:
+                return True
             try:
-                genai.configure(api_key=api_key)
-                self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
+                with span("setup_gemini"):
+                    if FAKE_GEMINI_LATENCY is not None:
+                        models = build_fake_models(FAKE_GEMINI_LATENCY, self.limiter)
+                    else:
+                        models = build_gemini_models(self.api_key, self.limiter)
+                    self.router = ModelRouter(models, routing_tiers())
+                    self.scheduler = AnalysisScheduler(self.run_analysis)
+                    self._gemini_model = models[GEMINI_MODEL]
                 return True
             except Exception as e:
-                st.error(f"Erro ao configurar Gemini: {str(e)}")
+                self.setup_error = f"Erro ao configurar Gemini: {str(e)}"
                 return False
-        else:
-            st.error("⚠️ Chave da API Google Gemini não configurada!")
-            return False
     
+    def warm_up(self):
+        """Prepara o cliente em segundo plano, fora do caminho da primeira página"""
+        if self.is_configured:
+            threading.Thread(target=self.setup_gemini, name="smartcv-gemini-setup", daemon=True).start()
+    
+    @timed("extract_text_from_pdf")
     def extract_text_from_pdf(self, pdf_file) -> str:
         """Extrai texto de arquivo PDF"""
+        import PyPDF2
+        
         try:
             pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
+            pages = []
             for page_num, page in enumerate(pdf_reader.pages):
                 try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+                    pages.append(page.extract_text() or "")
                 except Exception as e:
                     st.warning(f"Erro ao processar página {page_num + 1}: {str(e)}")
-                    continue
-            return text.strip()
+                    pages.append("")
+            
+            # Páginas digitalizadas (sem camada de texto) passam pelo OCR
+            if any(needs_ocr(page_text) for page_text in pages):
+                with st.spinner("🔍 Reconhecendo texto das páginas digitalizadas (OCR)..."):
+                    pages = fill_missing_pages(pdf_file.getvalue(), pdf_reader.pages, pages)
+            return "\n".join(page_text for page_text in pages if page_text).strip()
         except Exception as e:
             st.error(f"Erro ao processar PDF: {str(e)}")
             return ""
     
-    def analyze_cv(self, content: str) -> Dict[str, Any]:
-        """Analisa o currículo usando Google Gemini"""
-        if not self.gemini_model:
-            return None
+    def run_analysis(self, content: str) -> Dict[str, Any]:
+        """Executa a análise roteada (chamado pelos workers do escalonador)"""
+        return self.router.analyze(content).analysis
+    
+    def speculate(self, content: str) -> Optional[Speculation]:
+        """
+        Inicia a análise em segundo plano, antes do clique
         
-        prompt = f"""
-        Você é um especialista em análise de currículos e recursos humanos com mais de 15 anos de experiência. 
-        Analise o currículo fornecido de forma detalhada e crítica, retornando uma análise em formato JSON válido com a seguinte estrutura EXATA:
-
-        {{
-          "overallScore": [número de 0 a 100],
-          "clarity": {{
-            "score": [número de 0 a 100],
-            "feedback": "[feedback detalhado sobre clareza e coesão do texto]",
-            "suggestions": ["sugestão 1", "sugestão 2", "sugestão 3"]
-          }},
-          "structure": {{
-            "score": [número de 0 a 100],
-            "feedback": "[feedback sobre organização e estrutura]",
-            "suggestions": ["sugestão 1", "sugestão 2", "sugestão 3"]
-          }},
-          "keywords": {{
-            "score": [número de 0 a 100],
-            "missing": ["palavra-chave ausente 1", "palavra-chave ausente 2"],
-            "present": ["palavra-chave presente 1", "palavra-chave presente 2"],
-            "suggestions": ["sugestão 1", "sugestão 2"]
-          }},
-          "improvements": ["melhoria 1", "melhoria 2", "melhoria 3"],
-          "strengths": ["ponto forte 1", "ponto forte 2", "ponto forte 3"],
-          "summary": "[resumo geral da análise em 2-3 frases]"
-        }}
-
-        CRITÉRIOS DE AVALIAÇÃO:
+        O resultado vai para o cache de análises ao terminar.
         
-        1. CLAREZA E COESÃO (0-100):
-        - Linguagem clara, objetiva e profissional
-        - Ausência de erros gramaticais e ortográficos
-        - Fluidez na leitura e conectividade entre ideias
-        - Uso adequado de verbos de ação
+        Args:
+            content: Texto do currículo
+        
+        Returns:
+            Speculation ou None se os limites de antecipação foram atingidos
+        """
+        if not self.gemini_model:
+            return None
+        key = content_hash(content)
+        analysis_cache = get_caches()["analysis"]
         
-        2. ESTRUTURA E ORGANIZAÇÃO (0-100):
-        - Organização lógica das seções (dados pessoais, objetivo, experiência, formação, habilidades)
-        - Formatação consistente e profissional
-        - Hierarquia clara de informações
-        - Uso adequado de bullet points e espaçamento
-        - Cronologia adequada (mais recente primeiro)
+        def store(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            try:
+                analysis_cache.put(key, Analysis.from_dict(future.result()))
+            except Exception:
+                pass  # o clique refaz a análise
         
-        3. PALAVRAS-CHAVE E RELEVÂNCIA (0-100):
-        - Presença de termos técnicos relevantes para a área
-        - Habilidades técnicas e soft skills mencionadas
-        - Compatibilidade com tendências do mercado de trabalho
-        - Uso de palavras-chave que passam por sistemas ATS
+        speculation = self.speculation_gate.start(
+            key, lambda: self.scheduler.submit(content, priority=PRIORITY_SPECULATIVE)
+        )
+        if speculation is not None:
+            speculation.future.add_done_callback(store)
+        return speculation
+    
+    def analyze_cv(self, content: str, priority: str = PRIORITY_INTERACTIVE,
+                   speculation: Optional[Speculation] = None) -> Optional[Analysis]:
+        """Analisa o currículo usando Google Gemini (aproveita a análise antecipada e o cache)"""
+        if not self.gemini_model:
+            return None
         
-        INSTRUÇÕES IMPORTANTES:
-        - Seja específico e construtivo nas sugestões
-        - Considere o contexto brasileiro do mercado de trabalho
-        - Foque em melhorias práticas e implementáveis
-        - Retorne APENAS o JSON válido, sem texto adicional
-        - Use aspas duplas em todas as strings
-        - Não use quebras de linha dentro das strings JSON
-
-        CURRÍCULO PARA ANÁLISE:
-        {content}
-        """
+        analysis_cache = get_caches()["analysis"]
+        key = content_hash(content)
+        future = speculation.claim() if speculation is not None and speculation.key == key else None
+        if future is None:
+            cached = analysis_cache.get(key)
+            if cached is not None:
+                return cached
         
         try:
-            response = self.gemini_model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            # Limpar possíveis caracteres extras do Gemini
-            if result_text.startswith('```json'):
-                result_text = result_text[7:]
-            if result_text.endswith('```'):
-                result_text = result_text[:-3]
-            
-            result_text = result_text.strip()
-            
-            # Parse do JSON
-            analysis = json.loads(result_text)
-            
-            # Validação básica da estrutura
-            required_keys = ['overallScore', 'clarity', 'structure', 'keywords', 'improvements', 'strengths', 'summary']
-            for key in required_keys:
-                if key not in analysis:
-                    raise ValueError(f"Chave obrigatória '{key}' não encontrada na resposta")
-            
-            return analysis
-            
-        except json.JSONDecodeError as e:
+            if future is None:
+                future = self.scheduler.submit(content, priority=priority)
+            analysis = Analysis.from_dict(future.result())
+        except (LoadShedError, DeadlineExceededError) as e:
+            st.error(f"⏳ Sistema sobrecarregado: {str(e)}")
+            return None
+        except AnalysisError as e:
             st.error(f"Erro ao processar resposta da IA: {str(e)}")
-            st.error(f"Resposta recebida: {result_text[:500]}...")
+            if e.raw_text:
+                st.error(f"Resposta recebida: {e.raw_text[:500]}...")
             return None
         except Exception as e:
             st.error(f"Erro na análise com Gemini: {str(e)}")
             return None
+        analysis_cache.put(key, analysis)
+        return analysis
+
+@st.cache_resource
+def get_analyzer() -> CVAnalyzer:
+    """Retorna o analisador compartilhado do processo (criado uma única vez)"""
+    analyzer = CVAnalyzer()
+    analyzer.warm_up()
+    return analyzer
+
+@st.cache_resource
+def get_analysis_store() -> AnalysisStore:
+    """Retorna o armazenamento de análises compartilhado entre sessões"""
+    return AnalysisStore()
+
+@st.cache_resource
+def get_duplicate_index() -> Optional[DuplicateIndex]:
+    """Retorna o índice de currículos quase duplicados (None se desativado)"""
+    return DuplicateIndex() if DEDUP_CONFIG["enabled"] else None
+
+@st.cache_resource
+def get_search_index() -> Optional[SearchIndex]:
+    """Retorna o índice de busca textual (None se desativado)"""
+    return SearchIndex() if SEARCH_CONFIG["enabled"] else None
+
+@st.cache_resource
+def get_archive() -> Optional[TextArchive]:
+    """Retorna o arquivo comprimido de currículos e respostas (None se desativado)"""
+    return TextArchive() if ARCHIVE_CONFIG["enabled"] else None
+
+@st.cache_resource
+def get_caches() -> Dict[str, WarmCache]:
+    """Caches de extração e de análise do processo, aquecidos pelo snapshot do processo anterior"""
+    caches = open_caches()
+    start_snapshots(caches)
+    return caches
+
+@st.cache_resource
+def get_metrics_server():
+    """Inicia uma única vez o endpoint /metrics do processo"""
+    return start_metrics_server()
+
+def profiling_requested() -> bool:
+    """Perfil ligado por SMARTCV_PROFILE ou pelo toggle do painel de debug"""
+    return PROFILING_CONFIG["enabled"] or st.session_state.get('profile_requests', False)
+
+def render_debug_panel(trace):
+    """Painel lateral com o detalhamento de tempo por etapa"""
+    with st.sidebar:
+        st.markdown("---")
+        with st.expander("⏱️ Desempenho (debug)", expanded=False):
+            analysis_trace = st.session_state.get('analysis_trace')
+            if analysis_trace:
+                st.markdown(f"**Última análise** · `{analysis_trace.request_id}`")
+                st.dataframe(analysis_trace.as_rows(), use_container_width=True, hide_index=True)
+            
+            st.markdown(f"**Execução atual** · `{trace.request_id}`")
+            st.dataframe(trace.as_rows(), use_container_width=True, hide_index=True)
+            st.caption(f"Total: {trace.total_seconds * 1000:.0f} ms")
+            
+            if METRICS_CONFIG["enabled"]:
+                st.caption(f"Métricas: http://{METRICS_CONFIG['host']}:{METRICS_CONFIG['port']}/metrics")
+            
+            st.toggle(
+                f"Perfilar requisições acima de {PROFILING_CONFIG['threshold_seconds']:g}s",
+                key="profile_requests",
+                value=PROFILING_CONFIG["enabled"],
+                help=f"Grava um perfil ({PROFILING_CONFIG['mode']}) em {PROFILING_CONFIG['output_dir']}"
+            )
+            last_profile = st.session_state.get('last_profile')
+            if last_profile:
+                st.caption(f"Último perfil: `{last_profile}`")
 
 def get_score_color(score: int) -> str:
     """Retorna o emoji baseado na pontuação"""
-    if score >= 80:
-        return "🟢"
-    elif score >= 60:
-        return "🟡"
-    else:
-        return "🔴"
+    return SCORE_LEVELS[get_level_key(score)]["emoji"]
 
 def get_score_class(score: int) -> str:
     """Retorna a classe CSS baseada na pontuação"""
-    if score >= 80:
-        return "score-excellent"
-    elif score >= 60:
-        return "score-good"
-    else:
-        return "score-poor"
+    return SCORE_LEVELS[get_level_key(score)]["class"]
 
 def get_score_level(score: int) -> str:
     """Retorna o nível baseado na pontuação"""
-    if score >= 90:
-        return "Excelente"
-    elif score >= 80:
-        return "Muito Bom"
-    elif score >= 70:
-        return "Bom"
-    elif score >= 60:
-        return "Regular"
+    return SCORE_LEVELS[get_level_key(score)]["level"]
+
+RANKING_CRITERIA = {
+    "overall": "🎯 Nota Geral",
+    "clarity": "📝 Clareza",
+    "structure": "🏗️ Estrutura",
+    "keywords": "🔑 Palavras-chave"
+}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_cohort_statistics(total: int) -> Dict[str, Any]:
+    """Estatísticas agregadas e palavras-chave mais frequentes (recalculadas quando o total muda)"""
+    from analytics import compute_score_statistics
+    
+    store = get_analysis_store()
+    return {
+        **compute_score_statistics(store),
+        "top_present": store.top_keywords("present", 15),
+        "top_missing": store.top_keywords("missing", 15)
+    }
+
+def parse_keyword_filter(value: str) -> List[str]:
+    """Converte uma lista separada por vírgulas em palavras-chave"""
+    return [keyword.strip() for keyword in value.split(',') if keyword.strip()]
+
+def render_search_results(store: AnalysisStore, search_index: SearchIndex, query: str):
+    """Currículos encontrados pela busca textual, do mais ao menos relevante"""
+    result = search_index.search(query)
+    records = store.latest_by_content_hash([hit.content_hash for hit in result.hits])
+    st.metric("📊 Currículos encontrados", f"{result.total:,}")
+    rows = []
+    for hit in result.hits:
+        record = records.get(hit.content_hash)
+        if record is None:
+            continue
+        rows.append({
+            "#": len(rows) + 1,
+            "Relevância": hit.score,
+            "Arquivo": record['filename'] or "—",
+            "Data": record['created_at'],
+            "Nota Geral": f"{get_score_color(record['overall_score'])} {record['overall_score']:.0f}",
+            "Clareza": record['clarity_score'],
+            "Estrutura": record['structure_score'],
+            "Palavras-chave": record['keywords_score']
+        })
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+        if result.total > len(result.hits):
+            st.caption(f"Mostrando os {len(result.hits)} mais relevantes")
     else:
-        return "Precisa Melhorar"
+        st.info("Nenhum currículo corresponde à busca.")
 
-def main():
-    # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>🧠 SmartCV</h1>
-        <h3>Analisador de Currículos com Inteligência Artificial</h3>
-        <p>Powered by <span class="gemini-badge">Google Gemini</span></p>
-        <p>Receba feedback detalhado e melhore seu currículo com IA</p>
-    </div>
-    """, unsafe_allow_html=True)
+def render_ranking_page():
+    """Ranking paginado das análises armazenadas"""
+    store = get_analysis_store()
+    total_stored = store.count()
     
-    # Inicializar o analisador
-    analyzer = CVAnalyzer()
+    st.header("🏆 Ranking de Currículos")
+    if total_stored == 0:
+        st.info("Nenhuma análise armazenada ainda. Analise currículos para montar o ranking.")
+        return
     
-    # Sidebar
-    with st.sidebar:
-        st.header("📋 Como Usar")
-        st.markdown("""
-        **Passo a passo:**
-        1. 📤 **Upload**: Faça upload do seu currículo
-        2. 👀 **Preview**: Verifique o conteúdo extraído
-        3. 🧠 **Análise**: Clique em "Analisar Currículo"
-        4. 📊 **Resultados**: Explore as análises detalhadas
-        5. 📋 **Relatório**: Baixe o relatório completo
-        
-        **Formatos aceitos:**
-        - 📄 PDF (recomendado)
-        - 📝 TXT (texto simples)
-        
-        **Máximo:** 10MB por arquivo
-        """)
-        
-        st.markdown("---")
-        
-        st.header("🎯 Critérios Analisados")
-        st.markdown("""
-        **📝 Clareza e Coesão**
-        - Linguagem profissional
-        - Gramática e ortografia
-        - Fluidez do texto
-        
-        **🏗️ Estrutura**
-        - Organização lógica
-        - Formatação consistente
-        - Hierarquia de informações
-        
-        **🔑 Palavras-chave**
-        - Termos técnicos relevantes
-        - Compatibilidade com ATS
-        - Habilidades em demanda
-        """)
+    search_index = get_search_index()
+    if search_index is not None:
+        query = st.text_input(
+            "🔍 Buscar no texto dos currículos",
+            key="ranking_search",
+            placeholder='python "analista de dados" -estágio',
+            help='Termos (todos obrigatórios), "frase exata", OR, NOT ou -termo e parênteses'
+        )
+        if query.strip():
+            render_search_results(store, search_index, query)
+            return
+    
+    # Filtros
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_by = st.selectbox(
+            "Ordenar por",
+            list(RANKING_CRITERIA),
+            format_func=RANKING_CRITERIA.get,
+            key="ranking_sort_by"
+        )
+    with col2:
+        order = st.radio("Ordem", ["Maiores notas", "Menores notas"], horizontal=True, key="ranking_order")
+    with col3:
+        page_size = st.selectbox("Itens por página", [25, 50, 100], key="ranking_page_size")
+    
+    with st.expander("🔎 Filtros", expanded=False):
+        min_scores = {}
+        score_cols = st.columns(len(RANKING_CRITERIA))
+        for column, (criterion, label) in zip(score_cols, RANKING_CRITERIA.items()):
+            with column:
+                min_scores[criterion] = st.slider(
+                    f"{label} mínima", 0, 100, 0, key=f"ranking_min_{criterion}"
+                )
         
-        st.markdown("---")
+        col1, col2 = st.columns(2)
+        with col1:
+            keywords_present = parse_keyword_filter(st.text_input(
+                "✅ Com as palavras-chave (separadas por vírgula)", key="ranking_present"
+            ))
+        with col2:
+            keywords_missing = parse_keyword_filter(st.text_input(
+                "❌ Com as palavras-chave ausentes (separadas por vírgula)", key="ranking_missing"
+            ))
+    
+    # Paginação no servidor: total filtrado primeiro, depois apenas a página atual
+    total = store.count_ranking(min_scores, keywords_present, keywords_missing)
+    total_pages = max(1, (total + page_size - 1) // page_size)
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page = st.number_input("Página", min_value=1, max_value=total_pages, value=1, key="ranking_page")
+    with col2:
+        st.metric("📊 Currículos encontrados", f"{total:,} de {total_stored:,}")
+    
+    rows = store.query_ranking(
+        sort_by,
+        descending=order == "Maiores notas",
+        min_scores=min_scores,
+        keywords_present=keywords_present,
+        keywords_missing=keywords_missing,
+        page=int(page),
+        page_size=page_size
+    )
+    
+    if rows:
+        first_position = (int(page) - 1) * page_size + 1
+        st.dataframe(
+            [
+                {
+                    "#": position,
+                    "Arquivo": row['filename'] or "—",
+                    "Data": row['created_at'],
+                    "Nota Geral": f"{get_score_color(row['overall_score'])} {row['overall_score']:.0f}",
+                    "Nível": get_score_level(row['overall_score']),
+                    "Clareza": row['clarity_score'],
+                    "Estrutura": row['structure_score'],
+                    "Palavras-chave": row['keywords_score']
+                }
+                for position, row in enumerate(rows, first_position)
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("Nenhum currículo atende aos filtros selecionados.")
+    
+    # Estatísticas agregadas do conjunto completo
+    with st.expander("📈 Estatísticas do Conjunto", expanded=False):
+        statistics = get_cohort_statistics(total_stored)
+        stat_cols = st.columns(len(RANKING_CRITERIA))
+        for column, (criterion, label) in zip(stat_cols, RANKING_CRITERIA.items()):
+            stats = statistics[criterion]
+            with column:
+                st.metric(label, f"{stats['mean']:.1f}", help="Média do conjunto")
+                st.caption(
+                    f"P25 {stats['percentiles'][25]:.0f} · "
+                    f"Mediana {stats['percentiles'][50]:.0f} · "
+                    f"P75 {stats['percentiles'][75]:.0f}"
+                )
+                st.bar_chart(stats['levels'])
         
-        # Status da API
-        st.header("⚙️ Status do Sistema")
-        if analyzer.gemini_model:
-            st.success("✅ Google Gemini conectado")
-            st.info("🚀 Modelo: Gemini 1.5 Flash")
-        else:
-            st.error("❌ Gemini não configurado")
-            st.warning("Configure GEMINI_API_KEY")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### ✅ Palavras-chave mais presentes")
+            st.dataframe(statistics["top_present"], use_container_width=True, hide_index=True)
+        with col2:
+            st.markdown("#### ❌ Palavras-chave mais ausentes")
+            st.dataframe(statistics["top_missing"], use_container_width=True, hide_index=True)
+
+def extract_uploaded_pdf(analyzer: CVAnalyzer, uploaded_file) -> str:
+    """
+    Texto limpo do PDF enviado, reaproveitado pelo hash do arquivo
+    
+    Cada interação na página executa o script de novo; sem o cache, o PDF
+    (e o OCR das páginas digitalizadas) seria processado a cada clique.
+    """
+    extraction_cache = get_caches()["extraction"]
+    key = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    content = extraction_cache.get(key)
+    if content is None:
+        content = clean_extracted_text(analyzer.extract_text_from_pdf(uploaded_file))
+        if content:
+            extraction_cache.put(key, content)
+    return content
+
+def speculate_analysis(analyzer: CVAnalyzer, content: str):
+    """
+    Antecipa a análise do arquivo enviado (SMARTCV_SPECULATIVE=1)
     
+    Roda a cada execução do script, mas só inicia uma análise para um
+    conteúdo novo; a do arquivo anterior é descartada.
+    """
+    key = content_hash(content)
+    current = st.session_state.get('speculation')
+    if current is not None and current.key == key:
+        return
+    discard_speculation(analyzer)
+    if st.session_state.get('speculation_wasted', 0) >= SPECULATION_CONFIG["max_wasted_per_session"]:
+        return
+    if get_caches()["analysis"].get(key) is not None:
+        return
+    st.session_state['speculation'] = analyzer.speculate(content)
+
+def discard_speculation(analyzer: CVAnalyzer):
+    """Descarta a análise antecipada da sessão, contando a chamada desperdiçada"""
+    speculation = st.session_state.pop('speculation', None)
+    if speculation is not None and speculation.discard():
+        st.session_state['speculation_wasted'] = st.session_state.get('speculation_wasted', 0) + 1
+        analyzer.speculation_gate.record_wasted()
+
+def render_analysis_page(analyzer: CVAnalyzer):
+    """Upload, análise e resultados de um currículo"""
     # Upload de arquivo
     st.header("📤 Upload do Currículo")
     
@@ -312,6 +540,9 @@ def main():
         accept_multiple_files=False
     )
     
+    if uploaded_file is None and 'speculation' in st.session_state:
+        discard_speculation(analyzer)
+    
     if uploaded_file is not None:
         # Validação do arquivo
         if uploaded_file.size > 10 * 1024 * 1024:  # 10MB
@@ -331,11 +562,15 @@ def main():
         # Extrair texto do arquivo
         with st.spinner("📖 Extraindo texto do arquivo..."):
             if uploaded_file.type == "application/pdf":
-                content = analyzer.extract_text_from_pdf(uploaded_file)
+                content = extract_uploaded_pdf(analyzer, uploaded_file)
             else:
-                content = str(uploaded_file.read(), "utf-8")
+                with span("upload"):
+                    content = str(uploaded_file.read(), "utf-8")
         
         if content and len(content.strip()) > 50:
+            if SPECULATION_CONFIG["enabled"] and analyzer.is_configured:
+                speculate_analysis(analyzer, content)
+            
             # Estatísticas do conteúdo
             word_count = len(content.split())
             char_count = len(content)
@@ -369,7 +604,7 @@ def main():
                 "🧠 Analisar Currículo com Gemini",
                 type="primary",
                 use_container_width=True,
-                disabled=not analyzer.gemini_model
+                disabled=not analyzer.is_configured
             ):
                 if not analyzer.gemini_model:
                     st.error("❌ Configure a API do Google Gemini para continuar")
@@ -387,17 +622,32 @@ def main():
                     status_text.text("🧠 Gemini analisando conteúdo...")
                     progress_bar.progress(50)
                     
-                    analysis = analyzer.analyze_cv(content)
+                    analysis = analyzer.analyze_cv(content, speculation=st.session_state.pop('speculation', None))
                     progress_bar.progress(75)
                     
                     if analysis:
                         status_text.text("✅ Processando resultados...")
                         progress_bar.progress(100)
                         
-                        # Salvar na sessão
+                        # Salvar na sessão (só a análise tipada; o texto do currículo não é mantido)
                         st.session_state['analysis'] = analysis
-                        st.session_state['content'] = content
                         st.session_state['filename'] = uploaded_file.name
+                        st.session_state['analyzed_at'] = datetime.now()
+                        
+                        # Persistir para exportação e relatórios em lote
+                        try:
+                            analysis_id = get_analysis_store().save_analysis(analysis, uploaded_file.name, content)
+                            duplicates = get_duplicate_index()
+                            if duplicates is not None:
+                                duplicates.add(content, analysis_id)
+                            search_index = get_search_index()
+                            if search_index is not None:
+                                search_index.add(content)
+                            archive = get_archive()
+                            if archive is not None:
+                                archive.add_analysis(content, analysis)
+                        except Exception as e:
+                            st.warning(f"⚠️ Não foi possível salvar a análise: {str(e)}")
                         
                         status_text.empty()
                         progress_bar.empty()
@@ -409,299 +659,173 @@ def main():
                         progress_bar.empty()
                         status_text.empty()
                         st.error("❌ Falha na análise. Tente novamente.")
-                        
+                
                 except Exception as e:
                     progress_bar.empty()
                     status_text.empty()
                     st.error(f"❌ Erro durante a análise: {str(e)}")
-                    
+        
         elif content:
             st.warning("⚠️ Conteúdo muito curto para análise. Mínimo: 50 caracteres.")
+        elif uploaded_file.type == "application/pdf" and not (OCR_CONFIG["enabled"] and ocr_available()):
+            st.error("❌ Não foi possível extrair texto do PDF. Se for um documento digitalizado, o OCR não está "
+                     "disponível neste servidor (requer pypdfium2, pytesseract e tesseract); envie um PDF com texto "
+                     "selecionável ou um arquivo TXT.")
         else:
             st.error("❌ Não foi possível extrair texto do arquivo. Verifique se o arquivo não está corrompido.")
     
     # Mostrar resultados da análise
     if 'analysis' in st.session_state:
-        analysis = st.session_state['analysis']
-        filename = st.session_state.get('filename', 'currículo')
-        
-        st.markdown("---")
-        st.header("📊 Resultados da Análise")
-        
-        # Nota geral com destaque
-        st.subheader("🎯 Avaliação Geral")
-        
-        score = analysis['overallScore']
-        level = get_score_level(score)
-        
-        col1, col2 = st.columns([2, 1])
+        render_results(st.session_state['analysis'], st.session_state.get('filename', 'currículo'),
+                       st.session_state.get('analyzed_at') or datetime.now())
+
+@timed("render_results")
+def render_results(analysis: Analysis, filename: str, analyzed_at: datetime):
+    """
+    Exibe os resultados de uma análise
+    
+    Cada bloco é um único st.markdown com HTML montado uma vez por análise
+    (memorizado em results_html), e só a aba selecionada é renderizada.
+    """
+    key = analysis_key(analysis)
+    
+    st.markdown("---")
+    st.header("📊 Resultados da Análise")
+    st.subheader("🎯 Avaliação Geral")
+    st.markdown(RESULTS_CSS + overview_html(key), unsafe_allow_html=True)
+    
+    # Análise detalhada: seletor de aba no lugar de st.tabs, que executa todas as abas
+    st.markdown("---")
+    st.subheader("🔍 Análise Detalhada")
+    active_tab = st.radio(
+        "Seção",
+        RESULT_TABS,
+        horizontal=True,
+        key="results_tab",
+        label_visibility="collapsed"
+    )
+    
+    if active_tab in TAB_RENDERERS:
+        st.markdown(TAB_RENDERERS[active_tab](key), unsafe_allow_html=True)
+        return
+    
+    st.markdown("### 📋 Relatório Completo para Download")
+    report = report_text(key, filename, analyzed_at)
+    
+    # Mostrar preview do relatório
+    st.text_area(
+        "Preview do Relatório:",
+        report,
+        height=400,
+        disabled=True
+    )
+    
+    # Botões de download
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.download_button(
+            label="📥 Baixar Relatório Completo (.txt)",
+            data=report,
+            file_name=f"SmartCV_Relatorio_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+    
+    with col2:
+        st.download_button(
+            label="📄 Baixar Resumo (.txt)",
+            data=summary_report_text(key, filename, analyzed_at),
+            file_name=f"SmartCV_Resumo_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+
+PAGES = {
+    "📄 Analisar Currículo": "analysis",
+    "🏆 Ranking de Currículos": "ranking"
+}
+
+def main():
+    # Header
+    st.markdown("""
+    <div class="main-header">
+        <h1>🧠 SmartCV</h1>
+        <h3>Analisador de Currículos com Inteligência Artificial</h3>
+        <p>Powered by <span class="gemini-badge">Google Gemini</span></p>
+        <p>Receba feedback detalhado e melhore seu currículo com IA</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Inicializar o analisador
+    analyzer = get_analyzer()
+    if analyzer.setup_error:
+        st.error(analyzer.setup_error)
+    
+    # Sidebar
+    with st.sidebar:
+        st.header("📋 Como Usar")
+        st.markdown("""
+        **Passo a passo:**
+        1. 📤 **Upload**: Faça upload do seu currículo
+        2. 👀 **Preview**: Verifique o conteúdo extraído
+        3. 🧠 **Análise**: Clique em "Analisar Currículo"
+        4. 📊 **Resultados**: Explore as análises detalhadas
+        5. 📋 **Relatório**: Baixe o relatório completo
         
-        with col1:
-            st.progress(score / 100)
-            st.markdown(f"**Resumo:** {analysis['summary']}")
-            
-            # Barra de contexto
-            if score >= 80:
-                st.success(f"🎉 Parabéns! Seu currículo está em excelente estado.")
-            elif score >= 60:
-                st.info(f"👍 Bom currículo! Algumas melhorias podem torná-lo ainda melhor.")
-            else:
-                st.warning(f"⚠️ Seu currículo precisa de algumas melhorias importantes.")
+        **Formatos aceitos:**
+        - 📄 PDF (recomendado)
+        - 📝 TXT (texto simples)
         
-        with col2:
-            st.markdown(f"""
-            <div class="metric-card {get_score_class(score)}" style="text-align: center;">
-                <h1 style="margin: 0; font-size: 2.5rem;">{get_score_color(score)} {score}</h1>
-                <p style="margin: 0; font-size: 1.2rem; font-weight: bold;">{level}</p>
-                <p style="margin: 0; font-size: 0.9rem; opacity: 0.8;">de 100 pontos</p>
-            </div>
-            """, unsafe_allow_html=True)
+        **Máximo:** 10MB por arquivo
+        """)
         
-        # Análise detalhada em abas
         st.markdown("---")
-        st.subheader("🔍 Análise Detalhada")
         
-        tab1, tab2, tab3, tab4 = st.tabs([
-            "📝 Clareza & Estrutura",
-            "🔑 Palavras-chave",
-            "💡 Sugestões & Melhorias",
-            "📋 Relatório Completo"
-        ])
+        st.header("🎯 Critérios Analisados")
+        st.markdown("""
+        **📝 Clareza e Coesão**
+        - Linguagem profissional
+        - Gramática e ortografia
+        - Fluidez do texto
         
-        with tab1:
-            col1, col2 = st.columns(2)
-            
-            # Análise de Clareza
-            with col1:
-                st.markdown("### 📝 Clareza e Coesão")
-                clarity_score = analysis['clarity']['score']
-                
-                st.progress(clarity_score / 100)
-                st.markdown(f"""
-                **Pontuação:** {get_score_color(clarity_score)} **{clarity_score}/100** ({get_score_level(clarity_score)})
-                
-                **Análise:**
-                {analysis['clarity']['feedback']}
-                """)
-                
-                st.markdown("**💡 Sugestões de Melhoria:**")
-                for i, suggestion in enumerate(analysis['clarity']['suggestions'], 1):
-                    st.markdown(f"""
-                    <div class="suggestion-box">
-                        <strong>{i}.</strong> {suggestion}
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # Análise de Estrutura
-            with col2:
-                st.markdown("### 🏗️ Estrutura e Organização")
-                structure_score = analysis['structure']['score']
-                
-                st.progress(structure_score / 100)
-                st.markdown(f"""
-                **Pontuação:** {get_score_color(structure_score)} **{structure_score}/100** ({get_score_level(structure_score)})
-                
-                **Análise:**
-                {analysis['structure']['feedback']}
-                """)
-                
-                st.markdown("**💡 Sugestões de Melhoria:**")
-                for i, suggestion in enumerate(analysis['structure']['suggestions'], 1):
-                    st.markdown(f"""
-                    <div class="suggestion-box">
-                        <strong>{i}.</strong> {suggestion}
-                    </div>
-                    """, unsafe_allow_html=True)
+        **🏗️ Estrutura**
+        - Organização lógica
+        - Formatação consistente
+        - Hierarquia de informações
         
-        with tab2:
-            st.markdown("### 🔑 Análise de Palavras-chave")
-            
-            keywords_score = analysis['keywords']['score']
-            st.progress(keywords_score / 100)
-            st.markdown(f"**Pontuação:** {get_score_color(keywords_score)} **{keywords_score}/100** ({get_score_level(keywords_score)})")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### ✅ Palavras-chave Identificadas")
-                if analysis['keywords']['present']:
-                    for keyword in analysis['keywords']['present']:
-                        st.markdown(f"🟢 **{keyword}**")
-                else:
-                    st.info("Nenhuma palavra-chave relevante identificada")
-            
-            with col2:
-                st.markdown("#### ❌ Palavras-chave Ausentes")
-                if analysis['keywords']['missing']:
-                    for keyword in analysis['keywords']['missing']:
-                        st.markdown(f"🔴 **{keyword}**")
-                else:
-                    st.success("Todas as palavras-chave importantes estão presentes!")
-            
-            st.markdown("---")
-            st.markdown("#### 💡 Recomendações para Palavras-chave")
-            for i, suggestion in enumerate(analysis['keywords']['suggestions'], 1):
-                st.markdown(f"""
-                <div class="suggestion-box">
-                    <strong>🔑 {i}.</strong> {suggestion}
-                </div>
-                """, unsafe_allow_html=True)
+        **🔑 Palavras-chave**
+        - Termos técnicos relevantes
+        - Compatibilidade com ATS
+        - Habilidades em demanda
+        """)
         
-        with tab3:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("### ⭐ Pontos Fortes Identificados")
-                for i, strength in enumerate(analysis['strengths'], 1):
-                    st.markdown(f"""
-                    <div class="strength-box">
-                        <strong>✅ {i}.</strong> {strength}
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown("### 🔧 Oportunidades de Melhoria")
-                for i, improvement in enumerate(analysis['improvements'], 1):
-                    st.markdown(f"""
-                    <div class="improvement-box">
-                        <strong>🔧 {i}.</strong> {improvement}
-                    </div>
-                    """, unsafe_allow_html=True)
+        st.markdown("---")
         
-        with tab4:
-            st.markdown("### 📋 Relatório Completo para Download")
-            
-            # Gerar relatório detalhado
-            report = f"""
-RELATÓRIO DE ANÁLISE DE CURRÍCULO - SmartCV
-{'='*60}
-
-📄 INFORMAÇÕES GERAIS
-Data da Análise: {datetime.now().strftime('%d/%m/%Y às %H:%M')}
-Arquivo Analisado: {filename}
-Powered by: Google Gemini AI
-
-🎯 AVALIAÇÃO GERAL
-Nota Final: {analysis['overallScore']}/100 ({get_score_level(analysis['overallScore'])})
-
-Resumo Executivo:
-{analysis['summary']}
-
-{'='*60}
-📊 ANÁLISE DETALHADA POR CRITÉRIO
-{'='*60}
-
-📝 CLAREZA E COESÃO: {analysis['clarity']['score']}/100 ({get_score_level(analysis['clarity']['score'])})
-{'-'*40}
-{analysis['clarity']['feedback']}
-
-💡 Sugestões de Melhoria:
-{chr(10).join([f"   • {s}" for s in analysis['clarity']['suggestions']])}
-
-🏗️ ESTRUTURA E ORGANIZAÇÃO: {analysis['structure']['score']}/100 ({get_score_level(analysis['structure']['score'])})
-{'-'*40}
-{analysis['structure']['feedback']}
-
-💡 Sugestões de Melhoria:
-{chr(10).join([f"   • {s}" for s in analysis['structure']['suggestions']])}
-
-🔑 PALAVRAS-CHAVE E RELEVÂNCIA: {analysis['keywords']['score']}/100 ({get_score_level(analysis['keywords']['score'])})
-{'-'*40}
-
-✅ Palavras-chave Identificadas:
-{chr(10).join([f"   • {k}" for k in analysis['keywords']['present']]) if analysis['keywords']['present'] else "   • Nenhuma palavra-chave relevante identificada"}
-
-❌ Palavras-chave Ausentes (Recomendadas):
-{chr(10).join([f"   • {k}" for k in analysis['keywords']['missing']]) if analysis['keywords']['missing'] else "   • Todas as palavras-chave importantes estão presentes"}
-
-💡 Recomendações:
-{chr(10).join([f"   • {s}" for s in analysis['keywords']['suggestions']])}
-
-{'='*60}
-⭐ PONTOS FORTES IDENTIFICADOS
-{'='*60}
-{chr(10).join([f"✅ {s}" for s in analysis['strengths']])}
-
-{'='*60}
-🔧 OPORTUNIDADES DE MELHORIA
-{'='*60}
-{chr(10).join([f"🔧 {s}" for s in analysis['improvements']])}
-
-{'='*60}
-📈 RECOMENDAÇÕES FINAIS
-{'='*60}
-
-Com base na análise realizada pelo Google Gemini, seu currículo recebeu a nota {analysis['overallScore']}/100.
-
-{
-"Parabéns! Seu currículo está muito bem estruturado. Continue refinando os detalhes para mantê-lo sempre atualizado." if analysis['overallScore'] >= 80
-else "Seu currículo tem uma boa base. Implemente as sugestões apresentadas para melhorar sua competitividade no mercado." if analysis['overallScore'] >= 60
-else "Recomendamos focar nas melhorias sugeridas, especialmente nas áreas com menor pontuação. Um currículo bem otimizado pode fazer toda a diferença no processo seletivo."
-}
-
-Lembre-se:
-• Mantenha seu currículo sempre atualizado
-• Adapte-o para cada vaga específica
-• Use palavras-chave relevantes para sua área
-• Mantenha a formatação limpa e profissional
-• Destaque suas conquistas com dados quantitativos
-
----
-Relatório gerado automaticamente pelo SmartCV
-Analisador de Currículos com Inteligência Artificial
-Powered by Google Gemini | Desenvolvido com Streamlit
-
-Para mais análises, visite: https://smartcv.streamlit.app
-            """
-            
-            # Mostrar preview do relatório
-            st.text_area(
-                "Preview do Relatório:",
-                report,
-                height=400,
-                disabled=True
-            )
-            
-            # Botões de download
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.download_button(
-                    label="📥 Baixar Relatório Completo (.txt)",
-                    data=report,
-                    file_name=f"SmartCV_Relatorio_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-            
-            with col2:
-                # Relatório resumido
-                summary_report = f"""
-SMARTCV - RELATÓRIO RESUMIDO
-Data: {datetime.now().strftime('%d/%m/%Y')}
-Arquivo: {filename}
-
-NOTA GERAL: {analysis['overallScore']}/100
-
-PONTUAÇÕES:
-• Clareza: {analysis['clarity']['score']}/100
-• Estrutura: {analysis['structure']['score']}/100  
-• Palavras-chave: {analysis['keywords']['score']}/100
-
-PRINCIPAIS MELHORIAS:
-{chr(10).join([f"• {s}" for s in analysis['improvements'][:3]])}
-
-Powered by Google Gemini
-                """
-                
-                st.download_button(
-                    label="📄 Baixar Resumo (.txt)",
-                    data=summary_report,
-                    file_name=f"SmartCV_Resumo_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-
+        # Status da API
+        st.header("⚙️ Status do Sistema")
+        if analyzer.is_configured:
+            st.success("✅ Google Gemini conectado")
+            st.info(f"🚀 Modelo: {GEMINI_MODEL}")
+            if MODEL_ROUTING["enabled"]:
+                st.caption("🔀 Roteamento: " + " → ".join(MODEL_ROUTING["tiers"]))
+        else:
+            st.error("❌ Gemini não configurado")
+            st.warning("Configure GEMINI_API_KEY")
+    
+    # Seletor de página no lugar de st.tabs: só a página ativa executa a cada rerun
+    page = st.radio(
+        "Página",
+        list(PAGES),
+        horizontal=True,
+        key="page",
+        label_visibility="collapsed"
+    )
+    if PAGES[page] == "ranking":
+        render_ranking_page()
+    else:
+        render_analysis_page(analyzer)
+    
     # Footer
     st.markdown("---")
     st.markdown("""
@@ -712,5 +836,26 @@ Powered by Google Gemini
     </div>
     """, unsafe_allow_html=True)
 
+def run():
+    """Executa a aplicação registrando o detalhamento de tempo da execução"""
+    if METRICS_CONFIG["enabled"]:
+        get_metrics_server()
+    
+    with request_trace() as trace:
+        profile = None
+        try:
+            with profile_request(trace.request_id, enabled=profiling_requested()) as profile:
+                main()
+        finally:
+            # Guardar o detalhamento mesmo quando st.rerun() interrompe a execução
+            st.session_state['last_trace'] = trace
+            if trace.has_stage("generate_content"):
+                st.session_state['analysis_trace'] = trace
+            if profile is not None and profile.path:
+                st.session_state['last_profile'] = profile.path
+        
+        if METRICS_CONFIG["debug_panel"]:
+            render_debug_panel(trace)
+
 if __name__ == "__main__":
-    main()
+    run()
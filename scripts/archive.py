@@ -0,0 +1,605 @@
+"""
+Arquivo comprimido dos textos extraídos e das respostas do modelo
+
+Cada registro (texto do currículo ou resposta da análise, pelo hash do texto
+do currículo) é comprimido sozinho, com um dicionário treinado nos registros
+do mesmo tipo: currículos e respostas repetem títulos, chaves JSON e frases,
+e o dicionário dá a um registro isolado o contexto que ele não tem. Com o
+pacote opcional zstandard, usa zstd com dicionário treinado; sem ele, zlib
+com dicionário pré-definido (zdict) montado com os trechos mais frequentes.
+
+Os registros ficam em SQLite com índice único por (tipo, hash): ler um
+registro é uma busca no índice e uma descompressão. A compactação roda em
+segundo plano: treina o dicionário quando há amostras suficientes (e de
+novo quando o número de registros dobra), recomprime em lotes os registros
+gravados sem ele ou com um dicionário antigo, apaga os dicionários sem uso e
+devolve o espaço livre ao sistema (incremental_vacuum, ou VACUUM quando as
+páginas ficaram parcialmente vazias).
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple, Union
+
+from analysis_model import Analysis
+from config import ARCHIVE_CONFIG
+from metrics import REGISTRY
+from storage import content_hash
+
+REGISTRY.describe("smartcv_archive_bytes_total", "counter", "Bytes gravados no arquivo, antes e depois da compressão")
+REGISTRY.describe("smartcv_archive_compactions_total", "counter", "Compactações do arquivo por desfecho")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    trained_on INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dictionaries_kind ON dictionaries(kind, codec, id);
+
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    content_hash BLOB NOT NULL,
+    codec TEXT NOT NULL,
+    dictionary_id INTEGER,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_records_key ON records(kind, content_hash);
+CREATE INDEX IF NOT EXISTS idx_records_dictionary ON records(kind, dictionary_id);
+"""
+
+# Tipos de registro: texto limpo do currículo e resposta da análise (JSON)
+KIND_CV = "cv"
+KIND_RESPONSE = "response"
+KINDS = [KIND_CV, KIND_RESPONSE]
+
+# O zlib só enxerga os últimos 32 KB: um dicionário maior seria ignorado
+ZLIB_MAX_DICT = 32 * 1024
+
+# Bytes estimados por registro além do conteúdo (colunas e índices)
+RECORD_OVERHEAD = 160
+
+@lru_cache(maxsize=1)
+def zstd_available() -> bool:
+    """Indica se a dependência opcional zstandard está instalada"""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def resolve_codec(name: str) -> str:
+    """
+    Codec usado nas gravações
+    
+    Args:
+        name: 'auto' (zstd se instalado), 'zstd' ou 'zlib'
+    
+    Returns:
+        str: 'zstd' ou 'zlib'
+    
+    Raises:
+        ValueError: Se o codec for desconhecido ou zstd for pedido sem o pacote
+    """
+    if name == "auto":
+        return "zstd" if zstd_available() else "zlib"
+    if name == "zstd" and not zstd_available():
+        raise ValueError("Codec zstd requer o pacote zstandard (pip install zstandard)")
+    if name not in ("zstd", "zlib"):
+        raise ValueError(f"Codec desconhecido: {name}")
+    return name
+
+def train_zlib_dictionary(samples: List[bytes], size: int) -> bytes:
+    """
+    Dicionário pré-definido do zlib com os trechos que mais se repetem
+    
+    Linhas e palavras presentes em mais de uma amostra entram por ordem de
+    economia (ocorrências x tamanho); as mais úteis ficam no fim, onde as
+    distâncias são menores.
+    
+    Args:
+        samples: Registros de exemplo
+        size: Tamanho máximo do dicionário em bytes
+    
+    Returns:
+        bytes: Dicionário (vazio se não houver repetição)
+    """
+    size = min(size, ZLIB_MAX_DICT)
+    lines: Counter = Counter()
+    words: Counter = Counter()
+    for sample in samples:
+        sample_lines = set(line.strip() for line in sample.splitlines())
+        lines.update(line for line in sample_lines if len(line) >= 8)
+        words.update(set(sample.split()))
+    candidates = [(count * len(line), line) for line, count in lines.items() if count > 1]
+    # Palavras só ocupam o espaço que sobrar das linhas
+    candidates += [(count * len(word) / 4, word) for word, count in words.items() if count > 1 and len(word) >= 4]
+    candidates.sort(reverse=True)
+    
+    chosen: List[bytes] = []
+    seen = set()
+    total = 0
+    for _, piece in candidates:
+        if piece in seen or total + len(piece) + 1 > size:
+            continue
+        seen.add(piece)
+        chosen.append(piece)
+        total += len(piece) + 1
+    return b"\n".join(reversed(chosen))
+
+class _Dictionary(NamedTuple):
+    """Dicionário carregado (com os objetos do zstd prontos para uso)"""
+    id: int
+    kind: str
+    codec: str
+    data: bytes
+    trained_on: int
+    zstd: Any
+
+def _compress(codec: str, data: bytes, dictionary: Optional[_Dictionary], level: int) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        if dictionary is not None:
+            return zstandard.ZstdCompressor(level=level, dict_data=dictionary.zstd).compress(data)
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    if dictionary is not None:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=dictionary.data)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+def _decompress(codec: str, data: bytes, dictionary: Optional[_Dictionary], size: int) -> bytes:
+    if codec == "zstd":
+        if not zstd_available():
+            raise ValueError("Registro comprimido com zstd: instale o pacote zstandard para lê-lo")
+        import zstandard
+        if dictionary is not None:
+            return zstandard.ZstdDecompressor(dict_data=dictionary.zstd).decompress(data, max_output_size=size)
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+    if dictionary is not None:
+        decompressor = zlib.decompressobj(-15, zdict=dictionary.data)
+    else:
+        decompressor = zlib.decompressobj(-15)
+    return decompressor.decompress(data) + decompressor.flush()
+
+class TextArchive:
+    """
+    Arquivo comprimido de textos de currículos e respostas do modelo
+    
+    Gravações de processos diferentes (app, worker, watcher) são serializadas
+    pelo SQLite. A compactação recomprime cada lote com uma atualização
+    condicional (só se o registro ainda estiver no dicionário lido), então
+    pode rodar em qualquer processo ao mesmo tempo que as gravações.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.config = {**ARCHIVE_CONFIG, **(config or {})}
+        self.db_path = db_path or self.config["db_path"]
+        self.codec = resolve_codec(self.config["codec"])
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA busy_timeout = 30000")
+        # Precisa vir antes da primeira tabela; em um arquivo existente não tem efeito
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._dictionaries: Dict[int, _Dictionary] = {}
+        self._compacting = False
+    
+    def _dictionary(self, dictionary_id: Optional[int]) -> Optional[_Dictionary]:
+        """Dicionário pelo id (imutável; fica em memória depois da primeira leitura)"""
+        if dictionary_id is None:
+            return None
+        dictionary = self._dictionaries.get(dictionary_id)
+        if dictionary is None:
+            row = self._conn.execute("SELECT * FROM dictionaries WHERE id = ?", (dictionary_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Dicionário {dictionary_id} não encontrado no arquivo")
+            zstd_dict = None
+            if row['codec'] == "zstd" and zstd_available():
+                import zstandard
+                zstd_dict = zstandard.ZstdCompressionDict(bytes(row['data']))
+                zstd_dict.precompute_compress(level=self.config["level"])
+            dictionary = _Dictionary(row['id'], row['kind'], row['codec'], bytes(row['data']), row['trained_on'], zstd_dict)
+            self._dictionaries[dictionary_id] = dictionary
+        return dictionary
+    
+    def _current_dictionary(self, kind: str) -> Optional[_Dictionary]:
+        """Dicionário mais recente do tipo para o codec das gravações"""
+        row = self._conn.execute(
+            "SELECT MAX(id) FROM dictionaries WHERE kind = ? AND codec = ?", (kind, self.codec)
+        ).fetchone()
+        return self._dictionary(row[0])
+    
+    def put(self, kind: str, key: str, text: str) -> bool:
+        """
+        Grava um registro (registros já presentes são mantidos)
+        
+        Args:
+            kind: Tipo do registro (KINDS)
+            key: Hash do texto do currículo
+            text: Conteúdo do registro
+        
+        Returns:
+            bool: True se o registro foi gravado agora
+        """
+        return self.put_many([(kind, key, text)]) > 0
+    
+    def put_many(self, items: List[Tuple[str, str, str]]) -> int:
+        """
+        Grava vários registros em uma transação
+        
+        Args:
+            items: Tuplas (tipo, hash do currículo, conteúdo)
+        
+        Returns:
+            int: Registros gravados (os já presentes são ignorados)
+        """
+        for kind, _, _ in items:
+            if kind not in KINDS:
+                raise ValueError(f"Tipo de registro desconhecido: {kind}")
+        created_at = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            # Dicionário e gravação na mesma transação: a compactação não remove um dicionário em uso
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                dictionaries = {kind: self._current_dictionary(kind) for kind in {item[0] for item in items}}
+                sizes = []
+                for kind, key, text in items:
+                    data = text.encode("utf-8")
+                    dictionary = dictionaries[kind]
+                    blob = _compress(self.codec, data, dictionary, self.config["level"])
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO records (kind, content_hash, codec, dictionary_id, size, data, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (kind, bytes.fromhex(key), self.codec, dictionary.id if dictionary else None,
+                         len(data), blob, created_at)
+                    )
+                    if cursor.rowcount:
+                        sizes.append((kind, len(data), len(blob)))
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        for kind, raw, stored in sizes:
+            REGISTRY.increment("smartcv_archive_bytes_total", raw, kind=kind, stage="raw")
+            REGISTRY.increment("smartcv_archive_bytes_total", stored, kind=kind, stage="stored")
+        written = len(sizes)
+        if written:
+            self._maybe_compact()
+        return written
+    
+    def add_analysis(self, content: str, analysis: Union[Analysis, Dict[str, Any]]) -> str:
+        """
+        Arquiva o texto do currículo e a resposta da análise
+        
+        Args:
+            content: Texto limpo do currículo
+            analysis: Análise validada (Analysis ou dicionário)
+        
+        Returns:
+            str: Hash do texto (chave dos dois registros)
+        """
+        key = content_hash(content)
+        response = json.dumps(Analysis.coerce(analysis).to_dict(), ensure_ascii=False, separators=(",", ":"))
+        self.put_many([(KIND_CV, key, content), (KIND_RESPONSE, key, response)])
+        return key
+    
+    def get(self, kind: str, key: str) -> Optional[str]:
+        """
+        Lê um registro
+        
+        Args:
+            kind: Tipo do registro (KINDS)
+            key: Hash do texto do currículo
+        
+        Returns:
+            str: Conteúdo ou None se não houver registro
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT codec, dictionary_id, size, data FROM records WHERE kind = ? AND content_hash = ?",
+                (kind, bytes.fromhex(key))
+            ).fetchone()
+            if row is None:
+                return None
+            dictionary = self._dictionary(row['dictionary_id'])
+        return _decompress(row['codec'], row['data'], dictionary, row['size']).decode("utf-8")
+    
+    def _count(self, kind: str) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM records WHERE kind = ?", (kind,)).fetchone()[0]
+    
+    def _needs_training(self, kind: str) -> bool:
+        """Há amostras para o primeiro dicionário ou os registros cresceram o bastante desde o último"""
+        count = self._count(kind)
+        if count < self.config["train_min_records"]:
+            return False
+        current = self._current_dictionary(kind)
+        return current is None or count >= current.trained_on * self.config["retrain_growth"]
+    
+    def _train(self, kind: str) -> Optional[_Dictionary]:
+        """Treina e grava um dicionário com os registros mais recentes do tipo"""
+        with self._lock:
+            count = self._count(kind)
+            rows = self._conn.execute(
+                "SELECT codec, dictionary_id, size, data FROM records WHERE kind = ? ORDER BY id DESC LIMIT ?",
+                (kind, self.config["train_sample"])
+            ).fetchall()
+            samples = [_decompress(row['codec'], row['data'], self._dictionary(row['dictionary_id']), row['size'])
+                       for row in rows]
+        
+        if self.codec == "zstd":
+            import zstandard
+            try:
+                data = zstandard.train_dictionary(self.config["dict_size"], samples).as_bytes()
+            except zstandard.ZstdError:
+                return None  # Amostras pequenas ou parecidas demais para um dicionário
+        else:
+            data = train_zlib_dictionary(samples, self.config["dict_size"])
+        if not data:
+            return None
+        
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO dictionaries (kind, codec, data, trained_on, created_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, self.codec, data, count, datetime.now().isoformat(timespec="seconds"))
+            )
+            self._conn.commit()
+            return self._dictionary(cursor.lastrowid)
+    
+    def _recompress(self, kind: str, dictionary: _Dictionary) -> int:
+        """Recomprime, em lotes, os registros do tipo que não usam o dicionário atual"""
+        recompressed = 0
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, codec, dictionary_id, size, data FROM records "
+                    "WHERE kind = ? AND id > ? AND (dictionary_id IS NULL OR dictionary_id != ?) ORDER BY id LIMIT ?",
+                    (kind, last_id, dictionary.id, self.config["compact_batch"])
+                ).fetchall()
+                sources = [(row, self._dictionary(row['dictionary_id'])) for row in rows]
+            if not rows:
+                return recompressed
+            
+            # Compressão fora da trava: gravações e leituras seguem durante a compactação
+            updates = []
+            for row, source in sources:
+                data = _decompress(row['codec'], row['data'], source, row['size'])
+                blob = _compress(self.codec, data, dictionary, self.config["level"])
+                updates.append((self.codec, dictionary.id, blob, row['id'], row['codec'], row['dictionary_id']))
+            with self._lock:
+                cursor = self._conn.executemany(
+                    "UPDATE records SET codec = ?, dictionary_id = ?, data = ? "
+                    "WHERE id = ? AND codec = ? AND dictionary_id IS ?",
+                    updates
+                )
+                recompressed += cursor.rowcount
+                self._conn.commit()
+            last_id = rows[-1]['id']
+    
+    def compact(self, force_train: bool = False) -> Dict[str, int]:
+        """
+        Treina dicionários, recomprime os registros antigos e libera o espaço
+        
+        Args:
+            force_train: Treina um dicionário novo mesmo sem crescimento (se houver amostras)
+        
+        Returns:
+            dict: Dicionários treinados e removidos, registros recomprimidos e bytes liberados
+        """
+        report = {"trained": 0, "recompressed": 0, "dropped_dictionaries": 0, "freed_bytes": 0}
+        for kind in KINDS:
+            with self._lock:
+                train = self._needs_training(kind) or (
+                    force_train and self._count(kind) >= self.config["train_min_records"]
+                )
+            dictionary = self._train(kind) if train else None
+            if dictionary is not None:
+                report["trained"] += 1
+            else:
+                with self._lock:
+                    dictionary = self._current_dictionary(kind)
+            if dictionary is not None:
+                report["recompressed"] += self._recompress(kind, dictionary)
+        
+        with self._lock:
+            current = [row[0] for row in self._conn.execute(
+                "SELECT MAX(id) FROM dictionaries GROUP BY kind, codec"
+            )]
+            cursor = self._conn.execute(
+                "DELETE FROM dictionaries WHERE id NOT IN (SELECT DISTINCT dictionary_id FROM records "
+                f"WHERE dictionary_id IS NOT NULL) AND id NOT IN ({','.join('?' * len(current)) or 'NULL'})",
+                current
+            )
+            report["dropped_dictionaries"] = cursor.rowcount
+            self._conn.commit()
+            report["freed_bytes"] = self._reclaim(report["recompressed"] > 0)
+        return report
+    
+    def _reclaim(self, rewritten: bool) -> int:
+        """
+        Devolve ao sistema o espaço liberado
+        
+        Páginas inteiramente livres saem com incremental_vacuum. Registros
+        recomprimidos deixam páginas parcialmente vazias: se o arquivo passar
+        de vacuum_ratio vezes o tamanho dos dados, ele é reescrito (VACUUM).
+        """
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        before = self._conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+        self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+        if rewritten:
+            used = self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(data)), 0) + COUNT(*) * ? FROM records", (RECORD_OVERHEAD,)
+            ).fetchone()[0]
+            size = self._conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+            if size > used * self.config["vacuum_ratio"]:
+                self._conn.execute("VACUUM")
+        return before - self._conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+    
+    def _maybe_compact(self):
+        """Dispara a compactação em segundo plano quando um tipo precisa de dicionário novo"""
+        with self._lock:
+            if self._compacting or not any(self._needs_training(kind) for kind in KINDS):
+                return
+            self._compacting = True
+        if self.config["background_compaction"]:
+            threading.Thread(target=self._compact_loop, name="smartcv-archive-compact", daemon=True).start()
+        else:
+            self._compact_loop()
+    
+    def _compact_loop(self):
+        try:
+            self.compact()
+            REGISTRY.increment("smartcv_archive_compactions_total", outcome="ok")
+        except Exception:
+            REGISTRY.increment("smartcv_archive_compactions_total", outcome="error")
+        finally:
+            with self._lock:
+                self._compacting = False
+    
+    def stats(self) -> Dict[str, Any]:
+        """Registros, bytes originais e gravados por tipo e tamanho do arquivo"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, COUNT(*) AS records, SUM(size) AS raw, SUM(LENGTH(data)) AS stored, "
+                "SUM(dictionary_id IS NOT NULL) AS with_dictionary FROM records GROUP BY kind"
+            ).fetchall()
+            dictionaries = self._conn.execute(
+                "SELECT kind, COUNT(*), SUM(LENGTH(data)) FROM dictionaries GROUP BY kind"
+            ).fetchall()
+        by_dictionary = {row[0]: {"dictionaries": row[1], "dictionary_bytes": row[2]} for row in dictionaries}
+        kinds = {}
+        for row in rows:
+            kinds[row['kind']] = {
+                "records": row['records'],
+                "raw_bytes": row['raw'],
+                "stored_bytes": row['stored'],
+                "ratio": round(row['raw'] / max(row['stored'], 1), 2),
+                "with_dictionary": row['with_dictionary'],
+                **by_dictionary.get(row['kind'], {"dictionaries": 0, "dictionary_bytes": 0})
+            }
+        return {"codec": self.codec, "kinds": kinds, "file_bytes": os.path.getsize(self.db_path)}
+    
+    def close(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conn.close()
+
+def run_benchmark(count: int, db_path: str, config: Optional[Dict[str, Any]] = None, seed: int = 11) -> Dict[str, Any]:
+    """
+    Arquiva currículos e respostas sintéticos e mede compressão e leitura
+    
+    Args:
+        count: Currículos arquivados (cada um com a resposta)
+        db_path: Banco (novo) do arquivo
+        config: Sobrescreve chaves de ARCHIVE_CONFIG
+        seed: Semente do corpus
+    
+    Returns:
+        dict: Bytes por currículo sem e com dicionário e tempos de leitura (ms)
+    """
+    import random
+    from benchmark import summarize
+    from corpus import generate_cv_lines
+    from fake_gemini import fake_analysis
+    
+    rng = random.Random(seed)
+    archive = TextArchive(db_path, {**(config or {}), "background_compaction": False, "train_min_records": count + 1})
+    keys = []
+    start = time.perf_counter()
+    for _ in range(count):
+        content = "\n".join(generate_cv_lines(rng, rng.randint(1, 3)))
+        keys.append(archive.add_analysis(content, fake_analysis(content, rng)))
+    writing = time.perf_counter() - start
+    before = archive.stats()
+    
+    archive.config["train_min_records"] = min(count, ARCHIVE_CONFIG["train_min_records"])
+    start = time.perf_counter()
+    report = archive.compact()
+    compaction = time.perf_counter() - start
+    after = archive.stats()
+    
+    durations = []
+    for _ in range(min(count, 1000)):
+        key = rng.choice(keys)
+        kind = rng.choice(KINDS)
+        start = time.perf_counter()
+        archive.get(kind, key)
+        durations.append(time.perf_counter() - start)
+    archive.close()
+    
+    def per_cv(stats: Dict[str, Any], field: str) -> int:
+        return round(sum(kind[field] for kind in stats["kinds"].values()) / count)
+    
+    return {
+        "cvs": count,
+        "codec": after["codec"],
+        "raw_bytes_per_cv": per_cv(after, "raw_bytes"),
+        "stored_bytes_per_cv_without_dictionary": per_cv(before, "stored_bytes"),
+        "stored_bytes_per_cv": per_cv(after, "stored_bytes"),
+        "ratio": round(per_cv(after, "raw_bytes") / max(per_cv(after, "stored_bytes"), 1), 2),
+        "file_bytes_per_cv": round(after["file_bytes"] / count),
+        "writing_seconds": round(writing, 2),
+        "compaction_seconds": round(compaction, 2),
+        "compaction": report,
+        "read": summarize(durations)
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Linha de comando: leitura, estatísticas, compactação e benchmark do arquivo"""
+    parser = argparse.ArgumentParser(description="Arquivo comprimido de currículos e respostas")
+    parser.add_argument("hash", nargs="?", help="Hash do texto do currículo a ler")
+    parser.add_argument("--kind", choices=KINDS, default=KIND_CV, help="Tipo do registro lido")
+    parser.add_argument("--db", default=ARCHIVE_CONFIG["db_path"], help="Banco do arquivo")
+    parser.add_argument("--codec", choices=["auto", "zstd", "zlib"], default=None)
+    parser.add_argument("--stats", action="store_true", help="Mostra a taxa de compressão")
+    parser.add_argument("--compact", action="store_true", help="Treina um dicionário novo e recomprime os registros")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Arquiva N currículos sintéticos em um banco temporário")
+    args = parser.parse_args(argv)
+    config = {"codec": args.codec} if args.codec else {}
+    
+    if args.benchmark:
+        import tempfile
+        with tempfile.TemporaryDirectory(prefix="smartcv-archive-") as directory:
+            report = run_benchmark(args.benchmark, os.path.join(directory, "archive.db"), config)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    
+    archive = TextArchive(args.db, {**config, "background_compaction": False})
+    if args.compact:
+        print(json.dumps(archive.compact(force_train=True), indent=2))
+    if args.stats or not (args.hash or args.compact):
+        print(json.dumps(archive.stats(), indent=2))
+    if args.hash:
+        text = archive.get(args.kind, args.hash)
+        if text is None:
+            print(f"Registro não encontrado: {args.kind} {args.hash}", file=sys.stderr)
+            archive.close()
+            return 1
+        print(text)
+    archive.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
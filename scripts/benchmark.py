@@ -0,0 +1,293 @@
+"""
+Benchmark reprodutível do pipeline de análise do SmartCV
+
+Gera um corpus sintético, executa extração, limpeza, prompt, modelo (substituto
+local do Gemini), parsing e geração de relatório, e grava latências por etapa,
+vazão e pico de memória em JSON para comparação entre commits.
+
+Uso:
+    python benchmark.py --count 40 --latency 0.8 --output benchmarks/resultado.json
+    python benchmark.py --count 40 --token-latency 0.005 --compact
+    python benchmark.py --compare benchmarks/antes.json benchmarks/depois.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from corpus import SyntheticCV, generate_corpus
+from fake_gemini import FakeGeminiModel
+from compact import build_compact_prompt, compact_generation_config, full_generation_config
+from pipeline import (build_prompt, extract_pdf_text, output_token_count, parse_analysis,
+                      parse_compact_analysis, AnalysisError)
+from utils import clean_extracted_text, generate_report_text
+
+STAGES = ["upload", "extract_text_from_pdf", "clean_extracted_text", "build_prompt",
+          "generate_content", "parse_response", "render_report"]
+
+class StageRecorder:
+    """Acumula duração e pico de memória por etapa"""
+    
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.durations: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.peaks: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.totals: List[float] = []
+        self.output_tokens: List[int] = []
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Mede uma etapa de um documento"""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name].append(time.perf_counter() - start)
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1] - baseline
+                self.peaks[name] = max(self.peaks[name], peak)
+
+def run_document(cv: SyntheticCV, model: FakeGeminiModel, recorder: StageRecorder,
+                 compact: bool = False) -> bool:
+    """
+    Executa o pipeline completo para um currículo
+    
+    Args:
+        cv: Currículo sintético
+        model: Modelo falso
+        recorder: Coletor de métricas
+        compact: Usar o formato compacto de resposta
+        
+    Returns:
+        bool: True se a análise foi concluída
+    """
+    start = time.perf_counter()
+    with recorder.stage("upload"):
+        data = bytes(cv.data)
+    
+    if cv.file_type == 'pdf':
+        with recorder.stage("extract_text_from_pdf"):
+            raw_text = extract_pdf_text(data)
+    else:
+        with recorder.stage("extract_text_from_pdf"):
+            raw_text = data.decode("utf-8", errors="replace")
+    
+    with recorder.stage("clean_extracted_text"):
+        content = clean_extracted_text(raw_text)
+    
+    with recorder.stage("build_prompt"):
+        prompt = build_compact_prompt(content) if compact else build_prompt(content)
+    
+    with recorder.stage("generate_content"):
+        config = compact_generation_config() if compact else full_generation_config()
+        response = model.generate_content(prompt, generation_config=config)
+        result_text = response.text
+    recorder.output_tokens.append(output_token_count(response, result_text))
+    
+    try:
+        with recorder.stage("parse_response"):
+            analysis = parse_compact_analysis(result_text) if compact else parse_analysis(result_text)
+    except AnalysisError:
+        return False
+    
+    with recorder.stage("render_report"):
+        generate_report_text(analysis, cv.name)
+    
+    recorder.totals.append(time.perf_counter() - start)
+    return True
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    """Percentis em milissegundos de uma lista de durações"""
+    if not values:
+        return {"count": 0}
+    array = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(array, [50, 95, 99])
+    return {
+        "count": int(array.size),
+        "mean_ms": round(float(array.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(array.max()), 3)
+    }
+
+def git_commit() -> Optional[str]:
+    """Commit atual do repositório, se disponível"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(count: int = 20, min_pages: int = 1, max_pages: int = 50, formats=('pdf', 'txt'),
+                  latency: float = 0.5, jitter: float = 0.1, failure_rate: float = 0.0,
+                  concurrency: int = 1, seed: int = 42, measure_memory: bool = True,
+                  token_latency: float = 0.0, compact: bool = False) -> Dict[str, Any]:
+    """
+    Executa o benchmark e retorna o relatório
+    
+    Args:
+        count: Quantidade de currículos
+        min_pages: Mínimo de páginas por currículo
+        max_pages: Máximo de páginas por currículo
+        formats: Formatos alternados no corpus
+        latency: Latência média do modelo falso (s)
+        jitter: Variação máxima da latência (s)
+        failure_rate: Fração de respostas inválidas do modelo
+        concurrency: Documentos processados em paralelo
+        seed: Semente do corpus e do modelo
+        measure_memory: Medir o pico de memória por etapa em uma segunda passada
+        token_latency: Tempo por token gerado no modelo falso (s)
+        compact: Usar o formato compacto de resposta
+        
+    Returns:
+        dict: Relatório com metadados, resumo e estatísticas por etapa
+    """
+    corpus = list(generate_corpus(count, (min_pages, max_pages), tuple(formats), seed))
+    model = FakeGeminiModel(latency=latency, jitter=jitter, failure_rate=failure_rate, seed=seed,
+                            token_latency=token_latency)
+    
+    recorder = StageRecorder(trace_memory=False)
+    start = time.perf_counter()
+    if concurrency == 1:
+        results = [run_document(cv, model, recorder, compact) for cv in corpus]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda cv: run_document(cv, model, recorder, compact), corpus))
+    wall_seconds = time.perf_counter() - start
+    
+    # Pico de memória em uma segunda passada sequencial: o tracemalloc distorce os tempos
+    memory_recorder = None
+    if measure_memory:
+        memory_recorder = StageRecorder(trace_memory=True)
+        instant_model = FakeGeminiModel(latency=0.0, failure_rate=failure_rate, seed=seed)
+        tracemalloc.start()
+        try:
+            for cv in corpus:
+                run_document(cv, instant_model, memory_recorder, compact)
+        finally:
+            tracemalloc.stop()
+    
+    stages = {}
+    for stage in STAGES:
+        stages[stage] = summarize(recorder.durations[stage])
+        if memory_recorder:
+            stages[stage]["peak_memory_kb"] = round(memory_recorder.peaks[stage] / 1024, 1)
+    
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": {
+                "count": count, "min_pages": min_pages, "max_pages": max_pages,
+                "formats": list(formats), "latency": latency, "jitter": jitter,
+                "failure_rate": failure_rate, "concurrency": concurrency, "seed": seed,
+                "measure_memory": measure_memory, "token_latency": token_latency, "compact": compact
+            }
+        },
+        "summary": {
+            "documents": count,
+            "succeeded": sum(results),
+            "errors": count - sum(results),
+            "wall_seconds": round(wall_seconds, 3),
+            "throughput_docs_per_s": round(count / wall_seconds, 3) if wall_seconds else None,
+            "corpus_pages": sum(cv.pages for cv in corpus),
+            "output_tokens_mean": round(float(np.mean(recorder.output_tokens)), 1) if recorder.output_tokens else None
+        },
+        "end_to_end": summarize(recorder.totals),
+        "stages": stages
+    }
+
+def print_report(report: Dict[str, Any]):
+    """Imprime o relatório em formato de tabela"""
+    summary = report['summary']
+    print(f"Documentos: {summary['documents']} ({summary['errors']} erros) | "
+          f"Tempo: {summary['wall_seconds']}s | Vazão: {summary['throughput_docs_per_s']} docs/s | "
+          f"Tokens de saída/análise: {summary.get('output_tokens_mean', '-')}")
+    print(f"{'Etapa':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'pico KB':>12}")
+    for stage, stats in list(report['stages'].items()) + [("end_to_end", report['end_to_end'])]:
+        if not stats.get("count"):
+            continue
+        peak = stats.get("peak_memory_kb", "-")
+        print(f"{stage:<24}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{peak:>12}")
+
+def compare_reports(before: Dict[str, Any], after: Dict[str, Any]):
+    """Imprime a variação de p50/p95 por etapa entre dois relatórios"""
+    print(f"{'Etapa':<24}{'p50 antes':>11}{'p50 depois':>12}{'Δ%':>8}{'p95 antes':>11}{'p95 depois':>12}{'Δ%':>8}")
+    names = list(before['stages']) + ["end_to_end"]
+    for stage in names:
+        old = before['end_to_end'] if stage == "end_to_end" else before['stages'].get(stage, {})
+        new = after['end_to_end'] if stage == "end_to_end" else after['stages'].get(stage, {})
+        if not old.get("count") or not new.get("count"):
+            continue
+        row = f"{stage:<24}"
+        for key in ("p50_ms", "p95_ms"):
+            delta = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            row += f"{old[key]:>11.2f}{new[key]:>12.2f}{delta:>+8.1f}"
+        print(row)
+    old_rate = before['summary']['throughput_docs_per_s']
+    new_rate = after['summary']['throughput_docs_per_s']
+    print(f"Vazão: {old_rate} → {new_rate} docs/s")
+    old_tokens = before['summary'].get('output_tokens_mean')
+    new_tokens = after['summary'].get('output_tokens_mean')
+    if old_tokens and new_tokens:
+        print(f"Tokens de saída/análise: {old_tokens} → {new_tokens}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de análise do SmartCV")
+    parser.add_argument("--count", type=int, default=20, help="Quantidade de currículos")
+    parser.add_argument("--min-pages", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=50)
+    parser.add_argument("--formats", default="pdf,txt", help="Formatos separados por vírgula")
+    parser.add_argument("--latency", type=float, default=0.5, help="Latência média do modelo falso (s)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Variação da latência (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fração de respostas inválidas")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Tempo por token gerado no modelo falso (s)")
+    parser.add_argument("--compact", action="store_true", help="Usar o formato compacto de resposta")
+    parser.add_argument("--concurrency", type=int, default=1, help="Documentos em paralelo")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="Não mede o pico de memória por etapa")
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: benchmarks/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("ANTES", "DEPOIS"), help="Compara dois relatórios")
+    args = parser.parse_args()
+    
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as before, open(args.compare[1], encoding='utf-8') as after:
+            compare_reports(json.load(before), json.load(after))
+        return
+    
+    report = run_benchmark(
+        count=args.count, min_pages=args.min_pages, max_pages=args.max_pages,
+        formats=tuple(args.formats.split(',')), latency=args.latency, jitter=args.jitter,
+        failure_rate=args.failure_rate, concurrency=args.concurrency, seed=args.seed,
+        measure_memory=not args.no_memory, token_latency=args.token_latency, compact=args.compact
+    )
+    print_report(report)
+    
+    output = args.output or os.path.join("benchmarks", f"{report['meta']['git_commit'] or 'local'}.json")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, ensure_ascii=False, indent=2)
+    print(f"📄 Resultado gravado em {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Caches de extração e de análise com snapshot em disco (partida a quente)
+
+Os caches ficam em memória (LRU por hash do conteúdo) e são gravados
+periodicamente e ao encerrar o processo em um arquivo compacto: chaves
+SHA-256 ordenadas, tabela de offsets e valores serializados. Depois de um
+deploy, o arquivo é aberto com mmap no primeiro acesso; cada consulta faz uma
+busca binária nas chaves e decodifica só o valor encontrado, que sobe para a
+memória. Não há carga inicial: o processo novo já responde com o cache do
+anterior.
+
+Cada snapshot carrega a impressão digital da configuração que produziu os
+valores (prompt e modelos, parâmetros do OCR). Se ela mudar, o arquivo é
+ignorado e regravado no próximo snapshot.
+"""
+
+import os
+import mmap
+import json
+import zlib
+import atexit
+import bisect
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterator, Union
+
+from analysis_model import Analysis
+from config import ANALYSIS_CONFIG, CACHE_CONFIG, FAKE_GEMINI_LATENCY, MODEL_ROUTING, OCR_CONFIG
+from cvparse import PARSER_VERSION
+from metrics import REGISTRY
+from pipeline import ANALYSIS_PROMPT, PACKED_PROMPT
+
+REGISTRY.describe("smartcv_cache_lookups_total", "counter", "Consultas aos caches por origem do resultado")
+REGISTRY.describe("smartcv_cache_snapshots_total", "counter", "Snapshots dos caches gravados em disco")
+
+SNAPSHOT_MAGIC = b"SCVCACHE"
+
+# Cabeçalho: magic, versão do formato, impressão digital da configuração, número de entradas
+SNAPSHOT_HEADER = struct.Struct("<8sI32sQ")
+SNAPSHOT_FORMAT = 1
+
+KEY_SIZE = 32
+
+# Versão do texto extraído (mudou a extração/limpeza -> invalidar snapshots)
+EXTRACTION_VERSION = 1
+
+CacheKey = Union[str, bytes]
+
+def _key_bytes(key: CacheKey) -> bytes:
+    """Chave binária de 32 bytes a partir do hash SHA-256 (hexadecimal ou bytes)"""
+    if isinstance(key, str):
+        key = bytes.fromhex(key)
+    if len(key) != KEY_SIZE:
+        raise ValueError("A chave do cache deve ser um hash SHA-256")
+    return key
+
+def fingerprint(*parts: Any) -> bytes:
+    """Impressão digital (SHA-256) das partes da configuração que determinam os valores"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).digest()
+
+class _SnapshotKeys:
+    """Sequência das chaves do snapshot, lida direto do mmap (para bisect)"""
+    
+    def __init__(self, buffer: mmap.mmap, count: int):
+        self._buffer = buffer
+        self._count = count
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> bytes:
+        start = SNAPSHOT_HEADER.size + index * KEY_SIZE
+        return self._buffer[start:start + KEY_SIZE]
+
+class Snapshot:
+    """Snapshot de um cache, aberto com mmap e consultado sem carregar os valores"""
+    
+    def __init__(self, path: str, expected_fingerprint: bytes):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # arquivo vazio
+            self._file.close()
+            raise ValueError(f"Snapshot vazio: {path}")
+        try:
+            magic, fmt, stored_fingerprint, count = SNAPSHOT_HEADER.unpack_from(self._buffer)
+            if magic != SNAPSHOT_MAGIC or fmt != SNAPSHOT_FORMAT:
+                raise ValueError(f"Formato de snapshot desconhecido: {path}")
+            if stored_fingerprint != expected_fingerprint:
+                raise ValueError(f"Snapshot de outra configuração: {path}")
+            self.count = count
+            self._offsets_start = SNAPSHOT_HEADER.size + count * KEY_SIZE
+            self._values_start = self._offsets_start + (count + 1) * 8
+            end, = struct.unpack_from("<Q", self._buffer, self._offsets_start + count * 8)
+            if self._values_start + end != len(self._buffer):
+                raise ValueError(f"Snapshot truncado: {path}")
+        except struct.error:
+            self.close()
+            raise ValueError(f"Snapshot truncado: {path}")
+        except ValueError:
+            self.close()
+            raise
+        self._keys = _SnapshotKeys(self._buffer, count)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def find(self, key: bytes) -> Optional[int]:
+        """Posição da chave no snapshot (None se ausente)"""
+        index = bisect.bisect_left(self._keys, key)
+        if index < self.count and self._keys[index] == key:
+            return index
+        return None
+    
+    def value(self, index: int) -> bytes:
+        """Valor serializado da posição (copiado do mmap)"""
+        start, end = struct.unpack_from("<QQ", self._buffer, self._offsets_start + index * 8)
+        return self._buffer[self._values_start + start:self._values_start + end]
+    
+    def items(self) -> Iterator[Tuple[bytes, bytes]]:
+        """Pares (chave, valor serializado), em ordem de chave"""
+        for index in range(self.count):
+            yield self._keys[index], self.value(index)
+    
+    def close(self):
+        self._buffer.close()
+        self._file.close()
+
+def write_snapshot(path: str, snapshot_fingerprint: bytes, items: List[Tuple[bytes, bytes]]) -> int:
+    """
+    Grava um snapshot de forma atômica
+    
+    Args:
+        path: Arquivo de destino (gravado em temporário e renomeado)
+        snapshot_fingerprint: Impressão digital da configuração
+        items: Pares (chave de 32 bytes, valor serializado), sem chaves repetidas
+    
+    Returns:
+        int: Tamanho do arquivo em bytes
+    """
+    items = sorted(items)
+    offsets = [0]
+    for _, value in items:
+        offsets.append(offsets[-1] + len(value))
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as output:
+        output.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, snapshot_fingerprint, len(items)))
+        output.write(b"".join(key for key, _ in items))
+        output.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        for _, value in items:
+            output.write(value)
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temp_path, path)
+    return SNAPSHOT_HEADER.size + len(items) * KEY_SIZE + len(offsets) * 8 + offsets[-1]
+
+class WarmCache:
+    """
+    Cache LRU em memória por hash do conteúdo, com snapshot em disco
+    
+    Consultas olham primeiro a memória e depois o snapshot do processo
+    anterior (aberto com mmap no primeiro acesso). Sem path, o cache fica só
+    em memória.
+    """
+    
+    def __init__(self, name: str, max_entries: int, encode: Callable[[Any], bytes],
+                 decode: Callable[[bytes], Any], snapshot_fingerprint: bytes = b"\0" * 32,
+                 path: Optional[str] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.path = path
+        self._encode = encode
+        self._decode = decode
+        self._fingerprint = snapshot_fingerprint
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._snapshot: Optional[Snapshot] = None
+        self._opened = path is None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+    
+    def _open_snapshot(self, path: str) -> Optional[Snapshot]:
+        """Abre o snapshot gravado, ignorando arquivos ausentes, corrompidos ou de outra configuração"""
+        try:
+            return Snapshot(path, self._fingerprint)
+        except (OSError, ValueError):
+            return None
+    
+    def _ensure_snapshot(self):
+        """Abre o snapshot no primeiro acesso (chamado com a trava)"""
+        if not self._opened:
+            self._opened = True
+            self._snapshot = self._open_snapshot(self.path)
+    
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """
+        Valor em cache para a chave
+        
+        Args:
+            key: Hash SHA-256 do conteúdo (hexadecimal ou 32 bytes)
+        
+        Returns:
+            Valor armazenado ou None
+        """
+        key = _key_bytes(key)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                REGISTRY.increment("smartcv_cache_lookups_total", cache=self.name, result="memory")
+                return value
+            self._ensure_snapshot()
+            index = self._snapshot.find(key) if self._snapshot is not None else None
+            data = self._snapshot.value(index) if index is not None else None
+        if data is None:
+            REGISTRY.increment("smartcv_cache_lookups_total", cache=self.name, result="miss")
+            return None
+        
+        try:
+            value = self._decode(data)
+        except Exception:
+            REGISTRY.increment("smartcv_cache_lookups_total", cache=self.name, result="miss")
+            return None
+        with self._lock:
+            # Já está no snapshot: promover sem marcar o cache como alterado
+            self._store(key, value)
+        REGISTRY.increment("smartcv_cache_lookups_total", cache=self.name, result="snapshot")
+        return value
+    
+    def put(self, key: CacheKey, value: Any):
+        """Armazena um valor (não None) para a chave"""
+        key = _key_bytes(key)
+        with self._lock:
+            self._store(key, value)
+            self._dirty = True
+    
+    def _store(self, key: bytes, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def save(self) -> bool:
+        """
+        Grava o snapshot se houve alterações desde o último
+        
+        O conteúdo é a memória (entradas mais recentes) completada com o
+        snapshot atual do disco, que pode ter sido gravado por outro processo,
+        até max_entries.
+        
+        Returns:
+            bool: True se um snapshot foi gravado
+        """
+        if self.path is None:
+            return False
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return False
+                self._dirty = False
+                recent = list(self._entries.items())
+            
+            items: Dict[bytes, bytes] = {}
+            try:
+                for key, value in reversed(recent):
+                    items[key] = self._encode(value)
+                base = self._open_snapshot(self.path)
+                if base is not None:
+                    try:
+                        for key, data in base.items():
+                            if len(items) >= self.max_entries:
+                                break
+                            items.setdefault(key, data)
+                    finally:
+                        base.close()
+                write_snapshot(self.path, self._fingerprint, list(items.items()))
+            except Exception:
+                with self._lock:
+                    self._dirty = True
+                raise
+            
+            snapshot = self._open_snapshot(self.path)
+            with self._lock:
+                previous, self._snapshot, self._opened = self._snapshot, snapshot, True
+            if previous is not None:
+                previous.close()
+        REGISTRY.increment("smartcv_cache_snapshots_total", cache=self.name)
+        return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Entradas em memória e no snapshot"""
+        with self._lock:
+            return {
+                "memory": len(self._entries),
+                "snapshot": len(self._snapshot) if self._snapshot is not None else 0,
+                "path": self.path
+            }
+    
+    def close(self):
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+
+def _encode_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+def _decode_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+def _encode_analysis(analysis: Analysis) -> bytes:
+    return analysis.to_bytes()
+
+def open_caches(directory: Optional[str] = None, config: Optional[Dict[str, Any]] = None) -> Dict[str, WarmCache]:
+    """
+    Cria os caches de extração (texto limpo por hash do arquivo) e de análise
+    (por hash do texto)
+    
+    Args:
+        directory: Pasta dos snapshots (padrão: CACHE_CONFIG["snapshot_dir"])
+        config: Sobrescreve chaves de CACHE_CONFIG
+    
+    Returns:
+        dict: Caches por nome ('extraction' e 'analysis')
+    """
+    config = {**CACHE_CONFIG, **(config or {})}
+    directory = directory or config["snapshot_dir"]
+    
+    def snapshot_path(name: str, enabled: bool) -> Optional[str]:
+        return os.path.join(directory, f"{name}.snapshot") if config["snapshot"] and enabled else None
+    
+    return {
+        "extraction": WarmCache(
+            "extraction", config["extraction_entries"], _encode_text, _decode_text,
+            fingerprint(EXTRACTION_VERSION, OCR_CONFIG["enabled"], OCR_CONFIG["languages"], OCR_CONFIG["dpi"]),
+            snapshot_path("extraction", config["snapshot_text"])
+        ),
+        "analysis": WarmCache(
+            "analysis", config["analysis_entries"], _encode_analysis, Analysis.from_bytes,
+            fingerprint(ANALYSIS_PROMPT, PACKED_PROMPT, MODEL_ROUTING, FAKE_GEMINI_LATENCY is not None,
+                        ANALYSIS_CONFIG["structured_prompt"], PARSER_VERSION),
+            snapshot_path("analysis", True)
+        )
+    }
+
+def save_all(caches: Dict[str, WarmCache]):
+    """Grava o snapshot de cada cache alterado (falhas não interrompem os demais)"""
+    for cache in caches.values():
+        try:
+            cache.save()
+        except OSError:
+            pass
+
+def start_snapshots(caches: Dict[str, WarmCache], interval: Optional[float] = None) -> Optional[threading.Thread]:
+    """
+    Grava os snapshots a cada intervalo e ao encerrar o processo
+    
+    Args:
+        caches: Caches criados por open_caches
+        interval: Segundos entre snapshots (padrão: CACHE_CONFIG["snapshot_interval"])
+    
+    Returns:
+        Thread de snapshots periódicos, ou None se nenhum cache grava em disco
+    """
+    if not any(cache.path for cache in caches.values()):
+        return None
+    interval = interval or CACHE_CONFIG["snapshot_interval"]
+    stop = threading.Event()
+    
+    def loop():
+        while not stop.wait(interval):
+            save_all(caches)
+    
+    def shutdown():
+        stop.set()
+        save_all(caches)
+    
+    atexit.register(shutdown)
+    thread = threading.Thread(target=loop, name="smartcv-cache-snapshot", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,208 @@
+"""
+Formato compacto de resposta do modelo: chaves curtas e sugestões codificadas
+"""
+
+import json
+import dataclasses
+import functools
+from typing import Dict, Any, List
+
+from config import ANALYSIS_CONFIG, OUTPUT_CONFIG
+from cvparse import prompt_content
+from metrics import timed
+
+# Catálogo de sugestões: o modelo devolve apenas o código, expandido localmente
+SUGGESTION_CODES = {
+    # Clareza e coesão
+    "C1": "Comece cada item de experiência com um verbo de ação (ex.: liderei, implementei, reduzi)",
+    "C2": "Encurte frases longas e elimine repetições",
+    "C3": "Revise a ortografia, a acentuação e a concordância",
+    "C4": "Mantenha o mesmo tempo verbal em toda a seção de experiência",
+    "C5": "Substitua termos genéricos por descrições concretas do que foi feito",
+    "C6": "Reescreva o objetivo profissional de forma específica para a vaga",
+    # Estrutura e organização
+    "E1": "Organize as experiências em ordem cronológica inversa (mais recente primeiro)",
+    "E2": "Use bullet points curtos em vez de parágrafos",
+    "E3": "Padronize a formatação de datas, cargos e empresas",
+    "E4": "Inclua um resumo profissional de 3 a 4 linhas no topo",
+    "E5": "Separe claramente as seções (experiência, formação, habilidades, idiomas)",
+    "E6": "Mantenha o currículo em até duas páginas",
+    "E7": "Coloque os dados de contato completos no cabeçalho",
+    # Palavras-chave
+    "K1": "Inclua as ferramentas e tecnologias exigidas nas vagas da sua área",
+    "K2": "Crie uma seção de competências técnicas com termos usados por sistemas ATS",
+    "K3": "Repita os termos-chave da vaga nas descrições de experiência",
+    "K4": "Informe o nível de proficiência em idiomas",
+    "K5": "Mencione certificações relevantes com o ano de conclusão",
+    # Melhorias gerais
+    "M1": "Quantifique resultados com números (percentuais, valores, prazos)",
+    "M2": "Destaque conquistas em vez de apenas responsabilidades",
+    "M3": "Adapte o currículo para cada vaga",
+    "M4": "Inclua links para LinkedIn ou portfólio",
+    "M5": "Remova informações pessoais desnecessárias (documentos, estado civil)",
+    "M6": "Detalhe projetos relevantes com tecnologias e impacto"
+}
+
+SECTION_CODES = {
+    "clarity": [code for code in SUGGESTION_CODES if code.startswith("C")],
+    "structure": [code for code in SUGGESTION_CODES if code.startswith("E")],
+    "keywords": [code for code in SUGGESTION_CODES if code.startswith("K")],
+    "improvements": [code for code in SUGGESTION_CODES if code.startswith("M")]
+}
+
+# Marcador usado para reconhecer o prompt compacto (ex.: no modelo simulado)
+COMPACT_MARKER = "FORMATO COMPACTO"
+
+COMPACT_PROMPT = """
+        Você é um especialista em análise de currículos com mais de 15 anos de experiência em RH no Brasil.
+        Avalie o currículo em clareza e coesão, estrutura e organização, e palavras-chave para ATS (0 a 100 cada).
+        Responda APENAS com JSON válido no {marker}, sem texto adicional:
+        
+        {{"o": nota geral, "c": {{"s": nota, "f": "feedback", "g": [códigos]}}, "e": {{"s": nota, "f": "feedback", "g": [códigos]}},
+        "k": {{"s": nota, "p": [palavras-chave presentes], "m": [palavras-chave ausentes], "g": [códigos]}},
+        "i": [códigos de melhorias], "pf": [pontos fortes], "r": "resumo"}}
+        
+        REGRAS:
+        - c = clareza, e = estrutura, k = palavras-chave
+        - "f" com no máximo {feedback_words} palavras; "r" com no máximo {summary_words} palavras; cada ponto forte com até 6 palavras
+        - "g" e "i": 2 a 3 códigos da lista abaixo (use texto curto apenas se nenhum código servir)
+        - "p" e "m": até 8 termos curtos cada
+        
+        CÓDIGOS:
+        {codes}
+        
+        CURRÍCULO PARA ANÁLISE:
+        {content}
+        """
+
+def _score_schema() -> Dict[str, Any]:
+    """Schema de uma nota"""
+    return {"type": "integer"}
+
+def _codes_schema(section: str) -> Dict[str, Any]:
+    """Schema de uma lista de códigos de sugestão da seção"""
+    return {"type": "array", "items": {"type": "string", "enum": SECTION_CODES[section]}}
+
+# Schema para o modo de saída estruturada (SDKs que aceitam response_schema)
+COMPACT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "o": _score_schema(),
+        "c": {"type": "object", "properties": {"s": _score_schema(), "f": {"type": "string"}, "g": _codes_schema("clarity")},
+              "required": ["s", "f", "g"]},
+        "e": {"type": "object", "properties": {"s": _score_schema(), "f": {"type": "string"}, "g": _codes_schema("structure")},
+              "required": ["s", "f", "g"]},
+        "k": {"type": "object", "properties": {"s": _score_schema(),
+                                               "p": {"type": "array", "items": {"type": "string"}},
+                                               "m": {"type": "array", "items": {"type": "string"}},
+                                               "g": _codes_schema("keywords")},
+              "required": ["s", "p", "m", "g"]},
+        "i": _codes_schema("improvements"),
+        "pf": {"type": "array", "items": {"type": "string"}},
+        "r": {"type": "string"}
+    },
+    "required": ["o", "c", "e", "k", "i", "pf", "r"]
+}
+
+@timed("build_prompt")
+def build_compact_prompt(content: str) -> str:
+    """
+    Monta o prompt que pede a análise no formato compacto
+    
+    Args:
+        content: Texto do currículo
+    
+    Returns:
+        str: Prompt completo
+    """
+    codes = "\n        ".join(f"{code}: {text}" for code, text in SUGGESTION_CODES.items())
+    return COMPACT_PROMPT.format(
+        marker=COMPACT_MARKER, codes=codes, content=prompt_content(content),
+        feedback_words=OUTPUT_CONFIG["max_feedback_words"], summary_words=OUTPUT_CONFIG["max_summary_words"]
+    )
+
+def expand_codes(values: Any) -> List[str]:
+    """Troca códigos do catálogo pelo texto completo (textos livres são mantidos)"""
+    if not isinstance(values, list):
+        return values
+    return [SUGGESTION_CODES.get(str(value).strip().upper(), value) for value in values]
+
+def expand_compact_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte a resposta compacta na estrutura usada pelo restante do app
+    
+    Args:
+        data: JSON compacto retornado pelo modelo
+    
+    Returns:
+        dict: Análise com overallScore, clarity, structure, keywords, etc.
+    """
+    clarity = data.get('c') or {}
+    structure = data.get('e') or {}
+    keywords = data.get('k') or {}
+    return {
+        "overallScore": data.get('o'),
+        "clarity": {
+            "score": clarity.get('s'),
+            "feedback": clarity.get('f', ""),
+            "suggestions": expand_codes(clarity.get('g', []))
+        },
+        "structure": {
+            "score": structure.get('s'),
+            "feedback": structure.get('f', ""),
+            "suggestions": expand_codes(structure.get('g', []))
+        },
+        "keywords": {
+            "score": keywords.get('s'),
+            "missing": keywords.get('m', []),
+            "present": keywords.get('p', []),
+            "suggestions": expand_codes(keywords.get('g', []))
+        },
+        "improvements": expand_codes(data.get('i', [])),
+        "strengths": data.get('pf', []),
+        "summary": data.get('r', "")
+    }
+
+@functools.lru_cache(maxsize=1)
+def supports_response_schema() -> bool:
+    """Indica se a versão instalada do google-generativeai aceita response_schema"""
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return False
+    fields = {field.name for field in dataclasses.fields(genai.types.GenerationConfig)}
+    return "response_schema" in fields
+
+def full_generation_config() -> Dict[str, Any]:
+    """
+    Parâmetros de geração do formato completo (ANALYSIS_CONFIG)
+    
+    Returns:
+        dict: generation_config para generate_content
+    """
+    return {key: ANALYSIS_CONFIG[key] for key in ("temperature", "top_p", "top_k", "max_output_tokens")}
+
+def compact_generation_config() -> Dict[str, Any]:
+    """
+    Parâmetros de geração do formato compacto
+    
+    Usa saída estruturada (application/json com schema) quando o SDK oferece;
+    senão, o formato é pedido apenas no prompt.
+    
+    Returns:
+        dict: generation_config para generate_content
+    """
+    config = {
+        "temperature": ANALYSIS_CONFIG["temperature"],
+        "top_p": ANALYSIS_CONFIG["top_p"],
+        "top_k": ANALYSIS_CONFIG["top_k"],
+        "max_output_tokens": OUTPUT_CONFIG["max_output_tokens"]
+    }
+    if supports_response_schema():
+        config["response_mime_type"] = "application/json"
+        config["response_schema"] = COMPACT_RESPONSE_SCHEMA
+    return config
+
+def compact_json(analysis: Dict[str, Any]) -> str:
+    """Serializa uma análise compacta sem espaços (menos tokens)"""
+    return json.dumps(analysis, ensure_ascii=False, separators=(",", ":"))
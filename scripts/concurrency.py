@@ -0,0 +1,151 @@
+"""
+Limite adaptativo de chamadas simultâneas ao modelo (AIMD)
+"""
+
+import time
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+from config import CONCURRENCY_CONFIG
+from metrics import REGISTRY
+from scheduler import PRIORITIES, current_priority
+
+REGISTRY.describe("smartcv_concurrency_limit", "gauge", "Limite atual de chamadas simultâneas ao modelo")
+REGISTRY.describe("smartcv_concurrency_inflight", "gauge", "Chamadas ao modelo em andamento")
+REGISTRY.describe("smartcv_concurrency_decreases_total", "counter", "Reduções do limite por sobrecarga")
+
+OVERLOAD_MARKERS = ("429", "resource has been exhausted", "resourceexhausted", "too many requests",
+                    "deadline exceeded", "timed out", "timeout")
+
+def is_overload_error(error: BaseException) -> bool:
+    """
+    Indica se o erro sinaliza sobrecarga da API (429 ou timeout)
+    
+    Args:
+        error: Exceção levantada pela chamada ao modelo
+        
+    Returns:
+        bool: True para limite de taxa e timeouts
+    """
+    if isinstance(error, TimeoutError):
+        return True
+    if getattr(error, "code", None) in (429, 504):
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in OVERLOAD_MARKERS)
+
+class AdaptiveLimiter:
+    """
+    Limitador AIMD de chamadas simultâneas
+    
+    Cada chamada bem-sucedida dentro da latência alvo soma 1/limite ao limite
+    (cerca de +1 a cada "janela" completa de chamadas). Um 429 ou timeout
+    multiplica o limite por decrease_factor, no máximo uma vez por cooldown,
+    para que uma rajada de erros da mesma janela conte como um único sinal.
+    Quem espera por vaga é atendido por prioridade e, dentro dela, por ordem.
+    """
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = {**CONCURRENCY_CONFIG, **(config or {})}
+        self.limit = float(self.config["initial_limit"])
+        self.inflight = 0
+        self._last_decrease = 0.0
+        self._waiters: list = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._publish()
+    
+    def _publish(self):
+        REGISTRY.set_gauge("smartcv_concurrency_limit", int(self.limit))
+        REGISTRY.set_gauge("smartcv_concurrency_inflight", self.inflight)
+    
+    def acquire(self, priority: Optional[str] = None):
+        """Aguarda uma vaga (análises interativas passam à frente)"""
+        priority = priority or current_priority()
+        rank = PRIORITIES.index(priority) if priority in PRIORITIES else len(PRIORITIES)
+        ticket = (rank, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while self._waiters[0] != ticket or self.inflight >= int(self.limit):
+                    self._condition.wait()
+            except BaseException:
+                # Interrompido na espera: a senha na frente da fila travaria os demais
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+                raise
+            heapq.heappop(self._waiters)
+            self.inflight += 1
+            self._publish()
+            self._condition.notify_all()
+    
+    def release(self, latency: float, overloaded: bool = False):
+        """
+        Libera a vaga e ajusta o limite
+        
+        Args:
+            latency: Duração da chamada (s)
+            overloaded: True se a chamada terminou em 429 ou timeout
+        """
+        with self._condition:
+            self.inflight -= 1
+            now = time.monotonic()
+            if overloaded:
+                if now - self._last_decrease >= self.config["cooldown"]:
+                    self.limit = max(self.config["min_limit"], self.limit * self.config["decrease_factor"])
+                    self._last_decrease = now
+                    REGISTRY.increment("smartcv_concurrency_decreases_total")
+            elif latency <= self.config["latency_target"]:
+                self.limit = min(self.config["max_limit"], self.limit + 1.0 / self.limit)
+            self._publish()
+            self._condition.notify_all()
+    
+    @contextmanager
+    def slot(self, priority: Optional[str] = None):
+        """Ocupa uma vaga durante o bloco e ajusta o limite pelo resultado"""
+        self.acquire(priority)
+        start = time.perf_counter()
+        overloaded = False
+        try:
+            yield
+        except BaseException as e:
+            overloaded = is_overload_error(e)
+            raise
+        finally:
+            self.release(time.perf_counter() - start, overloaded)
+    
+    def wrap(self, model) -> "LimitedModel":
+        """Envolve um modelo para que toda chamada passe pelo limitador"""
+        return LimitedModel(model, self)
+
+class LimitedModel:
+    """
+    Modelo cujo generate_content respeita o limitador adaptativo
+    
+    upstream_seconds() acumula, por thread, só o tempo dentro da vaga: quem
+    mede a latência do modelo não conta a espera na fila do limitador.
+    """
+    
+    def __init__(self, model, limiter: AdaptiveLimiter):
+        self.model = model
+        self.limiter = limiter
+        self._local = threading.local()
+    
+    def generate_content(self, *args, **kwargs):
+        with self.limiter.slot():
+            start = time.perf_counter()
+            try:
+                return self.model.generate_content(*args, **kwargs)
+            finally:
+                self._local.upstream = self.upstream_seconds() + time.perf_counter() - start
+    
+    def upstream_seconds(self) -> float:
+        """Tempo acumulado nas chamadas ao modelo feitas por esta thread (s)"""
+        return getattr(self._local, "upstream", 0.0)
+    
+    def __getattr__(self, name):
+        return getattr(self.model, name)
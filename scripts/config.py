@@ -12,6 +12,65 @@ load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = "gemini-1.5-flash"  # Modelo mais rápido e econômico
 
+# Gemini simulado no lugar da API (testes de carga): latência em segundos por chamada
+FAKE_GEMINI_LATENCY = float(os.environ["SMARTCV_FAKE_GEMINI"]) if os.getenv("SMARTCV_FAKE_GEMINI") else None
+
+# Roteamento entre modelos (do mais barato/rápido ao mais forte)
+MODEL_ROUTING = {
+    "enabled": os.getenv("SMARTCV_ROUTING", "1") == "1",
+    "tiers": os.getenv("SMARTCV_MODEL_TIERS", f"gemini-1.5-flash-8b,{GEMINI_MODEL},gemini-1.5-pro").split(","),
+    "fast_max_chars": 12000,      # Currículos maiores não vão para o modelo mais barato
+    "fast_min_confidence": 0.6,   # Confiança mínima da pré-avaliação local
+    "latency_budget": 8.0,        # Latência (s) acima da qual um modelo é evitado
+    "latency_alpha": 0.2,         # Peso da última observação na média móvel
+    "latency_probe_interval": 30.0  # Um modelo evitado por lentidão recebe uma análise a cada intervalo (s)
+}
+
+# Vários currículos curtos em uma única chamada (modo lote)
+PACKING_CONFIG = {
+    "enabled": os.getenv("SMARTCV_PACKING", "1") == "1",
+    "max_items": 5,               # Currículos por chamada (a saída cresce ~700 tokens por item)
+    "max_item_chars": 4000,       # Só currículos curtos entram no lote
+    "max_total_chars": 16000      # Tamanho máximo dos currículos somados em uma chamada
+}
+
+# Escalonamento das chamadas ao modelo por classe de prioridade
+SCHEDULER_CONFIG = {
+    "workers": int(os.getenv("SMARTCV_SCHEDULER_WORKERS", "16")),  # Teto; o limitador adaptativo controla o uso real
+    "reserved_interactive": 1,    # Vagas que só atendem análises interativas
+    "max_queue": 200,             # Acima disso, o trabalho de menor prioridade é descartado
+    "weights": {                  # Participação relativa quando há fila em várias classes
+        "interactive": 16,
+        "batch": 4,
+        "reanalysis": 1,
+        "speculative": 8
+    },
+    "deadlines": {                # Prazo padrão (s) entre envio e início da execução
+        "interactive": 120,
+        "batch": 3600,
+        "reanalysis": None,
+        "speculative": 30         # Na fila além disso, o clique reenvia como interativa
+    }
+}
+
+# Análise antecipada no upload, antes do clique em "Analisar" (speculation.py)
+SPECULATION_CONFIG = {
+    "enabled": os.getenv("SMARTCV_SPECULATIVE", "0") == "1",
+    "max_inflight": int(os.getenv("SMARTCV_SPECULATIVE_MAX_INFLIGHT", "4")),  # Antecipadas simultâneas no processo
+    "max_wasted_per_session": 3,  # Descartadas após começar; acima disso a sessão deixa de antecipar
+    "max_wasted_per_hour": int(os.getenv("SMARTCV_SPECULATIVE_MAX_WASTED", "30"))  # Teto do processo por hora
+}
+
+# Limite adaptativo (AIMD) de chamadas simultâneas ao modelo
+CONCURRENCY_CONFIG = {
+    "initial_limit": 4,
+    "min_limit": 1,
+    "max_limit": 16,
+    "latency_target": 15.0,       # Latência (s) considerada saudável para aumentar o limite
+    "decrease_factor": 0.5,       # Redução multiplicativa em 429 ou timeout
+    "cooldown": 5.0               # Intervalo mínimo (s) entre duas reduções
+}
+
 # Configurações do Streamlit
 STREAMLIT_CONFIG = {
     "page_title": "SmartCV - Analisador de Currículos com IA",
@@ -26,7 +85,16 @@ ANALYSIS_CONFIG = {
     "temperature": 0.3,
     "max_output_tokens": 2048,
     "top_p": 0.8,
-    "top_k": 40
+    "top_k": 40,
+    "structured_prompt": os.getenv("SMARTCV_STRUCTURED_PROMPT", "0") == "1"  # Opcional: prompt sem contatos e com a estrutura extraída (cvparse.py)
+}
+
+# Formato compacto de resposta (chaves curtas e sugestões codificadas)
+OUTPUT_CONFIG = {
+    "compact": os.getenv("SMARTCV_COMPACT_OUTPUT", "0") == "1",
+    "max_output_tokens": 1024,    # O formato completo usa ANALYSIS_CONFIG["max_output_tokens"]
+    "max_feedback_words": 30,
+    "max_summary_words": 45
 }
 
 # Critérios de pontuação
@@ -50,6 +118,123 @@ SECURITY_CONFIG = {
     "rate_limit_per_hour": 10     # Máximo de análises por hora por usuário
 }
 
+# Configurações de armazenamento das análises
+DATA_DIR = os.getenv("SMARTCV_DATA_DIR", "data")
+
+STORAGE_CONFIG = {
+    "db_path": os.getenv("SMARTCV_DB_PATH", os.path.join(DATA_DIR, "smartcv.db")),
+    "batch_size": 1000,           # Registros lidos por lote em varreduras completas
+    "journal_mode": os.getenv("SMARTCV_JOURNAL_MODE", "WAL")  # Use DELETE em armazenamento de rede (NFS/SMB)
+}
+
+# OCR das páginas sem camada de texto (PDFs digitalizados)
+# Opcional: requer pypdfium2, pytesseract e o binário tesseract (com o idioma "por")
+OCR_CONFIG = {
+    "enabled": os.getenv("SMARTCV_OCR", "1") == "1",
+    "workers": int(os.getenv("SMARTCV_OCR_WORKERS", str(min(4, os.cpu_count() or 1)))),  # Processos; 1 = no próprio processo
+    "languages": os.getenv("SMARTCV_OCR_LANG", "por+eng"),
+    "dpi": 200,                   # Resolução da rasterização
+    "min_page_chars": 20,         # Páginas com menos texto extraído passam pelo OCR
+    "max_pages": 20,              # Teto de páginas reconhecidas por documento
+    "cache_pages": 512            # Páginas reconhecidas mantidas em memória (por hash da página)
+}
+
+# Caches de extração e de análise com snapshot em disco (cache.py)
+CACHE_CONFIG = {
+    "extraction_entries": 256,    # Textos extraídos de PDFs mantidos (por hash do arquivo)
+    "analysis_entries": 4096,     # Análises mantidas (por hash do texto); evita chamar o modelo de novo
+    "snapshot": os.getenv("SMARTCV_CACHE_SNAPSHOT", "1") == "1",  # Grava os caches para o próximo processo
+    "snapshot_text": os.getenv("SMARTCV_CACHE_SNAPSHOT_TEXT", "0") == "1",  # Inclui o texto dos currículos no snapshot
+    "snapshot_dir": os.getenv("SMARTCV_CACHE_DIR", os.path.join(DATA_DIR, "cache")),
+    "snapshot_interval": float(os.getenv("SMARTCV_CACHE_SNAPSHOT_INTERVAL", "300"))  # Segundos entre snapshots
+}
+
+# Detecção de currículos quase duplicados (MinHash + LSH)
+DEDUP_CONFIG = {
+    "enabled": os.getenv("SMARTCV_DEDUP", "1") == "1",
+    "num_perm": 128,              # Tamanho da assinatura MinHash
+    "bands": 16,                  # Faixas LSH (128/16 = 8 linhas; candidatos a partir de ~70% de similaridade)
+    "shingle_size": 5,            # Palavras por shingle
+    "threshold": 0.85,            # Similaridade mínima para considerar duplicata
+    "batch_action": os.getenv("SMARTCV_DEDUP_ACTION", "reuse"),  # reuse, skip ou analyze
+    "seed": 1
+}
+
+# Busca textual nos currículos analisados (índice invertido em disco, search.py)
+SEARCH_CONFIG = {
+    "enabled": os.getenv("SMARTCV_SEARCH", "0") == "1",  # Grava os termos dos currículos: ligue só com consentimento
+    "index_dir": os.getenv("SMARTCV_SEARCH_DIR", os.path.join(DATA_DIR, "search")),
+    "k1": 1.2,                    # Saturação da frequência do termo (BM25)
+    "b": 0.75,                    # Normalização pelo tamanho do currículo (BM25)
+    "merge_factor": 10,           # Segmentos de tamanho parecido fundidos de uma vez
+    "background_merge": True,     # Fusões fora do caminho da gravação
+    "max_results": 50
+}
+
+# Arquivo comprimido dos textos extraídos e das respostas do modelo (archive.py)
+ARCHIVE_CONFIG = {
+    "enabled": os.getenv("SMARTCV_ARCHIVE", "0") == "1",  # Grava o texto dos currículos: ligue só com consentimento
+    "db_path": os.getenv("SMARTCV_ARCHIVE_PATH", os.path.join(DATA_DIR, "archive.db")),
+    "codec": os.getenv("SMARTCV_ARCHIVE_CODEC", "auto"),  # auto (zstd se o pacote zstandard estiver instalado), zstd ou zlib
+    "level": 9,                   # Nível de compressão (zstd 1-22, zlib 1-9)
+    "dict_size": 64 * 1024,       # Tamanho do dicionário treinado (o zlib usa no máximo 32 KB)
+    "train_min_records": 50,      # Registros de um tipo antes do primeiro dicionário
+    "train_sample": 2000,         # Registros mais recentes usados no treino
+    "retrain_growth": 2.0,        # Novo dicionário quando os registros do tipo crescem esse fator
+    "compact_batch": 200,         # Registros recomprimidos por transação
+    "vacuum_ratio": 1.5,          # Reescreve o banco (VACUUM) se ele passar desse múltiplo dos dados
+    "background_compaction": True
+}
+
+# Modo worker distribuído (fila compartilhada entre processos/máquinas)
+WORKER_CONFIG = {
+    "queue_path": os.getenv("SMARTCV_QUEUE_PATH", os.path.join(DATA_DIR, "queue.db")),
+    "journal_mode": os.getenv("SMARTCV_QUEUE_JOURNAL_MODE", "DELETE"),  # WAL só com todos os processos na mesma máquina
+    "concurrency": int(os.getenv("SMARTCV_WORKER_CONCURRENCY", "4")),    # Trabalhos simultâneos por worker
+    "lease_seconds": 120,         # Tempo de posse de um trabalho sem heartbeat
+    "heartbeat_interval": 30,     # Renovação da posse dos trabalhos em andamento
+    "poll_interval": 1.0,         # Espera (s) quando a fila está vazia
+    "max_attempts": 3             # Tentativas antes de marcar o trabalho como falho
+}
+
+# Ingestão por pasta observada (daemon watcher.py)
+WATCH_CONFIG = {
+    "mode": os.getenv("SMARTCV_WATCH_MODE", "auto"),  # auto, inotify ou poll (use poll em pastas de rede)
+    "poll_interval": float(os.getenv("SMARTCV_WATCH_POLL_INTERVAL", "2.0")),  # Varredura no modo poll (s)
+    "queue_size": 8,              # Capacidade das filas entre os estágios (contrapressão)
+    "extract_workers": 1,         # Threads de extração (o PyPDF2 segura o GIL)
+    "analyze_workers": 4,         # Chamadas simultâneas ao modelo
+    "result_suffix": ".smartcv.json",  # Resultado gravado ao lado do arquivo de entrada
+    "error_suffix": ".smartcv.error.json",  # Falha temporária (ex.: cota da API); o arquivo será tentado de novo
+    "max_retries": 3,             # Novas tentativas no mesmo processo após falha temporária
+    "retry_delay": 30.0           # Espera (s) antes da primeira nova tentativa; dobra a cada falha
+}
+
+# Configurações de exportação em lote
+EXPORT_CONFIG = {
+    "formats": ['parquet', 'csv'],
+    "default_format": "parquet",
+    "compression": "zstd"         # Compressão das colunas no Parquet
+}
+
+# Configurações de instrumentação
+METRICS_CONFIG = {
+    "enabled": os.getenv("SMARTCV_METRICS", "1") == "1",
+    "host": os.getenv("SMARTCV_METRICS_HOST", "127.0.0.1"),
+    "port": int(os.getenv("SMARTCV_METRICS_PORT", "9464")),  # Endpoint /metrics (Prometheus)
+    "debug_panel": os.getenv("SMARTCV_DEBUG", "0") == "1"     # Painel de tempos na sidebar
+}
+
+# Perfil de execução das requisições lentas (profiler.py)
+PROFILING_CONFIG = {
+    "enabled": os.getenv("SMARTCV_PROFILE", "0") == "1",         # Também pode ser ligado pela sidebar (SMARTCV_DEBUG=1)
+    "mode": os.getenv("SMARTCV_PROFILE_MODE", "sample"),        # sample (pilhas amostradas) ou cprofile
+    "threshold_seconds": float(os.getenv("SMARTCV_PROFILE_THRESHOLD", "5.0")),  # Só grava requisições mais lentas
+    "interval": 0.005,            # Intervalo entre amostras no modo sample (s)
+    "output_dir": os.getenv("SMARTCV_PROFILE_DIR", os.path.join(DATA_DIR, "profiles")),
+    "max_files": 50               # Perfis mais antigos são apagados
+}
+
 # Mensagens do sistema
 SYSTEM_MESSAGES = {
     "welcome": "Bem-vindo ao SmartCV! Faça upload do seu currículo para receber uma análise detalhada.",
@@ -0,0 +1,175 @@
+"""
+Gerador de currículos sintéticos (PDF e TXT) para benchmarks
+"""
+
+import os
+import random
+import argparse
+from typing import List, Tuple, Iterator, NamedTuple
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Fernanda", "Gustavo", "Helena", "Igor", "Juliana", "Lucas"]
+LAST_NAMES = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Costa", "Rodrigues", "Almeida", "Nascimento"]
+ROLES = ["Analista de Dados", "Desenvolvedor Python", "Gerente de Projetos", "Assistente Administrativo",
+         "Engenheira de Software", "Analista Financeiro", "Coordenador de Vendas", "Designer UX"]
+COMPANIES = ["Tech Brasil Ltda", "Banco Horizonte", "Varejo Nacional S.A.", "Consultoria Alfa",
+             "Indústria Delta", "Startup Ômega", "Hospital São Lucas", "Logística Rápida"]
+SKILLS = ["Python", "SQL", "Excel", "Power BI", "Scrum", "Git", "Docker", "AWS", "Java", "Tableau",
+          "Negociação", "Liderança", "Comunicação", "Inglês Avançado", "Espanhol", "Kanban"]
+VERBS = ["Desenvolvi", "Coordenei", "Implantei", "Reduzi", "Aumentei", "Automatizei", "Liderei", "Otimizei"]
+OBJECTS = ["relatórios gerenciais", "processos de atendimento", "pipelines de dados", "campanhas comerciais",
+           "rotinas de fechamento", "integrações com fornecedores", "dashboards executivos"]
+
+LINES_PER_PAGE = 55
+
+class SyntheticCV(NamedTuple):
+    """Currículo sintético pronto para o pipeline"""
+    name: str
+    file_type: str
+    pages: int
+    data: bytes
+
+def generate_cv_lines(rng: random.Random, pages: int) -> List[str]:
+    """
+    Gera as linhas de um currículo com aproximadamente o número de páginas pedido
+    
+    Args:
+        rng: Gerador pseudoaleatório
+        pages: Número de páginas desejado
+        
+    Returns:
+        list: Linhas de texto do currículo
+    """
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name.upper(),
+        f"{rng.choice(ROLES)} | São Paulo - SP | {name.split()[0].lower()}@email.com | (11) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+        "",
+        "OBJETIVO",
+        f"Atuar como {rng.choice(ROLES)} contribuindo com resultados mensuráveis.",
+        "",
+        "EXPERIÊNCIA PROFISSIONAL"
+    ]
+    
+    year = 2024
+    target = pages * LINES_PER_PAGE - 12
+    while len(lines) < target:
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(ROLES)} - {rng.choice(COMPANIES)} ({start} - {year})")
+        for _ in range(rng.randint(3, 6)):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, gerando ganho de {rng.randint(5, 60)}% em eficiência.")
+        lines.append("")
+        year = start
+    
+    lines += [
+        "FORMAÇÃO ACADÊMICA",
+        f"Bacharelado em Administração - Universidade Federal ({year - 4} - {year})",
+        "",
+        "HABILIDADES",
+        ", ".join(rng.sample(SKILLS, 8)),
+        "",
+        "IDIOMAS",
+        "Inglês avançado, Espanhol intermediário"
+    ]
+    return lines
+
+def _pdf_escape(line: str) -> bytes:
+    """Codifica uma linha como string literal de PDF (WinAnsi)"""
+    encoded = line.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+def render_pdf(lines: List[str]) -> bytes:
+    """
+    Gera um PDF mínimo (Helvetica 10pt, A4) com as linhas fornecidas
+    
+    Args:
+        lines: Linhas de texto
+        
+    Returns:
+        bytes: Documento PDF
+    """
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    
+    # Objetos: 1 catálogo, 2 árvore de páginas, 3 fonte, depois (página, conteúdo) por página
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for page_lines in pages:
+        stream = b"BT /F1 10 Tf 12 TL 50 800 Td " + b" ".join(
+            b"(" + _pdf_escape(line) + b") Tj T*" for line in page_lines
+        ) + b" ET"
+        page_id = len(objects) + 1
+        page_ids.append(page_id)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids) + b"] /Count %d >>" % len(page_ids)
+    
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+def generate_cv(rng: random.Random, pages: int, file_type: str, index: int = 0) -> SyntheticCV:
+    """
+    Gera um currículo sintético no formato pedido
+    
+    Args:
+        rng: Gerador pseudoaleatório
+        pages: Número de páginas
+        file_type: 'pdf' ou 'txt'
+        index: Posição no corpus (usada no nome do arquivo)
+        
+    Returns:
+        SyntheticCV: Currículo gerado
+    """
+    lines = generate_cv_lines(rng, pages)
+    data = render_pdf(lines) if file_type == 'pdf' else "\n".join(lines).encode("utf-8")
+    return SyntheticCV(f"cv_{index:05d}_{pages}p.{file_type}", file_type, pages, data)
+
+def generate_corpus(count: int, page_range: Tuple[int, int] = (1, 50), formats: Tuple[str, ...] = ('pdf', 'txt'),
+                    seed: int = 42) -> Iterator[SyntheticCV]:
+    """
+    Gera um corpus reprodutível de currículos sintéticos
+    
+    Args:
+        count: Quantidade de currículos
+        page_range: Faixa (mínimo, máximo) de páginas
+        formats: Formatos alternados entre os currículos
+        seed: Semente do gerador
+        
+    Returns:
+        Iterator: Currículos gerados sob demanda
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        pages = rng.randint(*page_range)
+        yield generate_cv(rng, pages, formats[index % len(formats)], index)
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera currículos sintéticos para benchmarks")
+    parser.add_argument("output_dir", help="Diretório de saída")
+    parser.add_argument("--count", type=int, default=20, help="Quantidade de currículos")
+    parser.add_argument("--min-pages", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=50)
+    parser.add_argument("--formats", default="pdf,txt", help="Formatos separados por vírgula")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    formats = tuple(args.formats.split(','))
+    for cv in generate_corpus(args.count, (args.min_pages, args.max_pages), formats, args.seed):
+        with open(os.path.join(args.output_dir, cv.name), 'wb') as output:
+            output.write(cv.data)
+    print(f"✅ {args.count} currículos gerados em {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,599 @@
+"""
+Extração estruturada local do currículo (sem chamada ao modelo)
+
+A partir do texto limpo, identifica as seções, as experiências (cargo,
+empresa e período), a formação e os dados de contato, com padrões
+pré-compilados para os formatos usuais em português e inglês:
+    
+    Analista de Dados | Empresa X | 03/2019 - atual
+    Empresa X — Desenvolvedor (jan/2016 a dez/2018)
+    Data Analyst at Company, Mar 2019 – Present
+    Bacharelado em Administração - Universidade Federal (2010 - 2014)
+
+O resultado alimenta a pré-avaliação local (prescore) e o prompt: o texto
+enviado ao modelo sai sem os dados de contato e com um resumo da estrutura
+(ordem das seções, cronologia, tempo de experiência), em vez de o modelo
+deduzir a cronologia relendo o currículo inteiro.
+    
+    python cvparse.py curriculo.txt
+    python cvparse.py --benchmark 5000
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
+
+from config import ANALYSIS_CONFIG
+
+# Versão da extração (mudou -> prompts diferentes; invalida o cache de análises)
+PARSER_VERSION = 2
+
+# Títulos de seção: a linha inteira é o título (com pontuação e um complemento curto entre parênteses)
+SECTION_HEADINGS = {
+    "objective": r"objetivos?( profissional)?|resumo( profissional)?|perfil( profissional)?|sobre mim|"
+                 r"summary|professional summary|objective|profile|about me",
+    "experience": r"experi[êe]ncias?( profissional| profissionais)?|hist[óo]rico profissional|"
+                  r"(work |professional )?experience|employment( history)?",
+    "education": r"forma[çc][ãa]o( acad[êe]mica)?|escolaridade|education|academic background",
+    "skills": r"habilidades( t[ée]cnicas)?|compet[êe]ncias( t[ée]cnicas)?|conhecimentos( t[ée]cnicos)?|"
+              r"(technical )?skills",
+    "languages": r"idiomas|l[íi]nguas|languages",
+    "courses": r"cursos( complementares| e certifica[çc][õo]es)?|certifica[çc][õo]es|certifications|courses",
+    "projects": r"projetos|projects",
+    "contact": r"contatos?|dados pessoais|contact|personal (information|details)"
+}
+SECTION_LABELS = {
+    "objective": "objetivo",
+    "experience": "experiência",
+    "education": "formação",
+    "skills": "habilidades",
+    "languages": "idiomas",
+    "courses": "cursos",
+    "projects": "projetos",
+    "contact": "dados pessoais"
+}
+HEADING_PATTERN = re.compile(
+    r"^\W*(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_HEADINGS.items()) +
+    r")\W*(?:\([^)]*\))?\W*$",
+    re.I
+)
+MAX_HEADING_CHARS = 45
+
+_MONTH = (
+    r"(?:jan(?:eiro|uary)?|fev(?:ereiro)?|feb(?:ruary)?|mar(?:[çc]o|ch)?|abr(?:il)?|apr(?:il)?|mai(?:o)?|may|"
+    r"jun(?:ho|e)?|jul(?:ho|y)?|ago(?:sto)?|aug(?:ust)?|set(?:embro)?|sep(?:t(?:ember)?)?|out(?:ubro)?|"
+    r"oct(?:ober)?|nov(?:embro|ember)?|dez(?:embro)?|dec(?:ember)?)"
+)
+_DATE = (
+    rf"(?:\b{_MONTH}\.?(?:\s+de\s+|\s*[/.-]\s*|\s+)(?:(?:19|20)\d{{2}}|\d{{2}})\b"
+    r"|\b(?:0?[1-9]|1[0-2])[/.](?:19|20)\d{2}\b"
+    r"|\b(?:19|20)\d{2}\b)"
+)
+_CURRENT = r"(?:o\s+)?(?:momento|atual(?:mente)?|presente|hoje|agora|present|current(?:ly)?|now|today)\b"
+_SEPARATOR = r"\s*(?:[-–—~]|\ba\b|\bat[ée]\b|\bto\b|\buntil\b)\s*"
+
+RANGE_PATTERN = re.compile(rf"(?P<start>{_DATE}){_SEPARATOR}(?P<end>{_DATE}|{_CURRENT})", re.I)
+SINCE_PATTERN = re.compile(rf"\b(?:desde|since|a partir de)\s+(?P<start>{_DATE})", re.I)
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+# Filtros baratos (sem \b, o motor de regex salta direto para os dígitos) antes de RANGE/SINCE
+YEAR_HINT_PATTERN = re.compile(r"(?:19|20)\d\d")
+DIGIT_PATTERN = re.compile(r"\d")
+SINCE_WORDS = ("desde", "since", "a partir")
+MAX_DATE_PREFIX = 16  # Caracteres antes do ano em uma data ("setembro de 2019", "Sept. 2019")
+DATE_PARTS_PATTERN = re.compile(rf"^(?:(?P<name>{_MONTH})\D*|(?P<number>\d{{1,2}})[/.])?(?P<year>\d{{2,4}})$", re.I)
+
+MONTH_NUMBERS = {
+    "jan": 1, "fev": 2, "feb": 2, "mar": 3, "abr": 4, "apr": 4, "mai": 5, "may": 5, "jun": 6, "jul": 7,
+    "ago": 8, "aug": 8, "set": 9, "sep": 9, "out": 10, "oct": 10, "nov": 11, "dez": 12, "dec": 12
+}
+
+# Separadores entre cargo e empresa na mesma linha
+FIELD_SPLIT_PATTERN = re.compile(r"\s*(?:[|•·–—,;@]|\s-\s|\b(?:at|na|no|pela|pelo)\b)\s*", re.I)
+TITLE_PATTERN = re.compile(
+    r"\b(?:analista|desenvolvedor(?:a)?|programador(?:a)?|engenheir[oa]|gerente|coordenador(?:a)?|"
+    r"supervisor(?:a)?|assistente|auxiliar|estagi[áa]ri[oa]|est[áa]gio|consultor(?:a)?|diretor(?:a)?|"
+    r"especialista|t[ée]cnic[oa]|cientista|arquitet[oa]|designer|l[íi]der|head|vendedor(?:a)?|"
+    r"professor(?:a)?|administrador(?:a)?|s[óo]ci[oa]|fundador(?:a)?|trainee|aprendiz|operador(?:a)?|"
+    r"atendente|recepcionista|contador(?:a)?|advogad[oa]|enfermeir[oa]|m[ée]dic[oa]|"
+    r"analyst|developer|programmer|engineer|manager|coordinator|supervisor|assistant|intern|consultant|"
+    r"director|specialist|scientist|architect|lead|officer|associate|executive|representative|"
+    r"administrator|founder|owner|cto|ceo|cfo)\b",
+    re.I
+)
+EMPLOYER_PATTERN = re.compile(
+    r"(?:\b(?:ltda|eireli|inc|llc|ltd|corp(?:oration)?|group|grupo|banco|bank|tecnologia|technologies|"
+    r"consultoria|solutions|solu[çc][õo]es|sistemas|systems|servi[çc]os|company|companhia|cia|labs?|holding|"
+    r"ind[úu]stria|com[ée]rcio)\b|\bs\.?/?a\b\.?)",
+    re.I
+)
+ROLE_LABEL_PATTERN = re.compile(r"^(?:cargo|fun[çc][ãa]o|position|title|role)\s*:\s*(?P<value>.+)", re.I)
+EMPLOYER_LABEL_PATTERN = re.compile(r"^(?:empresa|company|employer|organiza[çc][ãa]o)\s*:\s*(?P<value>.+)", re.I)
+PERIOD_LABEL_PATTERN = re.compile(r"^(?:per[íi]odo|period|datas?|dates?|dura[çc][ãa]o)$", re.I)
+MAX_PERIOD_LABEL = 7
+
+# Formação: o grupo que casou define o nível (do maior para o menor)
+DEGREE_PATTERN = re.compile(
+    r"(?P<doutorado>\bdoutorado\b|\bph\.?\s?d\b|\bdoctorate\b)"
+    r"|(?P<mestrado>\bmestrado\b|\bmaster(?:'s)?\b|\bm\.?sc\b)"
+    r"|(?P<pos_graduacao>\bp[óo]s[- ]gradua[çc][ãa]o\b|\bespecializa[çc][ãa]o\b|\bmba\b|\blato sensu\b)"
+    r"|(?P<graduacao>\bbacharel(?:ado)?\b|\blicenciatura\b|\bgradua[çc][ãa]o\b|\btecn[óo]log[oa]\b|"
+    r"\bensino superior\b|\bbachelor(?:'s)?\b|\bb\.?sc\b)"
+    r"|(?P<tecnico>\bt[ée]cnico em\b|\bcurso t[ée]cnico\b)"
+    r"|(?P<ensino_medio>\bensino m[ée]dio\b|\bhigh school\b|\bsegundo grau\b)",
+    re.I
+)
+EDUCATION_LEVELS = ["ensino_medio", "tecnico", "graduacao", "pos_graduacao", "mestrado", "doutorado"]
+EDUCATION_LABELS = {
+    "ensino_medio": "ensino médio",
+    "tecnico": "técnico",
+    "graduacao": "graduação",
+    "pos_graduacao": "pós-graduação",
+    "mestrado": "mestrado",
+    "doutorado": "doutorado"
+}
+INSTITUTION_PATTERN = re.compile(
+    r"\b(?:universidade|faculdade|instituto|escola|centro universit[áa]rio|col[ée]gio|fatec|etec|senai|senac|"
+    r"puc|usp|unicamp|unesp|ufmg|ufrj|ufrgs|ufsc|ufpr|ufpe|fgv|insper|mackenzie|"
+    r"university|college|school|institute|academy)\b",
+    re.I
+)
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+BULLET_PATTERN = re.compile(r"^\s*([-•*▪●◦]|\d+[.)])\s+", re.M)
+BULLET_MARKS = frozenset("-•*▪●◦")
+DIGIT_RUN_PATTERN = re.compile(r"\d{4}")  # Todo telefone tem um bloco de 4 dígitos
+PHONE_PATTERN = re.compile(r"(?<!\d)(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,3}\)|\d{2,3})[\s.-]?\d{4,5}[\s.-]?\d{4}(?!\d)")
+LINK_PATTERN = re.compile(
+    r"\b(?:https?://|www\.)\S+|\b(?:linkedin\.com/in|github\.com|gitlab\.com|behance\.net)/[\w./-]+", re.I
+)
+# Linhas de dados pessoais que não ajudam a avaliar o currículo
+PERSONAL_PATTERN = re.compile(
+    r"^\W*(?:endere[çc]o|cep|cpf|rg|data de nascimento|nascimento|estado civil|nacionalidade|naturalidade|"
+    r"idade|address|date of birth)\b",
+    re.I
+)
+
+CHRONOLOGY_LABELS = {
+    "recent_first": "mais recente primeiro",
+    "oldest_first": "mais antiga primeiro",
+    "mixed": "fora de ordem",
+    "unknown": "indeterminada"
+}
+
+YearMonth = Tuple[int, int]  # (ano, mês); mês 0 quando só o ano é informado
+
+class Experience(NamedTuple):
+    """Experiência profissional datada"""
+    title: str
+    employer: str
+    start: YearMonth
+    end: Optional[YearMonth]  # None: emprego atual
+    months: int
+
+class Education(NamedTuple):
+    """Formação acadêmica"""
+    degree: str
+    institution: str
+    level: Optional[str]
+    start: Optional[YearMonth]
+    end: Optional[YearMonth]
+
+class Contacts(NamedTuple):
+    """Dados de contato encontrados"""
+    emails: Tuple[str, ...]
+    phones: Tuple[str, ...]
+    links: Tuple[str, ...]
+    personal_lines: int  # Linhas de dados pessoais (endereço, CPF, nascimento...)
+
+class ParsedCV(NamedTuple):
+    """Currículo estruturado"""
+    sections: Tuple[str, ...]  # Na ordem em que aparecem
+    experiences: Tuple[Experience, ...]  # Na ordem em que aparecem
+    education: Tuple[Education, ...]
+    contacts: Contacts
+    chronology: str  # Chave de CHRONOLOGY_LABELS
+    experience_months: int  # Sem contar sobreposições
+    gaps: int  # Intervalos de mais de 6 meses entre experiências
+    
+    @property
+    def education_level(self) -> Optional[str]:
+        """Maior nível de formação encontrado"""
+        levels = [entry.level for entry in self.education if entry.level]
+        return max(levels, key=EDUCATION_LEVELS.index) if levels else None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Estrutura serializável em JSON"""
+        return {
+            "sections": list(self.sections),
+            "experiences": [entry._asdict() for entry in self.experiences],
+            "education": [entry._asdict() for entry in self.education],
+            "contacts": self.contacts._asdict(),
+            "chronology": self.chronology,
+            "experience_months": self.experience_months,
+            "gaps": self.gaps,
+            "education_level": self.education_level
+        }
+
+def _ordinal(value: YearMonth) -> int:
+    """Posição em meses (mês desconhecido conta como janeiro)"""
+    return value[0] * 12 + max(value[1], 1) - 1
+
+def _parse_date(text: str, today: date) -> Optional[YearMonth]:
+    """Converte uma data casada por _DATE em (ano, mês)"""
+    match = DATE_PARTS_PATTERN.match(text.strip())
+    if match is None:
+        return None
+    year = int(match.group('year'))
+    if year < 100:
+        year += 2000 if year <= today.year % 100 else 1900
+    if match.group('name'):
+        month = MONTH_NUMBERS.get(match.group('name')[:3].lower().replace("ç", "c"), 0)
+    elif match.group('number'):
+        month = int(match.group('number'))
+    else:
+        month = 0
+    return (year, month)
+
+def _find_period(line: str, today: date) -> Optional[Tuple[YearMonth, Optional[YearMonth], int, int]]:
+    """
+    Período (início, fim) em uma linha
+    
+    Returns:
+        tuple: (início, fim ou None se atual, posição inicial, posição final do texto casado) ou None
+    """
+    year = YEAR_HINT_PATTERN.search(line)
+    if year is None and DIGIT_PATTERN.search(line) is None:
+        return None
+    # Com um ano completo, a data começa no máximo MAX_DATE_PREFIX caracteres antes dele
+    match = RANGE_PATTERN.search(line, max(year.start() - MAX_DATE_PREFIX, 0) if year else 0)
+    if match is not None:
+        start = _parse_date(match.group('start'), today)
+        end = _parse_date(match.group('end'), today)  # None para "atual", "presente"...
+        if start is not None:
+            return start, end, match.start(), match.end()
+    lowered = line.lower()
+    match = SINCE_PATTERN.search(line) if any(word in lowered for word in SINCE_WORDS) else None
+    if match is not None:
+        start = _parse_date(match.group('start'), today)
+        if start is not None:
+            return start, None, match.start(), match.end()
+    return None
+
+def _months(start: YearMonth, end: Optional[YearMonth], today: date) -> int:
+    """Duração em meses (inclusiva quando os meses são conhecidos)"""
+    end_value = end if end is not None else (today.year, today.month)
+    inclusive = 1 if start[1] and end_value[1] else 0
+    return max(_ordinal(end_value) - _ordinal(start) + inclusive, 1)
+
+def _is_bullet(line: str) -> bool:
+    """Linha (já sem espaços nas pontas) é item de lista: o mesmo que BULLET_PATTERN, sem regex no caso comum"""
+    first = line[0]
+    if first in BULLET_MARKS:
+        return len(line) > 1 and line[1].isspace()
+    return first.isdigit() and BULLET_PATTERN.match(line) is not None
+
+def _split_fields(text: str) -> List[str]:
+    fields = []
+    for part in FIELD_SPLIT_PATTERN.split(text):
+        part = part.strip(" .:()[]") if part else ""
+        if part and not (len(part) <= MAX_PERIOD_LABEL and PERIOD_LABEL_PATTERN.match(part)):
+            if part.count("(") > part.count(")"):
+                part += ")"
+            fields.append(part)
+    return fields
+
+def _title_and_employer(parts: List[str]) -> Tuple[str, str]:
+    """Distingue cargo e empresa entre os trechos da linha (ou das linhas) da experiência"""
+    title = employer = ""
+    for part in parts:
+        if ":" not in part:
+            continue
+        label = ROLE_LABEL_PATTERN.match(part)
+        if label:
+            title = label.group('value').strip()
+            continue
+        label = EMPLOYER_LABEL_PATTERN.match(part)
+        if label:
+            employer = label.group('value').strip()
+    if title or employer:
+        return title, employer
+    
+    title = next((part for part in parts if TITLE_PATTERN.search(part)), "")
+    employer = next((part for part in parts if part != title and EMPLOYER_PATTERN.search(part)), "")
+    others = [part for part in parts if part not in (title, employer)]
+    if not title and others:
+        title = others.pop(0)
+    if not employer and others:
+        employer = others.pop(0)
+    return title, employer
+
+def _parse_experiences(lines: List[str], today: date) -> List[Experience]:
+    """Experiências de uma seção: cada período ancora uma entrada"""
+    experiences = []
+    pending: List[str] = []  # Linhas curtas desde a última entrada (cargo/empresa em linhas próprias)
+    for index, line in enumerate(lines):
+        # Marcadores são conquistas: só procurar período se houver um ano completo (a maioria não tem)
+        is_bullet = _is_bullet(line)
+        period = None if is_bullet and not YEAR_HINT_PATTERN.search(line) else _find_period(line, today)
+        if period is None:
+            if is_bullet or len(line) > 80 or line.endswith("."):
+                pending = []
+            else:
+                pending = (pending + [line])[-2:]
+            continue
+        
+        start, end, match_start, match_end = period
+        parts = _split_fields(line[:match_start] + " | " + line[match_end:])
+        if not parts:
+            parts = [part for text in pending for part in _split_fields(text)]
+        if not parts:
+            # Período antes do cargo: usar as linhas seguintes
+            following = []
+            for text in lines[index + 1:index + 3]:
+                if BULLET_PATTERN.match(text) or _find_period(text, today) is not None:
+                    break
+                following.append(text)
+            parts = [part for text in following for part in _split_fields(text)]
+        pending = []
+        title, employer = _title_and_employer(parts)
+        experiences.append(Experience(title, employer, start, end, _months(start, end, today)))
+    return experiences
+
+def _parse_education(lines: List[str], today: date) -> List[Education]:
+    """Formações de uma seção: uma entrada por curso ou instituição"""
+    entries: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for line in lines:
+        if BULLET_PATTERN.match(line) and current is None:
+            continue
+        period = _find_period(line, today)
+        text = line[:period[2]] + " | " + line[period[3]:] if period is not None else line
+        degree = DEGREE_PATTERN.search(text)
+        institution = INSTITUTION_PATTERN.search(text)
+        if degree or institution:
+            if current is None or (degree and current['degree']) or (not degree and current['institution']):
+                current = {"degree": "", "institution": "", "level": None, "start": None, "end": None}
+                entries.append(current)
+            parts = [part for part in _split_fields(text) if not YEAR_PATTERN.fullmatch(part)]
+            for part in parts:
+                if degree and not current['degree'] and DEGREE_PATTERN.search(part):
+                    current['degree'] = part
+                elif institution and not current['institution'] and INSTITUTION_PATTERN.search(part):
+                    current['institution'] = part
+            if degree:
+                current['level'] = degree.lastgroup
+                if not current['institution']:
+                    # Instituição fora da lista conhecida na mesma linha do curso (ex.: "B.Sc., MIT")
+                    current['institution'] = next((part for part in parts if part != current['degree']), "")
+        if current is None or current['end'] is not None or current['start'] is not None:
+            continue
+        if period is not None:
+            current['start'], current['end'] = period[0], period[1]
+        else:
+            years = YEAR_PATTERN.findall(line)
+            if years:
+                current['end'] = (int(years[-1]), 0)  # Ano de conclusão
+    return [Education(**entry) for entry in entries]
+
+def _chronology(experiences: List[Experience]) -> str:
+    """Ordem das experiências pela data de início, como aparecem no texto"""
+    starts = [_ordinal(entry.start) for entry in experiences]
+    if len(starts) < 2 or len(set(starts)) < 2:
+        return "unknown"
+    pairs = list(zip(starts, starts[1:]))
+    if all(first >= second for first, second in pairs):
+        return "recent_first"
+    if all(first <= second for first, second in pairs):
+        return "oldest_first"
+    return "mixed"
+
+def _timeline(experiences: List[Experience], today: date) -> Tuple[int, int]:
+    """Meses de experiência sem sobreposição e lacunas de mais de 6 meses"""
+    now = _ordinal((today.year, today.month))
+    intervals = sorted(
+        (_ordinal(entry.start), now if entry.end is None else _ordinal(entry.end)) for entry in experiences
+    )
+    total = gaps = 0
+    current_start = current_end = None
+    for start, end in intervals:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+                gaps += start - current_end > 6
+            current_start, current_end = start, max(start, end)
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total, gaps
+
+@lru_cache(maxsize=256)
+def parse_cv(content: str) -> ParsedCV:
+    """
+    Extrai a estrutura do currículo
+    
+    Resultados são memorizados pelo texto: a pré-avaliação e a montagem do
+    prompt da mesma análise reaproveitam a extração.
+    
+    Args:
+        content: Texto limpo do currículo
+    
+    Returns:
+        ParsedCV: Seções, experiências, formação, contatos e cronologia
+    """
+    today = date.today()
+    content = content or ""
+    lines = [line.strip() for line in content.split('\n')]
+    lines = [line for line in lines if line]
+    
+    sections: List[str] = []
+    blocks: Dict[str, List[str]] = {}
+    current_block: Optional[List[str]] = None
+    personal_lines = 0
+    emails: List[str] = []
+    phones: List[str] = []
+    links: List[str] = []
+    # Filtros baratos no texto inteiro antes das expressões de contato
+    has_email = "@" in content
+    has_link = "/" in content or "www." in content.lower()
+    for line in lines:
+        if has_email and "@" in line:
+            emails.extend(EMAIL_PATTERN.findall(line))
+        if has_link and ("/" in line or "www." in line.lower()):
+            links.extend(LINK_PATTERN.findall(line))
+        # Itens de lista são conquistas e atividades: não trazem telefone nem dados pessoais
+        if _is_bullet(line):
+            if current_block is not None:
+                current_block.append(line)
+            continue
+        if DIGIT_RUN_PATTERN.search(line):
+            phones.extend(PHONE_PATTERN.findall(line))
+        heading = HEADING_PATTERN.match(line) if len(line) <= MAX_HEADING_CHARS else None
+        if heading is not None:
+            name = heading.lastgroup
+            if name not in sections:
+                sections.append(name)
+            current_block = blocks.setdefault(name, [])
+            continue
+        if PERSONAL_PATTERN.match(line):
+            personal_lines += 1
+        if current_block is not None:
+            current_block.append(line)
+    
+    experiences = _parse_experiences(blocks.get("experience", []), today)
+    education = _parse_education(blocks.get("education", []), today)
+    experience_months, gaps = _timeline(experiences, today)
+    contacts = Contacts(
+        emails=tuple(dict.fromkeys(emails)),
+        phones=tuple(dict.fromkeys(phones)),
+        links=tuple(dict.fromkeys(links)),
+        personal_lines=personal_lines
+    )
+    return ParsedCV(
+        sections=tuple(sections),
+        experiences=tuple(experiences),
+        education=tuple(education),
+        contacts=contacts,
+        chronology=_chronology(experiences),
+        experience_months=experience_months,
+        gaps=gaps
+    )
+
+def trim_content(content: str) -> str:
+    """
+    Texto do currículo sem dados de contato e pessoais
+    
+    E-mails, telefones e links viram marcadores; linhas de endereço, CPF,
+    nascimento e afins são removidas. O modelo continua sabendo que o
+    contato existe, sem receber os dados.
+    """
+    lines = [line for line in (content or "").split('\n') if not PERSONAL_PATTERN.match(line)]
+    text = '\n'.join(lines)
+    text = EMAIL_PATTERN.sub("[e-mail]", text)
+    text = LINK_PATTERN.sub("[link]", text)
+    return PHONE_PATTERN.sub("[telefone]", text)
+
+def _format_date(value: Optional[YearMonth]) -> str:
+    if value is None:
+        return "atual"
+    return f"{value[1]:02d}/{value[0]}" if value[1] else str(value[0])
+
+def structure_summary(parsed: ParsedCV) -> str:
+    """
+    Resumo da estrutura para o prompt (poucas linhas)
+    
+    Args:
+        parsed: Resultado de parse_cv
+    
+    Returns:
+        str: Bloco de texto com seções, cronologia e formação
+    """
+    lines = ["ESTRUTURA EXTRAÍDA LOCALMENTE (use para avaliar ordem das seções e cronologia):"]
+    if parsed.sections:
+        lines.append("- Seções, na ordem: " + ", ".join(SECTION_LABELS[name] for name in parsed.sections))
+    else:
+        lines.append("- Nenhum título de seção reconhecido")
+    if parsed.experiences:
+        first = min(parsed.experiences, key=lambda entry: _ordinal(entry.start)).start
+        current = any(entry.end is None for entry in parsed.experiences)
+        last = None if current else max((entry.end for entry in parsed.experiences), key=_ordinal)
+        lines.append(
+            f"- Experiências datadas: {len(parsed.experiences)}, de {_format_date(first)} a {_format_date(last)}; "
+            f"{parsed.experience_months / 12:.1f} anos; cronologia: {CHRONOLOGY_LABELS[parsed.chronology]}; "
+            f"lacunas acima de 6 meses: {parsed.gaps}"
+        )
+    else:
+        lines.append("- Nenhuma experiência com período identificado")
+    if parsed.education_level:
+        lines.append(f"- Maior formação: {EDUCATION_LABELS[parsed.education_level]}")
+    found = [label for label, values in (("e-mail", parsed.contacts.emails), ("telefone", parsed.contacts.phones),
+                                         ("link", parsed.contacts.links)) if values]
+    lines.append("- Contato: " + (", ".join(found) if found else "não encontrado"))
+    lines.append("- E-mail, telefone, links e dados pessoais foram retirados do texto acima; "
+                 "avalie a seção de dados pessoais pelo item Contato")
+    return "\n".join(lines)
+
+def prompt_content(content: str) -> str:
+    """
+    Texto do currículo enviado ao modelo
+    
+    Com ANALYSIS_CONFIG["structured_prompt"], sai sem os dados de contato e
+    acompanhado do resumo da estrutura; senão, o texto original.
+    
+    Args:
+        content: Texto limpo do currículo
+    
+    Returns:
+        str: Conteúdo para o prompt
+    """
+    if not ANALYSIS_CONFIG["structured_prompt"]:
+        return content
+    return f"{trim_content(content)}\n\n{structure_summary(parse_cv(content))}"
+
+def run_benchmark(count: int, seed: int = 42) -> Dict[str, Any]:
+    """Extrações por segundo em um núcleo, com currículos sintéticos (sem memorização)"""
+    from corpus import generate_cv_lines
+    
+    rng = random.Random(seed)
+    contents = ["\n".join(generate_cv_lines(rng, rng.randint(1, 3))) for _ in range(count)]
+    parse = parse_cv.__wrapped__
+    start = time.perf_counter()
+    for content in contents:
+        parse(content)
+    elapsed = time.perf_counter() - start
+    return {
+        "cvs": count,
+        "seconds": round(elapsed, 3),
+        "cvs_per_second": round(count / elapsed),
+        "avg_chars": round(sum(map(len, contents)) / count)
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Linha de comando: estrutura de um currículo em JSON ou benchmark"""
+    parser = argparse.ArgumentParser(description="Extração estruturada local de currículos")
+    parser.add_argument("path", nargs="?", help="Arquivo TXT com o texto do currículo")
+    parser.add_argument("--prompt", action="store_true", help="Mostra o conteúdo enviado ao modelo")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Mede a extração com N currículos sintéticos")
+    args = parser.parse_args(argv)
+    
+    if args.benchmark:
+        print(json.dumps(run_benchmark(args.benchmark), indent=2))
+        return 0
+    if not args.path:
+        parser.error("Informe o arquivo ou --benchmark")
+    with open(args.path, encoding='utf-8', errors='replace') as source:
+        content = source.read()
+    if args.prompt:
+        print(prompt_content(content))
+    else:
+        print(json.dumps(parse_cv(content).to_dict(), ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Detecção de currículos quase duplicados com MinHash e LSH
+"""
+
+import os
+import re
+import sys
+import zlib
+import sqlite3
+import hashlib
+import argparse
+import threading
+from typing import Optional, Dict, Any, List, NamedTuple
+
+import numpy as np
+
+from config import DEDUP_CONFIG, STORAGE_CONFIG
+from storage import content_hash
+from utils import clean_extracted_text
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+DEDUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedup_documents (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    analysis_id INTEGER,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dedup_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    document_id INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, document_id)
+) WITHOUT ROWID;
+"""
+
+class DuplicateMatch(NamedTuple):
+    """Documento indexado parecido com o consultado"""
+    document_id: int
+    analysis_id: Optional[int]
+    content_hash: str
+    similarity: float
+
+class MinHasher:
+    """
+    Assinaturas MinHash de textos de currículo
+    
+    O texto passa por clean_extracted_text e é dividido em shingles de
+    `shingle_size` palavras. Cada shingle vira um inteiro de 32 bits (CRC32) e
+    as `num_perm` funções de hash são da família multiply-shift, calculadas de
+    uma vez com numpy.
+    """
+    
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Multiplicadores ímpares de 64 bits; o produto "dá a volta" em uint64 de propósito
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    
+    def shingles(self, text: str) -> np.ndarray:
+        """
+        Conjunto de shingles do texto como hashes de 32 bits
+        
+        Args:
+            text: Texto do currículo
+        
+        Returns:
+            np.ndarray: Hashes únicos (uint64)
+        """
+        tokens = TOKEN_PATTERN.findall(clean_extracted_text(text).lower())
+        size = self.shingle_size
+        if len(tokens) < size:
+            grams = [" ".join(tokens)] if tokens else []
+        else:
+            grams = [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+        hashes = {zlib.crc32(gram.encode("utf-8")) for gram in grams}
+        return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Calcula a assinatura MinHash do texto
+        
+        Args:
+            text: Texto do currículo
+        
+        Returns:
+            np.ndarray: num_perm valores uint32 (texto vazio resulta em assinatura máxima)
+        """
+        values = self.shingles(text)
+        if values.size == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        with np.errstate(over='ignore'):
+            hashed = (values[:, None] * self._a + self._b) >> np.uint64(32)
+        return hashed.min(axis=0).astype(np.uint32)
+
+def estimate_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Similaridade de Jaccard estimada pela fração de posições iguais"""
+    return float(np.mean(first == second))
+
+class DuplicateIndex:
+    """
+    Índice LSH persistente de assinaturas MinHash
+    
+    A assinatura é dividida em `bands` faixas; documentos com alguma faixa
+    idêntica caem no mesmo balde e viram candidatos, que depois são confirmados
+    pela similaridade estimada. Assinaturas e baldes ficam em tabelas SQLite
+    (por padrão no mesmo banco das análises), então a memória usada não cresce
+    com o número de currículos indexados e cada consulta lê apenas os baldes
+    do próprio documento.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.config = {**DEDUP_CONFIG, **(config or {})}
+        if self.config["num_perm"] % self.config["bands"]:
+            raise ValueError("num_perm precisa ser múltiplo de bands")
+        self.rows = self.config["num_perm"] // self.config["bands"]
+        self.hasher = MinHasher(self.config["num_perm"], self.config["shingle_size"], self.config["seed"])
+        
+        self.db_path = db_path or STORAGE_CONFIG["db_path"]
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA journal_mode={STORAGE_CONFIG['journal_mode']}")
+        self._conn.executescript(DEDUP_SCHEMA)
+        self._conn.commit()
+    
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        """Chave (inteiro de 64 bits com sinal) de cada faixa da assinatura"""
+        return [
+            int.from_bytes(
+                hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).digest(),
+                "little", signed=True
+            )
+            for band in range(self.config["bands"])
+        ]
+    
+    def add(self, content: str, analysis_id: Optional[int] = None,
+            signature: Optional[np.ndarray] = None) -> int:
+        """
+        Indexa um currículo (idempotente pelo hash do texto)
+        
+        Args:
+            content: Texto do currículo
+            analysis_id: Análise associada, se já existir
+            signature: Assinatura já calculada (evita recalcular)
+        
+        Returns:
+            int: Identificador do documento no índice
+        """
+        key = content_hash(content)
+        signature = self.hasher.signature(content) if signature is None else signature
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM dedup_documents WHERE content_hash = ?", (key,)).fetchone()
+            if row is not None:
+                if analysis_id is not None:
+                    self._conn.execute(
+                        "UPDATE dedup_documents SET analysis_id = ? WHERE id = ? AND analysis_id IS NULL",
+                        (analysis_id, row['id'])
+                    )
+                    self._conn.commit()
+                return row['id']
+            cursor = self._conn.execute(
+                "INSERT INTO dedup_documents (content_hash, analysis_id, signature) VALUES (?, ?, ?)",
+                (key, analysis_id, signature.tobytes())
+            )
+            document_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO dedup_buckets (band, bucket, document_id) VALUES (?, ?, ?)",
+                [(band, bucket, document_id) for band, bucket in enumerate(self._band_keys(signature))]
+            )
+            self._conn.commit()
+        return document_id
+    
+    def query(self, content: str, threshold: Optional[float] = None,
+              signature: Optional[np.ndarray] = None) -> List[DuplicateMatch]:
+        """
+        Busca currículos quase idênticos ao informado
+        
+        Args:
+            content: Texto do currículo
+            threshold: Similaridade mínima (padrão: DEDUP_CONFIG)
+            signature: Assinatura já calculada (evita recalcular)
+        
+        Returns:
+            list: Correspondências ordenadas da mais parecida para a menos parecida
+        """
+        threshold = self.config["threshold"] if threshold is None else threshold
+        signature = self.hasher.signature(content) if signature is None else signature
+        conditions = " OR ".join(["(band = ? AND bucket = ?)"] * self.config["bands"])
+        params = [value for pair in enumerate(self._band_keys(signature)) for value in pair]
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT id, analysis_id, content_hash, signature FROM dedup_documents
+                WHERE id IN (SELECT document_id FROM dedup_buckets WHERE {conditions})
+                """,
+                params
+            ).fetchall()
+        
+        matches = []
+        for row in rows:
+            similarity = estimate_similarity(signature, np.frombuffer(row['signature'], dtype=np.uint32))
+            if similarity >= threshold:
+                matches.append(DuplicateMatch(row['id'], row['analysis_id'], row['content_hash'], similarity))
+        return sorted(matches, key=lambda match: -match.similarity)
+    
+    def find_analyzed(self, content: str, threshold: Optional[float] = None,
+                      signature: Optional[np.ndarray] = None) -> Optional[DuplicateMatch]:
+        """
+        Retorna o currículo já analisado mais parecido acima do limiar
+        
+        Args:
+            content: Texto do currículo
+            threshold: Similaridade mínima (padrão: DEDUP_CONFIG)
+            signature: Assinatura já calculada (evita recalcular)
+        
+        Returns:
+            DuplicateMatch: Melhor correspondência com análise, ou None
+        """
+        for match in self.query(content, threshold, signature):
+            if match.analysis_id is not None:
+                return match
+        return None
+    
+    def clusters(self, threshold: Optional[float] = None, min_size: int = 2) -> List[List[Dict[str, Any]]]:
+        """
+        Agrupa os documentos quase duplicados
+        
+        Os baldes com mais de um documento são lidos em ordem do índice; cada
+        membro é confirmado contra o primeiro documento do balde e os grupos
+        são unidos (union-find). Apenas documentos com duplicatas ocupam memória.
+        
+        Args:
+            threshold: Similaridade mínima (padrão: DEDUP_CONFIG)
+            min_size: Tamanho mínimo de um grupo
+        
+        Returns:
+            list: Grupos de documentos (id, análise, hash), maiores primeiro
+        """
+        threshold = self.config["threshold"] if threshold is None else threshold
+        parent: Dict[int, int] = {}
+        
+        def find(item: int) -> int:
+            root = parent.setdefault(item, item)
+            while root != parent[root]:
+                parent[root] = parent[parent[root]]
+                root = parent[root]
+            parent[item] = root
+            return root
+        
+        with self._lock:
+            groups = self._conn.execute(
+                """
+                SELECT group_concat(document_id) AS members FROM dedup_buckets
+                GROUP BY band, bucket HAVING COUNT(*) > 1
+                """
+            ).fetchall()
+        for group in groups:
+            members = [int(member) for member in group['members'].split(",")]
+            unknown = [member for member in members if find(member) != find(members[0])]
+            if not unknown:
+                continue
+            signatures = self._signatures([members[0]] + unknown)
+            anchor = signatures[members[0]]
+            for member in unknown:
+                if estimate_similarity(anchor, signatures[member]) >= threshold:
+                    parent[find(member)] = find(members[0])
+        
+        clusters: Dict[int, List[int]] = {}
+        for item in list(parent):
+            clusters.setdefault(find(item), []).append(item)
+        selected = [sorted(ids) for ids in clusters.values() if len(ids) >= min_size]
+        
+        result = []
+        for ids in sorted(selected, key=len, reverse=True):
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, analysis_id, content_hash FROM dedup_documents WHERE id IN ({','.join('?' * len(ids))}) ORDER BY id",
+                    ids
+                ).fetchall()
+            result.append([dict(row) for row in rows])
+        return result
+    
+    def _signatures(self, document_ids: List[int]) -> Dict[int, np.ndarray]:
+        """Lê as assinaturas de um conjunto de documentos"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, signature FROM dedup_documents WHERE id IN ({','.join('?' * len(document_ids))})",
+                document_ids
+            ).fetchall()
+        return {row['id']: np.frombuffer(row['signature'], dtype=np.uint32) for row in rows}
+    
+    def count(self) -> int:
+        """Número de documentos indexados"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM dedup_documents").fetchone()[0]
+    
+    def close(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conn.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Linha de comando: relatório de grupos de currículos duplicados"""
+    parser = argparse.ArgumentParser(description="Relatório de currículos quase duplicados")
+    parser.add_argument("--db", default=STORAGE_CONFIG["db_path"], help="Banco com o índice de duplicatas")
+    parser.add_argument("--threshold", type=float, default=DEDUP_CONFIG["threshold"])
+    parser.add_argument("--min-size", type=int, default=2)
+    args = parser.parse_args(argv)
+    
+    index = DuplicateIndex(args.db)
+    clusters = index.clusters(args.threshold, args.min_size)
+    print(f"{index.count()} currículo(s) indexado(s); {len(clusters)} grupo(s) de duplicatas")
+    for number, cluster in enumerate(clusters, 1):
+        analyses = ", ".join(str(item['analysis_id']) for item in cluster if item['analysis_id'] is not None)
+        print(f"  grupo {number}: {len(cluster)} currículo(s); análises: {analyses or '-'}")
+    index.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Exportação em lote das análises do SmartCV para formato colunar
+"""
+
+import os
+import csv
+import json
+import argparse
+from typing import Dict, Any, List, Optional
+
+from config import EXPORT_CONFIG
+from storage import AnalysisStore
+
+# Colunas escalares e colunas de listas exportadas
+SCALAR_COLUMNS = [
+    'id', 'filename', 'created_at', 'content_hash',
+    'overall_score', 'clarity_score', 'structure_score', 'keywords_score', 'summary'
+]
+LIST_COLUMNS = [
+    'keywords_present', 'keywords_missing', 'improvements', 'strengths',
+    'clarity_suggestions', 'structure_suggestions', 'keywords_suggestions'
+]
+COLUMNS = SCALAR_COLUMNS + LIST_COLUMNS
+
+def flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Achata um registro do armazenamento em uma linha tabular
+    
+    Args:
+        record: Registro retornado pelo AnalysisStore
+    
+    Returns:
+        dict: Linha com as colunas de exportação
+    """
+    analysis = record['analysis']
+    return {
+        "id": record['id'],
+        "filename": record['filename'],
+        "created_at": record['created_at'],
+        "content_hash": record['content_hash'],
+        "overall_score": float(analysis.overall_score),
+        "clarity_score": float(analysis.clarity.score),
+        "structure_score": float(analysis.structure.score),
+        "keywords_score": float(analysis.keywords.score),
+        "summary": analysis.summary,
+        "keywords_present": list(analysis.keywords.present),
+        "keywords_missing": list(analysis.keywords.missing),
+        "improvements": list(analysis.improvements),
+        "strengths": list(analysis.strengths),
+        "clarity_suggestions": list(analysis.clarity.suggestions),
+        "structure_suggestions": list(analysis.structure.suggestions),
+        "keywords_suggestions": list(analysis.keywords.suggestions)
+    }
+
+def _parquet_schema():
+    """Monta o schema Arrow das colunas exportadas"""
+    import pyarrow as pa
+    
+    return pa.schema(
+        [
+            ('id', pa.int64()),
+            ('filename', pa.string()),
+            ('created_at', pa.string()),
+            ('content_hash', pa.string()),
+            ('overall_score', pa.float32()),
+            ('clarity_score', pa.float32()),
+            ('structure_score', pa.float32()),
+            ('keywords_score', pa.float32()),
+            ('summary', pa.string())
+        ] + [(column, pa.list_(pa.string())) for column in LIST_COLUMNS]
+    )
+
+def _rows_to_columns(rows: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Transpõe uma lista de linhas em colunas"""
+    return {column: [row[column] for row in rows] for column in COLUMNS}
+
+def export_parquet(store: AnalysisStore, output_path: str, batch_size: Optional[int] = None) -> int:
+    """
+    Exporta as análises para Parquet, gravando um row group por lote
+    
+    Args:
+        store: Armazenamento de análises
+        output_path: Caminho do arquivo de saída
+        batch_size: Registros por lote
+    
+    Returns:
+        int: Quantidade de análises exportadas
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = _parquet_schema()
+    total = 0
+    with pq.ParquetWriter(output_path, schema, compression=EXPORT_CONFIG["compression"]) as writer:
+        for batch in store.iter_batches(batch_size):
+            rows = [flatten_record(record) for record in batch]
+            writer.write_table(pa.Table.from_pydict(_rows_to_columns(rows), schema=schema))
+            total += len(rows)
+    return total
+
+def export_csv(store: AnalysisStore, output_path: str, batch_size: Optional[int] = None) -> int:
+    """
+    Exporta as análises para CSV (listas codificadas como JSON)
+    
+    Args:
+        store: Armazenamento de análises
+        output_path: Caminho do arquivo de saída
+        batch_size: Registros por lote
+    
+    Returns:
+        int: Quantidade de análises exportadas
+    """
+    total = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as output:
+        writer = csv.DictWriter(output, fieldnames=COLUMNS)
+        writer.writeheader()
+        for batch in store.iter_batches(batch_size):
+            for record in batch:
+                row = flatten_record(record)
+                for column in LIST_COLUMNS:
+                    row[column] = json.dumps(row[column], ensure_ascii=False)
+                writer.writerow(row)
+            total += len(batch)
+    return total
+
+def export_analyses(store: AnalysisStore, output_path: str, file_format: Optional[str] = None,
+                    batch_size: Optional[int] = None) -> int:
+    """
+    Exporta todas as análises armazenadas no formato escolhido
+    
+    A escrita é feita em um arquivo temporário e renomeada ao final, para que
+    dashboards nunca leiam um arquivo parcialmente gravado.
+    
+    Args:
+        store: Armazenamento de análises
+        output_path: Caminho do arquivo de saída
+        file_format: 'parquet' ou 'csv' (padrão: EXPORT_CONFIG)
+        batch_size: Registros por lote
+    
+    Returns:
+        int: Quantidade de análises exportadas
+    """
+    file_format = (file_format or EXPORT_CONFIG["default_format"]).lower()
+    if file_format not in EXPORT_CONFIG["formats"]:
+        raise ValueError(f"Formato de exportação não suportado: {file_format}")
+    
+    temp_path = output_path + ".tmp"
+    try:
+        if file_format == 'parquet':
+            total = export_parquet(store, temp_path, batch_size)
+        else:
+            total = export_csv(store, temp_path, batch_size)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta as análises do SmartCV em lote")
+    parser.add_argument("output", help="Arquivo de saída (.parquet ou .csv)")
+    parser.add_argument("--format", dest="file_format", choices=EXPORT_CONFIG["formats"],
+                        help="Formato de saída (padrão: deduzido da extensão)")
+    parser.add_argument("--db", help="Caminho do banco de análises")
+    parser.add_argument("--batch-size", type=int, help="Registros por lote")
+    args = parser.parse_args()
+    
+    file_format = args.file_format
+    if not file_format:
+        extension = os.path.splitext(args.output)[1].lstrip('.').lower()
+        file_format = extension if extension in EXPORT_CONFIG["formats"] else None
+    
+    store = AnalysisStore(args.db)
+    try:
+        total = export_analyses(store, args.output, file_format, args.batch_size)
+    finally:
+        store.close()
+    print(f"✅ {total:,} análises exportadas para {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Substituto local e determinístico do Google Gemini para benchmarks e testes de carga
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List
+
+from compact import COMPACT_MARKER, SECTION_CODES, compact_json
+
+# Palavras-chave sugeridas quando não aparecem no currículo
+KEYWORD_POOL = [
+    "Python", "SQL", "Gestão de Projetos", "Scrum", "Power BI", "Excel Avançado",
+    "Inglês Fluente", "Liderança", "Comunicação", "Cloud", "Docker", "Git",
+    "Análise de Dados", "Negociação", "Atendimento ao Cliente", "Kanban"
+]
+
+WORD_PATTERN = re.compile(r"[A-Za-zÀ-ÿ][A-Za-zÀ-ÿ+#]{3,}")
+
+# Currículos delimitados no prompt em lote (ver pipeline.build_packed_prompt)
+PACKED_BLOCK_PATTERN = re.compile(r"<<<CV (\d+)>>>\n(.*?)\n<<<FIM CV \1>>>", re.DOTALL)
+
+class FakeResponse:
+    """Resposta com a mesma interface usada de google.generativeai"""
+    
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeRateLimitError(Exception):
+    """Simula o erro 429 (cota excedida) da API"""
+    
+    code = 429
+
+class FakeGeminiModel:
+    """
+    Modelo falso com latência configurável e respostas determinísticas
+    
+    A resposta depende apenas do hash do prompt, então a mesma entrada sempre
+    produz a mesma análise, independentemente da ordem de execução. Com
+    token_latency, cada token gerado soma tempo à chamada, como na API real.
+    """
+    
+    def __init__(self, model_name: str = "fake-gemini", latency: float = 0.5, jitter: float = 0.0,
+                 failure_rate: float = 0.0, rate_limit_rate: float = 0.0, seed: int = 0,
+                 token_latency: float = 0.0):
+        self.model_name = model_name
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.seed = seed
+        self.token_latency = token_latency
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def _rng(self, prompt: str) -> random.Random:
+        """Gerador pseudoaleatório derivado do prompt e da semente"""
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+    
+    def generate_content(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None,
+                         **kwargs) -> FakeResponse:
+        """
+        Simula uma chamada ao modelo
+        
+        Args:
+            prompt: Prompt completo
+            generation_config: Ignorado (mantido por compatibilidade)
+            
+        Returns:
+            FakeResponse: Resposta com o JSON da análise em .text (um array no prompt em lote)
+        """
+        with self._lock:
+            self.calls += 1
+        rng = self._rng(prompt)
+        
+        time.sleep(max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter)))
+        
+        if rng.random() < self.rate_limit_rate:
+            raise FakeRateLimitError("429 Resource has been exhausted (e.g. check quota).")
+        if rng.random() < self.failure_rate:
+            return FakeResponse("Desculpe, não consegui analisar este currículo.")
+        blocks = PACKED_BLOCK_PATTERN.findall(prompt)
+        if blocks:
+            items = [{"cvId": int(number), **fake_analysis(block, rng)} for number, block in blocks]
+            text = json.dumps(items, ensure_ascii=False)
+        elif COMPACT_MARKER in prompt:
+            text = compact_json(fake_compact_analysis(fake_analysis(prompt, rng), rng))
+        else:
+            text = json.dumps(fake_analysis(prompt, rng), ensure_ascii=False)
+        if self.token_latency:
+            time.sleep(self.token_latency * len(text) / 4)
+        return FakeResponse(text)
+
+def fake_analysis(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    """
+    Gera uma análise plausível no schema esperado pelo SmartCV
+    
+    Args:
+        prompt: Prompt enviado (as palavras do currículo viram palavras-chave)
+        rng: Gerador pseudoaleatório determinístico
+        
+    Returns:
+        dict: Análise no mesmo formato do Gemini
+    """
+    words = sorted(set(WORD_PATTERN.findall(prompt.rsplit("CURRÍCULO PARA ANÁLISE:", 1)[-1])))
+    present: List[str] = rng.sample(words, min(len(words), rng.randint(3, 8)))
+    missing = [keyword for keyword in rng.sample(KEYWORD_POOL, 5) if keyword not in present][:4]
+    
+    clarity = rng.randint(40, 98)
+    structure = rng.randint(40, 98)
+    keywords = rng.randint(30, 95)
+    
+    def suggestions(topic: str, count: int) -> List[str]:
+        return [f"Sugestão {i} sobre {topic}: detalhar resultados com números" for i in range(1, count + 1)]
+    
+    return {
+        "overallScore": round((clarity + structure + keywords) / 3),
+        "clarity": {
+            "score": clarity,
+            "feedback": "Texto objetivo, com alguns trechos longos que podem ser resumidos.",
+            "suggestions": suggestions("clareza", 3)
+        },
+        "structure": {
+            "score": structure,
+            "feedback": "Seções bem definidas; a cronologia pode ficar mais evidente.",
+            "suggestions": suggestions("estrutura", 3)
+        },
+        "keywords": {
+            "score": keywords,
+            "missing": missing,
+            "present": present,
+            "suggestions": suggestions("palavras-chave", 2)
+        },
+        "improvements": suggestions("melhorias gerais", 3),
+        "strengths": ["Experiência relevante", "Formação adequada", "Boa apresentação"],
+        "summary": "Currículo consistente, com espaço para quantificar conquistas e reforçar palavras-chave."
+    }
+
+def fake_compact_analysis(analysis: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """
+    Converte uma análise simulada no formato compacto (chaves curtas e códigos)
+    
+    Args:
+        analysis: Análise no formato completo
+        rng: Gerador pseudoaleatório determinístico
+        
+    Returns:
+        dict: Análise no formato compacto
+    """
+    def codes(section: str) -> List[str]:
+        return rng.sample(SECTION_CODES[section], rng.randint(2, 3))
+    
+    return {
+        "o": analysis['overallScore'],
+        "c": {"s": analysis['clarity']['score'], "f": analysis['clarity']['feedback'], "g": codes("clarity")},
+        "e": {"s": analysis['structure']['score'], "f": analysis['structure']['feedback'], "g": codes("structure")},
+        "k": {"s": analysis['keywords']['score'], "p": analysis['keywords']['present'],
+              "m": analysis['keywords']['missing'], "g": codes("keywords")},
+        "i": codes("improvements"),
+        "pf": analysis['strengths'],
+        "r": analysis['summary']
+    }
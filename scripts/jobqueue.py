@@ -0,0 +1,341 @@
+"""
+Fila de trabalhos compartilhada entre workers, com posse temporária (lease) e heartbeats
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Optional, Dict, Any, List, NamedTuple
+
+from config import WORKER_CONFIG
+from scheduler import PRIORITIES, PRIORITY_BATCH
+
+# Erro registrado quando a posse expira na última tentativa (worker morto ou travado)
+LEASE_EXPIRED_ERROR = "Posse expirada em todas as tentativas (worker interrompido?)"
+
+# Estados de um trabalho
+STATUS_QUEUED = "queued"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUSES = [STATUS_QUEUED, STATUS_LEASED, STATUS_DONE, STATUS_FAILED]
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_token INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, priority, created_at);
+"""
+
+class Job(NamedTuple):
+    """Trabalho em posse de um worker"""
+    job_id: str
+    payload: Dict[str, Any]
+    attempts: int
+    lease_token: int
+
+class SQLiteJobQueue:
+    """
+    Fila em SQLite, que pode ficar em armazenamento compartilhado entre máquinas
+    
+    Cada trabalho tem uma chave idempotente (reenfileirar a mesma chave não
+    duplica o trabalho). Um worker toma posse de um trabalho por lease_seconds
+    e renova a posse com heartbeats; se o worker morrer, a posse expira e outro
+    worker reassume o trabalho. Cada posse recebe um token crescente, e só o
+    dono do token atual pode concluir ou renovar o trabalho, de modo que um
+    worker atrasado nunca sobrescreve o resultado de quem o reassumiu.
+    """
+    
+    def __init__(self, path: Optional[str] = None, journal_mode: Optional[str] = None):
+        self.path = path or WORKER_CONFIG["queue_path"]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        # Transações explícitas (BEGIN IMMEDIATE) para tomar posse de forma atômica
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode or WORKER_CONFIG['journal_mode']}")
+        self._conn.executescript(QUEUE_SCHEMA)
+    
+    def enqueue(self, job_id: str, payload: Dict[str, Any], priority: str = PRIORITY_BATCH) -> bool:
+        """
+        Enfileira um trabalho (ignorado se a chave já existir)
+        
+        Args:
+            job_id: Chave idempotente do trabalho (ex.: hash do arquivo)
+            payload: Dados do trabalho serializáveis em JSON
+            priority: Classe de prioridade (ver PRIORITIES)
+        
+        Returns:
+            bool: True se o trabalho foi criado
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO jobs (id, payload, priority, status, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, json.dumps(payload, ensure_ascii=False), PRIORITIES.index(priority),
+                 STATUS_QUEUED, now, now)
+            )
+        return cursor.rowcount > 0
+    
+    def lease(self, worker_id: str, lease_seconds: Optional[float] = None,
+              max_attempts: Optional[int] = None) -> Optional[Job]:
+        """
+        Toma posse do próximo trabalho disponível
+        
+        Trabalhos na fila e trabalhos com posse expirada são elegíveis, por
+        prioridade e depois por ordem de chegada. Uma posse expirada que já
+        usou max_attempts tentativas marca o trabalho como falho: o worker que
+        o processava morreu (ex.: OOM) e reassumir só repetiria a queda.
+        
+        Args:
+            worker_id: Identificador do worker
+            lease_seconds: Duração da posse
+            max_attempts: Tentativas antes de desistir
+        
+        Returns:
+            Job: Trabalho obtido ou None se a fila estiver vazia
+        """
+        now = time.time()
+        expires = now + (lease_seconds or WORKER_CONFIG["lease_seconds"])
+        max_attempts = max_attempts or WORKER_CONFIG["max_attempts"]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, error = ?, lease_expires = NULL, updated_at = ?
+                    WHERE status = ? AND lease_expires < ? AND attempts >= ?
+                    """,
+                    (STATUS_FAILED, LEASE_EXPIRED_ERROR, now, STATUS_LEASED, now, max_attempts)
+                )
+                row = self._conn.execute(
+                    """
+                    SELECT id, payload, attempts, lease_token FROM jobs
+                    WHERE status = ? OR (status = ? AND lease_expires < ?)
+                    ORDER BY priority, created_at LIMIT 1
+                    """,
+                    (STATUS_QUEUED, STATUS_LEASED, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                token = row['lease_token'] + 1
+                self._conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, attempts = attempts + 1, lease_token = ?,
+                                    lease_owner = ?, lease_expires = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (STATUS_LEASED, token, worker_id, expires, now, row['id'])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return Job(row['id'], json.loads(row['payload']), row['attempts'] + 1, token)
+    
+    def _update_owned(self, job: Job, assignments: str, params: List[Any]) -> bool:
+        """Atualiza o trabalho apenas se a posse ainda for deste token"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? WHERE id = ? AND status = ? AND lease_token = ?",
+                params + [time.time(), job.job_id, STATUS_LEASED, job.lease_token]
+            )
+        return cursor.rowcount > 0
+    
+    def heartbeat(self, job: Job, lease_seconds: Optional[float] = None) -> bool:
+        """
+        Renova a posse de um trabalho em andamento
+        
+        Returns:
+            bool: False se a posse foi perdida (expirou e outro worker assumiu)
+        """
+        expires = time.time() + (lease_seconds or WORKER_CONFIG["lease_seconds"])
+        return self._update_owned(job, "lease_expires = ?", [expires])
+    
+    def complete(self, job: Job, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Marca o trabalho como concluído
+        
+        Returns:
+            bool: False se a posse foi perdida (o resultado deste worker é descartado)
+        """
+        return self._update_owned(
+            job, "status = ?, result = ?, error = NULL, lease_expires = NULL",
+            [STATUS_DONE, json.dumps(result or {}, ensure_ascii=False)]
+        )
+    
+    def fail(self, job: Job, error: str, retry: bool = True,
+             max_attempts: Optional[int] = None) -> bool:
+        """
+        Registra a falha de um trabalho, devolvendo-o à fila enquanto houver tentativas
+        
+        Args:
+            job: Trabalho em posse do worker
+            error: Mensagem de erro
+            retry: Se False, o erro é definitivo (ex.: arquivo inválido)
+            max_attempts: Tentativas antes de desistir
+        
+        Returns:
+            bool: False se a posse foi perdida
+        """
+        max_attempts = max_attempts or WORKER_CONFIG["max_attempts"]
+        status = STATUS_QUEUED if retry and job.attempts < max_attempts else STATUS_FAILED
+        return self._update_owned(job, "status = ?, error = ?, lease_expires = NULL", [status, error])
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna o estado de um trabalho"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record['payload'] = json.loads(record['payload'])
+        record['result'] = json.loads(record['result']) if record['result'] else None
+        return record
+    
+    def stats(self) -> Dict[str, int]:
+        """Quantidade de trabalhos por estado"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in STATUSES}
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
+    
+    def pending(self) -> int:
+        """Trabalhos ainda não finalizados (na fila ou em andamento)"""
+        counts = self.stats()
+        return counts[STATUS_QUEUED] + counts[STATUS_LEASED]
+    
+    def close(self):
+        """Fecha a conexão com a fila"""
+        with self._lock:
+            self._conn.close()
+
+class InMemoryJobQueue:
+    """
+    Fila em memória com a mesma interface de SQLiteJobQueue
+    
+    Serve para rodar vários workers em threads de um único processo (testes,
+    benchmarks e demonstrações) sem depender de armazenamento compartilhado.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._sequence = 0
+    
+    def enqueue(self, job_id: str, payload: Dict[str, Any], priority: str = PRIORITY_BATCH) -> bool:
+        """Enfileira um trabalho (ignorado se a chave já existir)"""
+        with self._lock:
+            if job_id in self._jobs:
+                return False
+            self._sequence += 1
+            self._jobs[job_id] = {
+                "id": job_id, "payload": payload, "priority": PRIORITIES.index(priority),
+                "status": STATUS_QUEUED, "attempts": 0, "lease_token": 0, "lease_owner": None,
+                "lease_expires": None, "result": None, "error": None, "sequence": self._sequence
+            }
+        return True
+    
+    def lease(self, worker_id: str, lease_seconds: Optional[float] = None,
+              max_attempts: Optional[int] = None) -> Optional[Job]:
+        """Toma posse do próximo trabalho disponível (posses expiradas na última tentativa viram falha)"""
+        now = time.time()
+        max_attempts = max_attempts or WORKER_CONFIG["max_attempts"]
+        with self._lock:
+            for job in self._jobs.values():
+                if job['status'] == STATUS_LEASED and job['lease_expires'] < now and job['attempts'] >= max_attempts:
+                    job.update(status=STATUS_FAILED, error=LEASE_EXPIRED_ERROR, lease_expires=None)
+            ready = [
+                job for job in self._jobs.values()
+                if job['status'] == STATUS_QUEUED
+                or (job['status'] == STATUS_LEASED and job['lease_expires'] < now)
+            ]
+            if not ready:
+                return None
+            job = min(ready, key=lambda item: (item['priority'], item['sequence']))
+            job.update(
+                status=STATUS_LEASED, attempts=job['attempts'] + 1, lease_token=job['lease_token'] + 1,
+                lease_owner=worker_id, lease_expires=now + (lease_seconds or WORKER_CONFIG["lease_seconds"])
+            )
+            return Job(job['id'], job['payload'], job['attempts'], job['lease_token'])
+    
+    def _update_owned(self, job: Job, **changes) -> bool:
+        """Atualiza o trabalho apenas se a posse ainda for deste token"""
+        with self._lock:
+            record = self._jobs.get(job.job_id)
+            if record is None or record['status'] != STATUS_LEASED or record['lease_token'] != job.lease_token:
+                return False
+            record.update(changes)
+            return True
+    
+    def heartbeat(self, job: Job, lease_seconds: Optional[float] = None) -> bool:
+        """Renova a posse de um trabalho em andamento"""
+        return self._update_owned(job, lease_expires=time.time() + (lease_seconds or WORKER_CONFIG["lease_seconds"]))
+    
+    def complete(self, job: Job, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Marca o trabalho como concluído"""
+        return self._update_owned(job, status=STATUS_DONE, result=result or {}, error=None, lease_expires=None)
+    
+    def fail(self, job: Job, error: str, retry: bool = True,
+             max_attempts: Optional[int] = None) -> bool:
+        """Registra a falha de um trabalho, devolvendo-o à fila enquanto houver tentativas"""
+        max_attempts = max_attempts or WORKER_CONFIG["max_attempts"]
+        status = STATUS_QUEUED if retry and job.attempts < max_attempts else STATUS_FAILED
+        return self._update_owned(job, status=status, error=error, lease_expires=None)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna o estado de um trabalho"""
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return dict(record) if record else None
+    
+    def stats(self) -> Dict[str, int]:
+        """Quantidade de trabalhos por estado"""
+        counts = {status: 0 for status in STATUSES}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+        return counts
+    
+    def pending(self) -> int:
+        """Trabalhos ainda não finalizados (na fila ou em andamento)"""
+        counts = self.stats()
+        return counts[STATUS_QUEUED] + counts[STATUS_LEASED]
+    
+    def close(self):
+        """Nada a liberar na fila em memória"""
+
+def open_queue(location: Optional[str] = None):
+    """
+    Abre a fila indicada
+    
+    Args:
+        location: Caminho do banco SQLite ou 'memory' para a fila em processo
+    
+    Returns:
+        SQLiteJobQueue ou InMemoryJobQueue
+    """
+    if location == "memory":
+        return InMemoryJobQueue()
+    return SQLiteJobQueue(location)
@@ -0,0 +1,555 @@
+"""
+Teste de carga do app Streamlit com sessões simultâneas
+
+Sobe `streamlit run app.py` com o Gemini simulado (SMARTCV_FAKE_GEMINI) e
+conduz sessões headless pelo mesmo protocolo do navegador (WebSocket com
+mensagens protobuf): carregamento -> upload -> análise -> abas -> download.
+Para cada nível de concorrência grava percentis de latência por etapa, CPU e
+memória do servidor e taxa de erros, e aponta o ponto de saturação.
+
+Uso:
+    python loadtest.py --levels 1,2,4,8,16 --iterations 2 --latency 1.0
+    python loadtest.py --url http://localhost:8501 --server-pid 1234
+    python loadtest.py --compare benchmarks/loadtest-antes.json benchmarks/loadtest-depois.json
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import mimetypes
+import subprocess
+import urllib.request
+from typing import Optional, Dict, Any, List, Tuple
+
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from tornado.websocket import websocket_connect
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.Common_pb2 import FileURLs, UploadedFileInfo
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from benchmark import git_commit, summarize
+from corpus import generate_cv
+from results_html import RESULT_TABS
+
+STEPS = ["load", "upload", "analyze", "tab", "download"]
+
+# Rótulo do botão de análise em app.py
+ANALYZE_LABEL = "Analisar Currículo"
+
+class SessionError(Exception):
+    """Falha de uma etapa da sessão (resposta inesperada do app)"""
+
+class BrowserSession:
+    """
+    Sessão headless que fala o protocolo do frontend do Streamlit
+    
+    Cada rerun envia o estado de todos os widgets (como o navegador) e lê as
+    mensagens até o fim da execução do script. Mensagens repetidas chegam só
+    como referência (ref_hash) e são resolvidas pelo cache local da sessão,
+    como no navegador.
+    """
+    
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session_id: Optional[str] = None
+        self.page_script_hash = ""
+        self.widget_states: Dict[str, WidgetState] = {}
+        self.elements: List[Tuple[str, Any]] = []
+        self.exceptions: List[str] = []
+        self._cache: Dict[str, ForwardMsg] = {}
+        self._conn = None
+        self._xsrf = uuid.uuid4().hex
+        self._http = AsyncHTTPClient()
+    
+    async def connect(self):
+        """Abre o WebSocket e executa o script pela primeira vez"""
+        ws_url = self.base_url.replace("http", "ws", 1) + "/_stcore/stream"
+        self._conn = await asyncio.wait_for(
+            websocket_connect(ws_url, subprotocols=["streamlit"], compression_options={}), self.timeout
+        )
+        await self.rerun()
+    
+    async def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    async def _send(self, message: BackMsg):
+        await self._conn.write_message(message.SerializeToString(), binary=True)
+    
+    async def _read(self) -> ForwardMsg:
+        """Lê a próxima mensagem, resolvendo referências ao cache"""
+        payload = await asyncio.wait_for(self._conn.read_message(), self.timeout)
+        if payload is None:
+            raise SessionError("WebSocket fechado pelo servidor")
+        message = ForwardMsg.FromString(payload)
+        if message.WhichOneof("type") == "ref_hash":
+            cached = self._cache.get(message.ref_hash)
+            if cached is None:
+                response = await self._http.fetch(f"{self.base_url}/_stcore/message?hash={message.ref_hash}")
+                cached = ForwardMsg.FromString(response.body)
+            cached.metadata.CopyFrom(message.metadata)
+            message = cached
+        elif message.hash and message.metadata.cacheable:
+            self._cache[message.hash] = message
+        return message
+    
+    def _collect(self, message: ForwardMsg):
+        """Guarda os elementos da execução atual"""
+        kind = message.WhichOneof("type")
+        if kind == "new_session":
+            self.elements = []
+            self.exceptions = []
+            if message.new_session.initialize.session_id:
+                self.session_id = message.new_session.initialize.session_id
+            self.page_script_hash = message.new_session.page_script_hash
+        elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+            element = message.delta.new_element
+            element_type = element.WhichOneof("type")
+            self.elements.append((element_type, getattr(element, element_type)))
+            if element_type == "exception":
+                self.exceptions.append(f"{element.exception.type}: {element.exception.message}")
+    
+    async def rerun(self, triggers: Optional[List[WidgetState]] = None):
+        """
+        Executa o script com o estado atual dos widgets e espera o fim
+        
+        Args:
+            triggers: Widgets de disparo único (botões) desta execução
+        """
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = self.page_script_hash
+        message.rerun_script.widget_states.widgets.extend(list(self.widget_states.values()) + (triggers or []))
+        await self._send(message)
+        while True:
+            forward = await self._read()
+            self._collect(forward)
+            if forward.WhichOneof("type") != "script_finished":
+                continue
+            if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                raise SessionError("Erro de compilação no script")
+            if forward.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                break
+            # FINISHED_EARLY_FOR_RERUN: st.rerun() -> aguarda a execução seguinte
+        if self.exceptions:
+            raise SessionError(self.exceptions[0])
+    
+    def find(self, element_type: str, predicate=lambda element: True):
+        """Primeiro elemento do tipo que atende ao predicado (ou None)"""
+        for kind, element in self.elements:
+            if kind == element_type and predicate(element):
+                return element
+        return None
+    
+    async def upload(self, name: str, data: bytes):
+        """Envia um arquivo ao st.file_uploader e executa o script"""
+        uploader = self.find("file_uploader")
+        if uploader is None:
+            raise SessionError("file_uploader não encontrado")
+        request = BackMsg()
+        request.file_urls_request.request_id = uuid.uuid4().hex
+        request.file_urls_request.session_id = self.session_id or ""
+        request.file_urls_request.file_names.append(name)
+        await self._send(request)
+        while True:
+            response = await self._read()
+            self._collect(response)
+            if (response.WhichOneof("type") == "file_urls_response"
+                    and response.file_urls_response.response_id == request.file_urls_request.request_id):
+                urls = response.file_urls_response.file_urls[0]
+                break
+        
+        # O app decide o tipo pelo Content-Type enviado pelo navegador
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{name}\"\r\n"
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+        await self._http.fetch(HTTPRequest(
+            self.base_url + urls.upload_url, method="PUT", body=body, request_timeout=self.timeout,
+            headers={
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "Cookie": f"_xsrf={self._xsrf}",
+                "X-Xsrftoken": self._xsrf
+            }
+        ))
+        
+        state = WidgetState(id=uploader.id)
+        state.file_uploader_state_value.max_file_id = 1
+        state.file_uploader_state_value.uploaded_file_info.append(UploadedFileInfo(
+            id=1, name=name, size=len(data), file_id=urls.file_id,
+            file_urls=FileURLs(file_id=urls.file_id, upload_url=urls.upload_url, delete_url=urls.delete_url)
+        ))
+        self.widget_states[uploader.id] = state
+        await self.rerun()
+    
+    async def click(self, label: str):
+        """Clica no botão cujo rótulo contém o texto"""
+        button = self.find("button", lambda element: label in element.label)
+        if button is None:
+            raise SessionError(f"Botão '{label}' não encontrado")
+        if button.disabled:
+            raise SessionError(f"Botão '{label}' desabilitado")
+        await self.rerun([WidgetState(id=button.id, trigger_value=True)])
+    
+    async def select_radio(self, key: str, option: str):
+        """Escolhe uma opção de st.radio identificado pela key"""
+        radio = self.find("radio", lambda element: element.id.endswith(key))
+        if radio is None:
+            raise SessionError(f"Radio '{key}' não encontrado")
+        self.widget_states[radio.id] = WidgetState(id=radio.id, int_value=list(radio.options).index(option))
+        await self.rerun()
+    
+    async def download_all(self) -> int:
+        """Baixa o conteúdo de todos os st.download_button da página"""
+        urls = [element.url for kind, element in self.elements if kind == "download_button"]
+        if not urls:
+            raise SessionError("Nenhum botão de download encontrado")
+        total = 0
+        for url in urls:
+            response = await self._http.fetch(self.base_url + url, request_timeout=self.timeout)
+            total += len(response.body)
+        return total
+
+class StepRecorder:
+    """Durações e erros por etapa de um nível de concorrência"""
+    
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = {step: [] for step in STEPS}
+        self.errors: Dict[str, int] = {step: 0 for step in STEPS}
+        self.messages: Dict[str, str] = {}
+        self.flows = 0
+        self.failed_flows = 0
+    
+    async def step(self, name: str, coroutine) -> bool:
+        """Executa e mede uma etapa; retorna False se falhar"""
+        start = time.perf_counter()
+        try:
+            await coroutine
+        except Exception as e:
+            self.errors[name] += 1
+            self.messages.setdefault(name, f"{type(e).__name__}: {e}")
+            return False
+        self.durations[name].append(time.perf_counter() - start)
+        return True
+
+async def run_flow(base_url: str, cv, recorder: StepRecorder, timeout: float):
+    """Um usuário do início ao fim: carrega, envia, analisa, percorre as abas e baixa o relatório"""
+    session = BrowserSession(base_url, timeout)
+    try:
+        ok = (
+            await recorder.step("load", session.connect())
+            and await recorder.step("upload", session.upload(cv.name, cv.data))
+            and await recorder.step("analyze", session.click(ANALYZE_LABEL))
+        )
+        if ok and session.find("radio", lambda element: element.id.endswith("results_tab")) is None:
+            recorder.errors["analyze"] += 1
+            recorder.messages.setdefault("analyze", "Resultados não exibidos após a análise")
+            ok = False
+        for tab in RESULT_TABS[1:]:
+            ok = ok and await recorder.step("tab", session.select_radio("results_tab", tab))
+        ok = ok and await recorder.step("download", session.download_all())
+    finally:
+        await session.close()
+    recorder.flows += 1
+    if not ok:
+        recorder.failed_flows += 1
+
+class ServerSampler:
+    """Amostra CPU e memória (RSS) do processo servidor via /proc (Linux)"""
+    
+    def __init__(self, pid: Optional[int]):
+        self.pid = pid
+        self.rss_samples: List[int] = []
+    
+    def cpu_seconds(self) -> Optional[float]:
+        if not self.pid:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        except (OSError, ValueError, IndexError):
+            return None
+    
+    def rss_kb(self) -> Optional[int]:
+        if not self.pid:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            return None
+        return None
+    
+    async def sample(self, interval: float = 0.25):
+        """Amostra o RSS até ser cancelado"""
+        while True:
+            rss = self.rss_kb()
+            if rss is not None:
+                self.rss_samples.append(rss)
+            await asyncio.sleep(interval)
+
+async def run_level(base_url: str, sessions: int, iterations: int, corpus: List[Any],
+                    sampler: ServerSampler, timeout: float) -> Dict[str, Any]:
+    """
+    Executa um nível de concorrência
+    
+    Args:
+        base_url: Endereço do app
+        sessions: Usuários simultâneos
+        iterations: Fluxos completos por usuário (cada um em uma sessão nova)
+        corpus: Currículos enviados (escolhidos em rodízio)
+        sampler: Amostrador do processo servidor
+        timeout: Tempo máximo de cada mensagem ou requisição (s)
+    
+    Returns:
+        dict: Resultado do nível
+    """
+    recorder = StepRecorder()
+    sampler.rss_samples = []
+    monitor = asyncio.ensure_future(sampler.sample())
+    cpu_start = sampler.cpu_seconds()
+    start = time.perf_counter()
+    
+    async def user(index: int):
+        for iteration in range(iterations):
+            cv = corpus[(index * iterations + iteration) % len(corpus)]
+            await run_flow(base_url, cv, recorder, timeout)
+    
+    await asyncio.gather(*(user(index) for index in range(sessions)))
+    wall = time.perf_counter() - start
+    cpu_end = sampler.cpu_seconds()
+    monitor.cancel()
+    
+    steps = {step: summarize(recorder.durations[step]) for step in STEPS}
+    for step in STEPS:
+        steps[step]["errors"] = recorder.errors[step]
+    return {
+        "sessions": sessions,
+        "flows": recorder.flows,
+        "failed_flows": recorder.failed_flows,
+        "error_rate": round(recorder.failed_flows / recorder.flows, 4) if recorder.flows else None,
+        "wall_seconds": round(wall, 3),
+        "throughput_flows_per_s": round((recorder.flows - recorder.failed_flows) / wall, 3) if wall else None,
+        "server_cpu_percent": round((cpu_end - cpu_start) / wall * 100, 1) if cpu_start is not None and cpu_end is not None else None,
+        "server_rss_peak_kb": max(sampler.rss_samples) if sampler.rss_samples else None,
+        "steps": steps,
+        "error_messages": recorder.messages
+    }
+
+def find_saturation(levels: List[Dict[str, Any]], max_p95_ms: float, max_error_rate: float,
+                    min_gain: float) -> Dict[str, Any]:
+    """
+    Aponta o primeiro nível saturado
+    
+    Um nível satura quando a taxa de erros passa do limite, o p95 de um rerun
+    (troca de aba) passa do limite, ou a vazão deixa de crescer pelo menos
+    `min_gain` em relação ao nível anterior.
+    
+    Returns:
+        dict: Nível saturado, motivo e último nível saudável
+    """
+    previous = None
+    for level in levels:
+        tab_p95 = level["steps"]["tab"].get("p95_ms")
+        reason = None
+        if level["error_rate"] is not None and level["error_rate"] > max_error_rate:
+            reason = f"taxa de erros {level['error_rate']:.1%}"
+        elif tab_p95 is not None and tab_p95 > max_p95_ms:
+            reason = f"p95 da troca de aba {tab_p95:.0f} ms"
+        elif previous and previous["throughput_flows_per_s"] and level["throughput_flows_per_s"] is not None:
+            gain = level["throughput_flows_per_s"] / previous["throughput_flows_per_s"] - 1
+            if gain < min_gain:
+                reason = f"vazão cresceu só {gain:+.0%} sobre {previous['sessions']} sessões"
+        if reason:
+            return {
+                "sessions": level["sessions"],
+                "reason": reason,
+                "last_healthy_sessions": previous["sessions"] if previous else None
+            }
+        previous = level
+    return {"sessions": None, "reason": "não atingida", "last_healthy_sessions": levels[-1]["sessions"] if levels else None}
+
+def free_port() -> int:
+    """Porta TCP livre na máquina local"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(port: int, latency: float, data_dir: str) -> subprocess.Popen:
+    """
+    Sobe o app com o Gemini simulado e espera o health check
+    
+    Args:
+        port: Porta do servidor
+        latency: Latência do modelo simulado (s)
+        data_dir: Pasta de dados isolada (banco de análises do teste)
+    
+    Returns:
+        Popen: Processo do servidor
+    """
+    env = {
+        **os.environ,
+        "SMARTCV_FAKE_GEMINI": str(latency),
+        "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY") or "teste-de-carga",
+        "SMARTCV_DATA_DIR": data_dir,
+        "SMARTCV_METRICS": "0"
+    }
+    command = [
+        sys.executable, "-m", "streamlit", "run", "app.py",
+        "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+        "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"
+    ]
+    process = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"O servidor encerrou: {process.stderr.read().decode(errors='replace')[-2000:]}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.3)
+    process.kill()
+    raise RuntimeError("O servidor não respondeu ao health check em 60s")
+
+def build_corpus(count: int, pages: int, file_type: str, seed: int) -> List[Any]:
+    """Currículos sintéticos enviados pelas sessões"""
+    rng = random.Random(seed)
+    return [generate_cv(rng, pages, file_type, index) for index in range(count)]
+
+async def run_load_test(base_url: str, levels: List[int], iterations: int, corpus: List[Any],
+                        sampler: ServerSampler, timeout: float, warmup: bool = True) -> List[Dict[str, Any]]:
+    """Executa os níveis em ordem crescente (após uma sessão de aquecimento)"""
+    AsyncHTTPClient.configure(None, max_clients=max(levels) * 2 + 10)
+    if warmup:
+        await run_flow(base_url, corpus[0], StepRecorder(), timeout)
+    results = []
+    for sessions in levels:
+        result = await run_level(base_url, sessions, iterations, corpus, sampler, timeout)
+        print_level(result)
+        results.append(result)
+    return results
+
+def print_level(level: Dict[str, Any]):
+    """Imprime uma linha de resultado do nível"""
+    steps = level["steps"]
+    cells = "".join(
+        f"{steps[step].get('p50_ms', 0):>9.0f}{steps[step].get('p95_ms', 0):>9.0f}" for step in STEPS
+    )
+    cpu = level["server_cpu_percent"]
+    rss = level["server_rss_peak_kb"]
+    print(f"{level['sessions']:>8}{cells}{level['throughput_flows_per_s']:>9.2f}{level['error_rate'] or 0:>8.1%}"
+          f"{cpu if cpu is not None else '-':>7}{(rss // 1024) if rss else '-':>8}")
+    for step, message in level["error_messages"].items():
+        print(f"{'':>8}⚠️ {step}: {message}")
+
+def print_header():
+    """Cabeçalho da tabela de níveis"""
+    print(f"{'':>8}" + "".join(f"{step:>18}" for step in STEPS))
+    print(f"{'sessões':>8}" + "".join(f"{'p50 ms':>9}{'p95 ms':>9}" for _ in STEPS)
+          + f"{'fluxo/s':>9}{'erros':>8}{'CPU%':>7}{'RSS MB':>8}")
+
+def compare_reports(before: Dict[str, Any], after: Dict[str, Any]):
+    """Compara dois relatórios nível a nível (p95 da troca de aba e vazão)"""
+    old_levels = {level["sessions"]: level for level in before["levels"]}
+    print(f"{'sessões':>8}{'aba p95 antes':>15}{'depois':>9}{'fluxo/s antes':>15}{'depois':>9}")
+    for level in after["levels"]:
+        old = old_levels.get(level["sessions"])
+        if old is None:
+            continue
+        print(f"{level['sessions']:>8}{old['steps']['tab'].get('p95_ms', 0):>15.0f}"
+              f"{level['steps']['tab'].get('p95_ms', 0):>9.0f}"
+              f"{old['throughput_flows_per_s']:>15.2f}{level['throughput_flows_per_s']:>9.2f}")
+    print(f"Saturação: {before['saturation']['sessions']} → {after['saturation']['sessions']} sessões")
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do app SmartCV com sessões simultâneas")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="Sessões simultâneas por nível, separadas por vírgula")
+    parser.add_argument("--iterations", type=int, default=2, help="Fluxos completos por sessão em cada nível")
+    parser.add_argument("--latency", type=float, default=1.0, help="Latência do Gemini simulado (s)")
+    parser.add_argument("--pages", type=int, default=3, help="Páginas de cada currículo enviado")
+    parser.add_argument("--file-type", choices=["pdf", "txt"], default="pdf")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Tempo máximo por mensagem (s)")
+    parser.add_argument("--max-p95", type=float, default=2000.0, help="p95 (ms) da troca de aba considerado saturado")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--min-gain", type=float, default=0.1, help="Ganho mínimo de vazão entre níveis")
+    parser.add_argument("--url", help="Usar um servidor já em execução (com SMARTCV_FAKE_GEMINI)")
+    parser.add_argument("--server-pid", type=int, help="PID do servidor informado em --url (CPU/RSS)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: benchmarks/loadtest-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("ANTES", "DEPOIS"), help="Compara dois relatórios")
+    args = parser.parse_args()
+    
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as before, open(args.compare[1], encoding='utf-8') as after:
+            compare_reports(json.load(before), json.load(after))
+        return
+    
+    levels = sorted({int(level) for level in args.levels.split(",")})
+    corpus = build_corpus(max(levels) * args.iterations, args.pages, args.file_type, args.seed)
+    process = None
+    data_dir = tempfile.mkdtemp(prefix="smartcv-loadtest-")
+    if args.url:
+        base_url, pid = args.url, args.server_pid
+    else:
+        port = free_port()
+        process = start_server(port, args.latency, data_dir)
+        base_url, pid = f"http://127.0.0.1:{port}", process.pid
+    
+    print_header()
+    try:
+        results = asyncio.run(run_load_test(base_url, levels, args.iterations, corpus, ServerSampler(pid), args.timeout))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+    
+    saturation = find_saturation(results, args.max_p95, args.max_error_rate, args.min_gain)
+    print(f"Saturação: {saturation['sessions'] or '-'} sessões ({saturation['reason']}); "
+          f"último nível saudável: {saturation['last_healthy_sessions']}")
+    
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": {
+                "levels": levels, "iterations": args.iterations, "latency": args.latency,
+                "pages": args.pages, "file_type": args.file_type, "url": args.url,
+                "max_p95_ms": args.max_p95, "max_error_rate": args.max_error_rate, "min_gain": args.min_gain
+            }
+        },
+        "levels": results,
+        "saturation": saturation
+    }
+    output = args.output or os.path.join("benchmarks", f"loadtest-{report['meta']['git_commit'] or 'local'}.json")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, ensure_ascii=False, indent=2)
+    print(f"📄 Resultado gravado em {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Instrumentação do SmartCV: spans de tempo, contadores e exportação Prometheus
+"""
+
+import time
+import uuid
+import bisect
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+
+from config import METRICS_CONFIG
+
+# Limites dos histogramas de duração (segundos)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Normaliza os rótulos em uma chave ordenada"""
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    """Formata rótulos no padrão Prometheus"""
+    items = list(key) + list((extra or {}).items())
+    if not items:
+        return ""
+    escaped = [
+        f'{name}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in items
+    ]
+    return "{" + ",".join(escaped) + "}"
+
+class MetricsRegistry:
+    """Registro de métricas em memória, seguro para múltiplas threads"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._descriptions: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+    
+    def describe(self, name: str, metric_type: str, help_text: str):
+        """Registra o tipo e a descrição de uma métrica"""
+        self._descriptions[name] = (metric_type, help_text)
+    
+    def increment(self, name: str, amount: float = 1, **labels):
+        """Incrementa um contador"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+    
+    def set_gauge(self, name: str, value: float, **labels):
+        """Define o valor atual de um medidor"""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+    
+    def observe(self, name: str, value: float, **labels):
+        """Registra uma observação em um histograma de duração"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # [contagem por faixa..., +Inf, soma]
+            buckets = series.setdefault(key, [0] * (len(DURATION_BUCKETS) + 2))
+            buckets[bisect.bisect_left(DURATION_BUCKETS, value)] += 1
+            buckets[-1] += value
+    
+    def get_counter(self, name: str, **labels) -> float:
+        """Retorna o valor atual de um contador"""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+    
+    def get_gauge(self, name: str, **labels) -> Optional[float]:
+        """Retorna o valor atual de um medidor"""
+        with self._lock:
+            return self._gauges.get(name, {}).get(_label_key(labels))
+    
+    def render_prometheus(self) -> str:
+        """
+        Exporta todas as métricas no formato texto do Prometheus
+        
+        Returns:
+            str: Métricas no formato de exposição 0.0.4
+        """
+        lines = []
+        with self._lock:
+            families = (
+                [(name, 'counter', series) for name, series in self._counters.items()] +
+                [(name, 'gauge', series) for name, series in self._gauges.items()] +
+                [(name, 'histogram', series) for name, series in self._histograms.items()]
+            )
+            for name, metric_type, series in sorted(families):
+                help_text = self._descriptions.get(name, (metric_type, name))[1]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for key, value in sorted(series.items()):
+                    if metric_type != 'histogram':
+                        lines.append(f"{name}{_format_labels(key)} {value}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(DURATION_BUCKETS + ('+Inf',), value[:-1]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, {'le': str(bound)})} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {value[-1]}")
+                    lines.append(f"{name}_count{_format_labels(key)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe("smartcv_stage_duration_seconds", "histogram", "Duração de cada etapa do pipeline de análise")
+REGISTRY.describe("smartcv_stage_total", "counter", "Execuções de cada etapa do pipeline por status")
+REGISTRY.describe("smartcv_requests_total", "counter", "Execuções do script Streamlit (requisições)")
+
+class RequestTrace:
+    """Detalhamento de tempo por etapa de uma requisição"""
+    
+    def __init__(self, request_id: Optional[str] = None):
+        self.request_id = request_id or uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.spans: List[Dict[str, Any]] = []
+    
+    def record(self, stage: str, seconds: float, status: str = "ok"):
+        """Adiciona a duração de uma etapa"""
+        self.spans.append({"stage": stage, "seconds": seconds, "status": status})
+    
+    @property
+    def total_seconds(self) -> float:
+        """Tempo total desde o início da requisição"""
+        return time.time() - self.started_at
+    
+    def has_stage(self, stage: str) -> bool:
+        """Indica se a etapa foi executada nesta requisição"""
+        return any(span['stage'] == stage for span in self.spans)
+    
+    def as_rows(self) -> List[Dict[str, Any]]:
+        """Linhas para exibição (etapa, milissegundos, status)"""
+        return [
+            {"Etapa": span['stage'], "ms": round(span['seconds'] * 1000, 1), "Status": span['status']}
+            for span in self.spans
+        ]
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("smartcv_trace", default=None)
+
+def current_trace() -> Optional[RequestTrace]:
+    """Retorna o trace da requisição em andamento, se houver"""
+    return _current_trace.get()
+
+@contextmanager
+def request_trace(request_id: Optional[str] = None):
+    """
+    Abre um trace para a requisição atual; os spans internos são anexados a ele
+    
+    Args:
+        request_id: Identificador da requisição (gerado se omitido)
+    """
+    trace = RequestTrace(request_id)
+    token = _current_trace.set(trace)
+    REGISTRY.increment("smartcv_requests_total")
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+@contextmanager
+def span(stage: str):
+    """
+    Mede a duração de uma etapa do pipeline
+    
+    Args:
+        stage: Nome da etapa (ex.: 'extract_text_from_pdf')
+    """
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        REGISTRY.observe("smartcv_stage_duration_seconds", elapsed, stage=stage)
+        REGISTRY.increment("smartcv_stage_total", stage=stage, status=status)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.record(stage, elapsed, status)
+
+def timed(stage: str):
+    """Decorador que envolve a função em um span com o nome da etapa"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Expõe /metrics no formato Prometheus"""
+    
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(host: Optional[str] = None, port: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Inicia o endpoint local de métricas em uma thread daemon
+    
+    Args:
+        host: Endereço de escuta (padrão: METRICS_CONFIG)
+        port: Porta de escuta (padrão: METRICS_CONFIG)
+        
+    Returns:
+        ThreadingHTTPServer: Servidor iniciado ou None se a porta estiver ocupada
+    """
+    host = host or METRICS_CONFIG["host"]
+    port = METRICS_CONFIG["port"] if port is None else port
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError:
+        return None
+    threading.Thread(target=server.serve_forever, name="smartcv-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,204 @@
+"""
+OCR das páginas de PDF sem camada de texto (currículos digitalizados)
+
+Só as páginas em que o PyPDF2 não encontrou texto são rasterizadas
+(pypdfium2) e reconhecidas (tesseract), em um pool de processos. O resultado
+fica em cache na memória pelo hash do conteúdo da página: o texto reconhecido
+não é gravado em disco.
+"""
+
+import shutil
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
+
+from config import OCR_CONFIG
+from metrics import REGISTRY, span
+
+REGISTRY.describe("smartcv_ocr_pages_total", "counter", "Páginas sem texto por desfecho do OCR")
+
+@lru_cache(maxsize=1)
+def ocr_available() -> bool:
+    """Indica se as dependências opcionais do OCR estão instaladas"""
+    try:
+        import pypdfium2  # noqa: F401
+        import pytesseract
+    except ImportError:
+        return False
+    if shutil.which(pytesseract.pytesseract.tesseract_cmd) is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception:
+        return False
+    return True
+
+def needs_ocr(text: Optional[str]) -> bool:
+    """Indica se o texto extraído de uma página é pouco demais (página digitalizada)"""
+    return len((text or "").strip()) < OCR_CONFIG["min_page_chars"]
+
+def page_fingerprint(page) -> str:
+    """
+    Hash do conteúdo de uma página do PyPDF2 (fluxo de desenho e imagens)
+    
+    Páginas idênticas em arquivos diferentes têm o mesmo hash. Os parâmetros
+    do OCR entram na chave, para não reaproveitar textos de outra configuração.
+    
+    Args:
+        page: Página do PyPDF2
+    
+    Returns:
+        str: Hash hexadecimal
+    """
+    digest = hashlib.sha256(f"{OCR_CONFIG['languages']}|{OCR_CONFIG['dpi']}|{page.rotation}".encode())
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    resources = page.get("/Resources")
+    xobjects = resources.get_object().get("/XObject") if resources is not None else None
+    if xobjects is not None:
+        xobjects = xobjects.get_object()
+        for name in sorted(xobjects):
+            xobject = xobjects[name].get_object()
+            # Bytes ainda codificados: evita descomprimir a imagem só para o hash
+            digest.update(getattr(xobject, "_data", None) or xobject.get_data())
+    return digest.hexdigest()
+
+class PageCache:
+    """Cache LRU em memória do texto reconhecido por hash de página"""
+    
+    def __init__(self, max_pages: int):
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, page_hash: str) -> Optional[str]:
+        with self._lock:
+            text = self._pages.get(page_hash)
+            if text is not None:
+                self._pages.move_to_end(page_hash)
+            return text
+    
+    def put(self, page_hash: str, text: str):
+        with self._lock:
+            self._pages[page_hash] = text
+            self._pages.move_to_end(page_hash)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+PAGE_CACHE = PageCache(OCR_CONFIG["cache_pages"])
+
+def _recognize_pages(data: bytes, indices: List[int], dpi: int, languages: str) -> List[Tuple[int, str]]:
+    """
+    Rasteriza e reconhece páginas de um PDF (executado nos processos do pool)
+    
+    Args:
+        data: Conteúdo binário do PDF
+        indices: Páginas a reconhecer (base 0)
+        dpi: Resolução da rasterização
+        languages: Idiomas do tesseract (ex.: 'por+eng')
+    
+    Returns:
+        list: Pares (página, texto reconhecido)
+    """
+    import pypdfium2
+    import pytesseract
+    
+    document = pypdfium2.PdfDocument(data)
+    try:
+        results = []
+        for index in indices:
+            image = document[index].render(scale=dpi / 72).to_pil().convert("L")
+            results.append((index, pytesseract.image_to_string(image, lang=languages)))
+        return results
+    finally:
+        document.close()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ProcessPoolExecutor:
+    """Pool de processos do OCR, criado no primeiro uso"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: o processo do Streamlit tem muitas threads, e fork com threads pode travar
+            _pool = ProcessPoolExecutor(
+                max_workers=OCR_CONFIG["workers"], mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+def recognize_pages(data: bytes, indices: List[int]) -> Dict[int, str]:
+    """
+    Reconhece as páginas, dividindo-as entre os processos do pool
+    
+    Cada processo recebe o PDF uma única vez e um lote de páginas.
+    
+    Args:
+        data: Conteúdo binário do PDF
+        indices: Páginas a reconhecer (base 0)
+    
+    Returns:
+        dict: Texto reconhecido por página
+    """
+    workers = max(1, min(OCR_CONFIG["workers"], len(indices)))
+    args = (OCR_CONFIG["dpi"], OCR_CONFIG["languages"])
+    if workers == 1:
+        return dict(_recognize_pages(data, indices, *args))
+    chunks = [indices[start::workers] for start in range(workers)]
+    futures = [get_pool().submit(_recognize_pages, data, chunk, *args) for chunk in chunks]
+    return {index: text for future in futures for index, text in future.result()}
+
+def fill_missing_pages(data: bytes, pages, texts: List[str]) -> List[str]:
+    """
+    Completa com OCR as páginas sem texto extraído
+    
+    PDFs com texto em todas as páginas retornam sem custo adicional; em PDFs
+    mistos só as páginas vazias são reconhecidas.
+    
+    Args:
+        data: Conteúdo binário do PDF
+        pages: Páginas do PyPDF2 (mesma ordem de texts)
+        texts: Texto extraído de cada página ('' quando não houver)
+    
+    Returns:
+        list: Texto de cada página, com as páginas digitalizadas reconhecidas
+    """
+    missing = [index for index, text in enumerate(texts) if needs_ocr(text)]
+    if not missing or not OCR_CONFIG["enabled"]:
+        return texts
+    if not ocr_available():
+        REGISTRY.increment("smartcv_ocr_pages_total", len(missing), status="unavailable")
+        return texts
+    
+    texts = list(texts)
+    pending: Dict[int, str] = {}
+    with span("ocr"):
+        for index in missing[:OCR_CONFIG["max_pages"]]:
+            try:
+                page_hash = page_fingerprint(pages[index])
+            except Exception:
+                page_hash = None
+            cached = PAGE_CACHE.get(page_hash) if page_hash else None
+            if cached is not None:
+                texts[index] = cached
+                REGISTRY.increment("smartcv_ocr_pages_total", status="cached")
+            else:
+                pending[index] = page_hash
+        
+        if pending:
+            try:
+                recognized = recognize_pages(data, sorted(pending))
+            except Exception:
+                REGISTRY.increment("smartcv_ocr_pages_total", len(pending), status="error")
+                return texts
+            for index, text in recognized.items():
+                texts[index] = text.strip()
+                if pending[index]:
+                    PAGE_CACHE.put(pending[index], texts[index])
+            REGISTRY.increment("smartcv_ocr_pages_total", len(recognized), status="recognized")
+    return texts
@@ -0,0 +1,328 @@
+"""
+Pipeline de análise do SmartCV independente da interface Streamlit
+"""
+
+import io
+import json
+from typing import Optional, Dict, Any, List, Union
+
+from compact import build_compact_prompt, expand_compact_analysis
+from cvparse import prompt_content
+from metrics import REGISTRY, span, timed
+from ocr import fill_missing_pages
+from utils import clean_extracted_text, validate_analysis_response
+
+# Prompt de análise (formatado com str.format; chaves literais duplicadas)
+ANALYSIS_PROMPT = """
+        Você é um especialista em análise de currículos e recursos humanos com mais de 15 anos de experiência. 
+        Analise o currículo fornecido de forma detalhada e crítica, retornando uma análise em formato JSON válido com a seguinte estrutura EXATA:
+        
+        {{
+          "overallScore": [número de 0 a 100],
+          "clarity": {{
+            "score": [número de 0 a 100],
+            "feedback": "[feedback detalhado sobre clareza e coesão do texto]",
+            "suggestions": ["sugestão 1", "sugestão 2", "sugestão 3"]
+          }},
+          "structure": {{
+            "score": [número de 0 a 100],
+            "feedback": "[feedback sobre organização e estrutura]",
+            "suggestions": ["sugestão 1", "sugestão 2", "sugestão 3"]
+          }},
+          "keywords": {{
+            "score": [número de 0 a 100],
+            "missing": ["palavra-chave ausente 1", "palavra-chave ausente 2"],
+            "present": ["palavra-chave presente 1", "palavra-chave presente 2"],
+            "suggestions": ["sugestão 1", "sugestão 2"]
+          }},
+          "improvements": ["melhoria 1", "melhoria 2", "melhoria 3"],
+          "strengths": ["ponto forte 1", "ponto forte 2", "ponto forte 3"],
+          "summary": "[resumo geral da análise em 2-3 frases]"
+        }}
+        
+        CRITÉRIOS DE AVALIAÇÃO:
+        
+        1. CLAREZA E COESÃO (0-100):
+        - Linguagem clara, objetiva e profissional
+        - Ausência de erros gramaticais e ortográficos
+        - Fluidez na leitura e conectividade entre ideias
+        - Uso adequado de verbos de ação
+        
+        2. ESTRUTURA E ORGANIZAÇÃO (0-100):
+        - Organização lógica das seções (dados pessoais, objetivo, experiência, formação, habilidades)
+        - Formatação consistente e profissional
+        - Hierarquia clara de informações
+        - Uso adequado de bullet points e espaçamento
+        - Cronologia adequada (mais recente primeiro)
+        
+        3. PALAVRAS-CHAVE E RELEVÂNCIA (0-100):
+        - Presença de termos técnicos relevantes para a área
+        - Habilidades técnicas e soft skills mencionadas
+        - Compatibilidade com tendências do mercado de trabalho
+        - Uso de palavras-chave que passam por sistemas ATS
+        
+        INSTRUÇÕES IMPORTANTES:
+        - Seja específico e construtivo nas sugestões
+        - Considere o contexto brasileiro do mercado de trabalho
+        - Foque em melhorias práticas e implementáveis
+        - Retorne APENAS o JSON válido, sem texto adicional
+        - Use aspas duplas em todas as strings
+        - Não use quebras de linha dentro das strings JSON
+        
+        CURRÍCULO PARA ANÁLISE:
+        {content}
+        """
+
+# Cabeçalho do modo em lote: vários currículos em uma única chamada
+PACKED_PROMPT = """
+        Você receberá {count} currículos, cada um entre as marcações <<<CV n>>> e <<<FIM CV n>>>.
+        Analise cada currículo de forma independente, seguindo as instruções abaixo.
+        Retorne APENAS um array JSON com {count} objetos, na mesma ordem dos currículos.
+        Cada objeto deve ter a estrutura EXATA descrita abaixo acrescida do campo "cvId" com o número do currículo.
+        {instructions}"""
+
+REGISTRY.describe("smartcv_output_tokens_total", "counter", "Tokens gerados pelo modelo por formato de resposta")
+
+class AnalysisError(Exception):
+    """Resposta do modelo que não pôde ser convertida em análise válida"""
+    
+    def __init__(self, message: str, raw_text: str = ""):
+        super().__init__(message)
+        self.raw_text = raw_text
+
+@timed("build_prompt")
+def build_prompt(content: str) -> str:
+    """
+    Monta o prompt de análise do currículo
+    
+    Args:
+        content: Texto do currículo
+    
+    Returns:
+        str: Prompt completo
+    """
+    return ANALYSIS_PROMPT.format(content=prompt_content(content))
+
+@timed("build_prompt")
+def build_packed_prompt(contents: List[str]) -> str:
+    """
+    Monta um único prompt com vários currículos delimitados
+    
+    Args:
+        contents: Textos dos currículos
+    
+    Returns:
+        str: Prompt pedindo um array de análises na mesma ordem
+    """
+    blocks = "\n".join(
+        f"<<<CV {number}>>>\n{prompt_content(content)}\n<<<FIM CV {number}>>>"
+        for number, content in enumerate(contents, 1)
+    )
+    return PACKED_PROMPT.format(count=len(contents), instructions=ANALYSIS_PROMPT.format(content=blocks))
+
+@timed("extract_text_from_pdf")
+def extract_pdf_text(data: bytes) -> str:
+    """
+    Extrai o texto bruto de um PDF, ignorando páginas com erro
+    
+    Páginas sem camada de texto (digitalizadas) passam pelo OCR, se instalado.
+    
+    Args:
+        data: Conteúdo binário do PDF
+    
+    Returns:
+        str: Texto extraído (vazio se nada puder ser lido)
+    """
+    import PyPDF2
+    
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    pages = []
+    for page in pdf_reader.pages:
+        try:
+            pages.append(page.extract_text() or "")
+        except Exception:
+            pages.append("")
+    pages = fill_missing_pages(data, pdf_reader.pages, pages)
+    return "\n".join(page for page in pages if page).strip()
+
+def extract_text(data: bytes, file_type: str) -> str:
+    """
+    Extrai e limpa o texto de um currículo
+    
+    Args:
+        data: Conteúdo binário do arquivo
+        file_type: 'pdf' ou 'txt'
+    
+    Returns:
+        str: Texto pronto para análise
+    """
+    if file_type == 'pdf':
+        return clean_extracted_text(extract_pdf_text(data))
+    with span("upload"):
+        return data.decode("utf-8", errors="replace")
+
+def parse_analysis(result_text: str) -> Dict[str, Any]:
+    """
+    Converte a resposta do modelo em análise validada
+    
+    Args:
+        result_text: Texto retornado pelo modelo
+    
+    Returns:
+        dict: Análise validada
+    
+    Raises:
+        AnalysisError: Se a resposta não for um JSON válido no schema esperado
+    """
+    with span("parse_response"):
+        is_valid, analysis, error_message = validate_analysis_response(result_text)
+    if not is_valid:
+        raise AnalysisError(error_message, result_text)
+    return analysis
+
+def parse_compact_analysis(result_text: str) -> Dict[str, Any]:
+    """
+    Converte a resposta no formato compacto em análise validada
+    
+    Args:
+        result_text: Texto retornado pelo modelo (JSON com chaves curtas)
+    
+    Returns:
+        dict: Análise validada na estrutura completa
+    
+    Raises:
+        AnalysisError: Se a resposta não for um JSON compacto válido
+    """
+    with span("parse_response"):
+        clean_text = result_text.strip()
+        if clean_text.startswith('```json'):
+            clean_text = clean_text[7:]
+        if clean_text.endswith('```'):
+            clean_text = clean_text[:-3]
+        try:
+            data = json.loads(clean_text.strip())
+        except json.JSONDecodeError as e:
+            raise AnalysisError(f"Erro ao decodificar JSON: {str(e)}", result_text)
+        if not isinstance(data, dict):
+            raise AnalysisError("A resposta compacta deve ser um objeto JSON", result_text)
+        expanded = json.dumps(expand_compact_analysis(data), ensure_ascii=False)
+        is_valid, analysis, error_message = validate_analysis_response(expanded)
+    if not is_valid:
+        raise AnalysisError(error_message, result_text)
+    return analysis
+
+def output_token_count(response, result_text: str) -> int:
+    """
+    Tokens gerados em uma resposta
+    
+    Usa usage_metadata quando o SDK informa; senão, estima ~4 caracteres por token.
+    
+    Args:
+        response: Resposta de generate_content
+        result_text: Texto da resposta
+    
+    Returns:
+        int: Quantidade de tokens de saída
+    """
+    usage = getattr(response, "usage_metadata", None)
+    count = getattr(usage, "candidates_token_count", None)
+    return int(count) if count else max(1, len(result_text) // 4)
+
+def parse_packed_analyses(result_text: str, count: int) -> List[Union[Dict[str, Any], AnalysisError]]:
+    """
+    Converte a resposta de um prompt em lote, validando cada item separadamente
+    
+    Args:
+        result_text: Texto retornado pelo modelo (array JSON)
+        count: Número de currículos enviados
+    
+    Returns:
+        list: Para cada currículo, a análise validada ou o AnalysisError do item
+    
+    Raises:
+        AnalysisError: Se a resposta inteira não for um array JSON
+    """
+    with span("parse_response"):
+        clean_text = result_text.strip()
+        if clean_text.startswith('```json'):
+            clean_text = clean_text[7:]
+        if clean_text.endswith('```'):
+            clean_text = clean_text[:-3]
+        try:
+            items = json.loads(clean_text.strip())
+        except json.JSONDecodeError as e:
+            raise AnalysisError(f"Erro ao decodificar JSON: {str(e)}", result_text)
+        if not isinstance(items, list):
+            raise AnalysisError("A resposta em lote deve ser um array JSON", result_text)
+        
+        # Posicionar pelo cvId quando informado; senão, pela ordem do array
+        slots: List[Optional[Any]] = [None] * count
+        for position, item in enumerate(items):
+            number = item.get('cvId') if isinstance(item, dict) else None
+            index = number - 1 if isinstance(number, int) and 1 <= number <= count else position
+            if index < count and slots[index] is None:
+                slots[index] = item
+        
+        results: List[Union[Dict[str, Any], AnalysisError]] = []
+        for item in slots:
+            if item is None:
+                results.append(AnalysisError("Currículo ausente na resposta em lote"))
+                continue
+            if isinstance(item, dict):
+                item.pop('cvId', None)
+            is_valid, analysis, error_message = validate_analysis_response(json.dumps(item, ensure_ascii=False))
+            results.append(analysis if is_valid else AnalysisError(error_message, json.dumps(item, ensure_ascii=False)))
+    return results
+
+def analyze_packed(model, contents: List[str],
+                   generation_config: Optional[Dict[str, Any]] = None) -> List[Union[Dict[str, Any], AnalysisError]]:
+    """
+    Analisa vários currículos em uma única chamada ao modelo
+    
+    Args:
+        model: Modelo com generate_content (Gemini ou substituto local)
+        contents: Textos dos currículos
+        generation_config: Parâmetros de geração opcionais
+    
+    Returns:
+        list: Para cada currículo, a análise validada ou o AnalysisError do item
+    
+    Raises:
+        AnalysisError: Se a resposta inteira for inválida
+    """
+    prompt = build_packed_prompt(contents)
+    with span("generate_content"):
+        if generation_config:
+            response = model.generate_content(prompt, generation_config=generation_config)
+        else:
+            response = model.generate_content(prompt)
+        result_text = response.text.strip()
+    return parse_packed_analyses(result_text, len(contents))
+
+def analyze_content(model, content: str, generation_config: Optional[Dict[str, Any]] = None,
+                    compact: bool = False) -> Dict[str, Any]:
+    """
+    Executa a análise completa de um currículo em um modelo
+    
+    Args:
+        model: Modelo com generate_content (Gemini ou substituto local)
+        content: Texto do currículo
+        generation_config: Parâmetros de geração opcionais
+        compact: Pedir a resposta no formato compacto (expandido localmente)
+    
+    Returns:
+        dict: Análise validada
+    
+    Raises:
+        AnalysisError: Se a resposta do modelo for inválida
+    """
+    prompt = build_compact_prompt(content) if compact else build_prompt(content)
+    with span("generate_content"):
+        if generation_config:
+            response = model.generate_content(prompt, generation_config=generation_config)
+        else:
+            response = model.generate_content(prompt)
+        result_text = response.text.strip()
+    REGISTRY.increment("smartcv_output_tokens_total", output_token_count(response, result_text),
+                       format="compact" if compact else "full")
+    return parse_compact_analysis(result_text) if compact else parse_analysis(result_text)
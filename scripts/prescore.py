@@ -0,0 +1,96 @@
+"""
+Pré-avaliação local e instantânea de currículos (sem chamada ao modelo)
+"""
+
+import re
+from typing import Dict, Any, NamedTuple
+
+from cvparse import BULLET_PATTERN, EDUCATION_LABELS, parse_cv
+
+# Seções esperadas em um currículo (nomes de cvparse.SECTION_HEADINGS)
+EXPECTED_SECTIONS = ["objective", "experience", "education", "skills", "languages"]
+# Pontos pela ordem das experiências: a mais recente primeiro é o padrão esperado
+CHRONOLOGY_POINTS = {"recent_first": 1.0, "unknown": 0.5, "oldest_first": 0.25, "mixed": 0.0}
+QUANTIFIED_PATTERN = re.compile(r"\d+\s?%|R\$\s?\d|\b\d+\s?(mil|milhões|k)\b", re.I)
+ACTION_VERB_PATTERN = re.compile(
+    r"\b(desenvolvi|coordenei|implantei|implementei|reduzi|aumentei|automatizei|liderei|otimizei|"
+    r"gerenciei|criei|conduzi|negociei|estruturei|developed|led|managed|built|reduced|increased)\b",
+    re.I
+)
+
+class PreScore(NamedTuple):
+    """Resultado da pré-avaliação local"""
+    score: int
+    confidence: float
+    signals: Dict[str, Any]
+
+def local_prescore(content: str) -> PreScore:
+    """
+    Estima a qualidade estrutural do currículo com heurísticas locais
+    
+    A confiança é alta para currículos "típicos" (tamanho usual, seções
+    reconhecíveis, pouco ruído) e baixa para textos atípicos, em que a
+    estimativa local diz pouco sobre o que o modelo vai concluir. Seções,
+    cronologia e contatos vêm da extração estruturada (cvparse.parse_cv).
+    
+    Args:
+        content: Texto limpo do currículo
+    
+    Returns:
+        PreScore: Nota estimada (0-100), confiança (0-1) e sinais usados
+    """
+    content = content or ""
+    words = content.split()
+    word_count = len(words)
+    lines = [line for line in content.split('\n') if line.strip()]
+    parsed = parse_cv(content)
+    
+    sections = {name: name in parsed.sections for name in EXPECTED_SECTIONS}
+    has_contact = bool(parsed.contacts.emails or parsed.contacts.phones)
+    bullets = len(BULLET_PATTERN.findall(content))
+    quantified = len(QUANTIFIED_PATTERN.findall(content))
+    action_verbs = len(ACTION_VERB_PATTERN.findall(content))
+    alnum = sum(char.isalnum() or char.isspace() for char in content)
+    noise_ratio = 1 - alnum / len(content) if content else 1.0
+    
+    section_ratio = sum(sections.values()) / len(sections)
+    bullet_ratio = bullets / len(lines) if lines else 0.0
+    
+    # Nota: seções (30), cronologia (10), contato (10), marcadores (15), verbos de ação (15), resultados (20)
+    score = (
+        30 * section_ratio +
+        10 * CHRONOLOGY_POINTS[parsed.chronology] +
+        10 * has_contact +
+        15 * min(bullet_ratio / 0.3, 1.0) +
+        15 * min(action_verbs / 8, 1.0) +
+        20 * min(quantified / 5, 1.0)
+    )
+    
+    # Confiança: penaliza tamanhos atípicos, poucas seções e texto ruidoso
+    confidence = 1.0
+    if word_count < 150 or word_count > 3000:
+        confidence -= 0.35
+    if section_ratio < 0.4:
+        confidence -= 0.3
+    if noise_ratio > 0.15:
+        confidence -= 0.25
+    if sections["experience"] and not parsed.experiences:
+        confidence -= 0.15  # Experiências sem período reconhecível: formato que a extração local não entende
+    
+    return PreScore(
+        score=int(round(score)),
+        confidence=round(max(confidence, 0.0), 2),
+        signals={
+            "words": word_count,
+            "sections": sections,
+            "has_contact": has_contact,
+            "bullets": bullets,
+            "action_verbs": action_verbs,
+            "quantified_results": quantified,
+            "noise_ratio": round(noise_ratio, 3),
+            "experiences": len(parsed.experiences),
+            "chronology": parsed.chronology,
+            "experience_years": round(parsed.experience_months / 12, 1),
+            "education_level": EDUCATION_LABELS.get(parsed.education_level)
+        }
+    )
@@ -0,0 +1,220 @@
+"""
+Perfil de execução sob demanda para requisições lentas
+
+Com o perfil ligado (SMARTCV_PROFILE=1 ou pela sidebar), cada requisição é
+perfilada e, se passar de PROFILING_CONFIG["threshold_seconds"], o resultado é
+gravado com o id da requisição:
+
+- modo sample: pilhas amostradas em tempo de relógio (inclui a espera pelo
+  modelo e por E/S), no formato "collapsed" (.folded) aceito por
+  flamegraph.pl, speedscope e inferno
+- modo cprofile: estatísticas determinísticas (.prof), para snakeviz,
+  flameprof ou pstats
+
+As threads do escalonador que executam trabalho da requisição entram no mesmo
+perfil (follow_thread). Desligado, o custo é uma consulta a ContextVar.
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List
+
+from config import PROFILING_CONFIG
+from metrics import REGISTRY
+
+REGISTRY.describe("smartcv_profiles_saved_total", "counter", "Perfis de requisições lentas gravados em disco")
+
+PROFILE_MODES = ("sample", "cprofile")
+
+# Extensão do arquivo gravado por modo
+PROFILE_SUFFIXES = {"sample": ".folded", "cprofile": ".prof"}
+
+class RequestProfile:
+    """Perfil de uma requisição, compartilhado pelas threads que trabalham para ela"""
+    
+    def __init__(self, request_id: str, mode: str = "sample", interval: Optional[float] = None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Modo de perfil desconhecido: {mode}")
+        self.request_id = request_id
+        self.mode = mode
+        self.interval = interval or PROFILING_CONFIG["interval"]
+        self.seconds = 0.0
+        self.path: Optional[str] = None
+        self.samples: Counter = Counter()
+        self._lock = threading.Lock()
+        self._threads: Dict[int, str] = {}
+        self._profilers: List[cProfile.Profile] = []
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started = 0.0
+    
+    def start(self):
+        """Inicia o perfil na thread atual"""
+        self._started = time.perf_counter()
+        if self.mode == "sample":
+            self._sampler = threading.Thread(target=self._sample_loop, name="smartcv-profiler", daemon=True)
+            self._sampler.start()
+        return self.attach()
+    
+    def stop(self, token):
+        """Encerra o perfil iniciado por start()"""
+        self.detach(token)
+        self.seconds = time.perf_counter() - self._started
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+    
+    def attach(self):
+        """
+        Inclui a thread atual no perfil
+        
+        Returns:
+            Token a devolver para detach()
+        """
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = threading.current_thread().name
+        return ident
+    
+    def detach(self, token):
+        """Retira a thread atual do perfil"""
+        if self.mode == "cprofile":
+            token.disable()
+            with self._lock:
+                self._profilers.append(token)
+            return
+        with self._lock:
+            self._threads.pop(token, None)
+    
+    def _frame_label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+    
+    def _sample_loop(self):
+        """Registra a pilha de cada thread acompanhada a cada intervalo"""
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                threads = list(self._threads.items())
+            if not threads:
+                continue
+            frames = sys._current_frames()
+            for ident, thread_name in threads:
+                frame = frames.get(ident)
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_label(frame.f_code))
+                    frame = frame.f_back
+                if stack:
+                    stack.append(thread_name)
+                    self.samples[";".join(reversed(stack))] += 1
+    
+    def save(self, directory: str) -> str:
+        """
+        Grava o perfil no diretório, com o id da requisição no nome
+        
+        Args:
+            directory: Diretório de saída (criado se necessário)
+        
+        Returns:
+            str: Caminho do arquivo gravado
+        """
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.request_id}{PROFILE_SUFFIXES[self.mode]}"
+        path = os.path.join(directory, name)
+        if self.mode == "cprofile":
+            stats = pstats.Stats(self._profilers[0])
+            for profiler in self._profilers[1:]:
+                stats.add(profiler)
+            stats.dump_stats(path)
+        else:
+            with open(path, 'w', encoding='utf-8') as output:
+                for stack, count in self.samples.most_common():
+                    output.write(f"{stack} {count}\n")
+        self.path = path
+        return path
+
+_current_profile: contextvars.ContextVar = contextvars.ContextVar("smartcv_profile", default=None)
+
+def current_profile() -> Optional[RequestProfile]:
+    """Retorna o perfil da requisição em andamento, se houver"""
+    return _current_profile.get()
+
+def prune_profiles(directory: str, max_files: int):
+    """Apaga os perfis mais antigos além de max_files"""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(tuple(PROFILE_SUFFIXES.values()))]
+    except OSError:
+        return
+    paths = sorted((os.path.join(directory, name) for name in names), key=os.path.getmtime, reverse=True)
+    for path in paths[max_files:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+@contextmanager
+def profile_request(request_id: str, enabled: Optional[bool] = None, threshold: Optional[float] = None,
+                    mode: Optional[str] = None, directory: Optional[str] = None):
+    """
+    Perfila a requisição e grava o resultado se ela for lenta
+    
+    Args:
+        request_id: Identificador da requisição (vai no nome do arquivo)
+        enabled: Liga o perfil (padrão: PROFILING_CONFIG["enabled"])
+        threshold: Duração mínima (s) para gravar o perfil
+        mode: 'sample' ou 'cprofile'
+        directory: Diretório de saída
+    
+    Yields:
+        RequestProfile: Perfil em andamento (path preenchido ao sair, se gravado) ou None se desligado
+    """
+    if not (PROFILING_CONFIG["enabled"] if enabled is None else enabled):
+        yield None
+        return
+    
+    profile = RequestProfile(request_id, mode or PROFILING_CONFIG["mode"])
+    context_token = _current_profile.set(profile)
+    token = profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop(token)
+        _current_profile.reset(context_token)
+        limit = PROFILING_CONFIG["threshold_seconds"] if threshold is None else threshold
+        if profile.seconds >= limit:
+            directory = directory or PROFILING_CONFIG["output_dir"]
+            try:
+                profile.save(directory)
+                prune_profiles(directory, PROFILING_CONFIG["max_files"])
+                REGISTRY.increment("smartcv_profiles_saved_total", mode=profile.mode)
+            except OSError:
+                pass
+
+@contextmanager
+def follow_thread():
+    """Inclui a thread atual no perfil da requisição do contexto (trabalho delegado)"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    token = profile.attach()
+    try:
+        yield
+    finally:
+        profile.detach(token)
@@ -0,0 +1,328 @@
+"""
+Renderização dos resultados da análise em blocos HTML únicos e memorizados
+"""
+
+import html
+import functools
+from datetime import datetime
+from typing import Dict, Any, Sequence
+
+from analysis_model import Analysis
+from utils import SCORE_LEVELS, get_level_key
+
+# Abas dos resultados (apenas a selecionada é renderizada)
+RESULT_TABS = [
+    "📝 Clareza & Estrutura",
+    "🔑 Palavras-chave",
+    "💡 Sugestões & Melhorias",
+    "📋 Relatório Completo"
+]
+
+# Estilos usados apenas pelos blocos de resultado (complementam o CSS da página)
+RESULTS_CSS = """
+<style>
+    .results-columns { display: grid; grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); gap: 1.5rem; }
+    .score-bar { background: #e8eaed; border-radius: 6px; height: 8px; margin: 0.5rem 0 1rem 0; }
+    .score-bar-fill { height: 8px; border-radius: 6px; }
+    .notice { border-radius: 8px; padding: 0.75rem 1rem; margin: 0.5rem 0; }
+    .notice-success { background: #e6f4ea; color: #1e4620; }
+    .notice-info { background: #e8f0fe; color: #174ea6; }
+    .notice-warning { background: #fef7e0; color: #594300; }
+    .keyword-list { list-style: none; padding-left: 0; }
+    .keyword-list li { margin: 0.25rem 0; font-weight: bold; }
+</style>
+"""
+
+def analysis_key(analysis: Analysis) -> bytes:
+    """
+    Chave estável de uma análise para memorização
+    
+    Args:
+        analysis: Resultado da análise
+    
+    Returns:
+        bytes: Serialização binária da análise (só em memória)
+    """
+    return analysis.to_key()
+
+def _text(value: Any) -> str:
+    """Escapa texto do modelo para HTML, preservando quebras de linha"""
+    return html.escape(str(value)).replace("\n", "<br>")
+
+def _level(score: float) -> Dict[str, str]:
+    """Faixa de exibição da pontuação"""
+    return SCORE_LEVELS[get_level_key(score)]
+
+def _level_name(score: float) -> str:
+    """Nome da faixa da pontuação (ex.: 'Muito Bom')"""
+    return _level(score)["level"]
+
+def _score_bar(score: float) -> str:
+    """Barra de progresso da pontuação"""
+    width = max(0.0, min(float(score), 100.0))
+    return (
+        f'<div class="score-bar"><div class="score-bar-fill" '
+        f'style="width: {width}%; background: {_level(score)["color"]};"></div></div>'
+    )
+
+def _score_line(score: float) -> str:
+    """Linha 'Pontuação: 🟢 85/100 (Muito Bom)'"""
+    level = _level(score)
+    return f'<p><strong>Pontuação:</strong> {level["emoji"]} <strong>{score}/100</strong> ({level["level"]})</p>'
+
+def _boxes(items: Sequence[Any], css_class: str, prefix: str = "") -> str:
+    """Lista numerada de caixas (sugestões, pontos fortes, melhorias)"""
+    return "".join(
+        f'<div class="{css_class}"><strong>{prefix}{number}.</strong> {_text(item)}</div>'
+        for number, item in enumerate(items, 1)
+    )
+
+def _column(*parts: str) -> str:
+    """Coluna do grid de resultados"""
+    return "<div>" + "".join(parts) + "</div>"
+
+@functools.lru_cache(maxsize=128)
+def overview_html(key: bytes) -> str:
+    """
+    Bloco da avaliação geral (nota, resumo e cartão de destaque)
+    
+    Args:
+        key: Chave da análise (analysis_key)
+    
+    Returns:
+        str: HTML do bloco
+    """
+    analysis = Analysis.from_bytes(key)
+    score = analysis.overall_score
+    level = _level(score)
+    if score >= 80:
+        notice = '<div class="notice notice-success">🎉 Parabéns! Seu currículo está em excelente estado.</div>'
+    elif score >= 60:
+        notice = '<div class="notice notice-info">👍 Bom currículo! Algumas melhorias podem torná-lo ainda melhor.</div>'
+    else:
+        notice = '<div class="notice notice-warning">⚠️ Seu currículo precisa de algumas melhorias importantes.</div>'
+    card = (
+        f'<div class="metric-card {level["class"]}" style="text-align: center;">'
+        f'<h1 style="margin: 0; font-size: 2.5rem;">{level["emoji"]} {score}</h1>'
+        f'<p style="margin: 0; font-size: 1.2rem; font-weight: bold;">{level["level"]}</p>'
+        f'<p style="margin: 0; font-size: 0.9rem; opacity: 0.8;">de 100 pontos</p></div>'
+    )
+    return (
+        '<div class="results-columns" style="grid-template-columns: 2fr 1fr;">'
+        + _column(_score_bar(score), f"<p><strong>Resumo:</strong> {_text(analysis.summary)}</p>", notice)
+        + _column(card)
+        + "</div>"
+    )
+
+@functools.lru_cache(maxsize=128)
+def clarity_structure_html(key: bytes) -> str:
+    """
+    Aba de clareza e estrutura
+    
+    Args:
+        key: Chave da análise (analysis_key)
+    
+    Returns:
+        str: HTML da aba
+    """
+    analysis = Analysis.from_bytes(key)
+    columns = []
+    for section, title in (('clarity', "📝 Clareza e Coesão"), ('structure', "🏗️ Estrutura e Organização")):
+        data = getattr(analysis, section)
+        columns.append(_column(
+            f"<h3>{title}</h3>",
+            _score_bar(data.score),
+            _score_line(data.score),
+            f"<p><strong>Análise:</strong><br>{_text(data.feedback)}</p>",
+            "<p><strong>💡 Sugestões de Melhoria:</strong></p>",
+            _boxes(data.suggestions, "suggestion-box")
+        ))
+    return '<div class="results-columns">' + "".join(columns) + "</div>"
+
+@functools.lru_cache(maxsize=128)
+def keywords_html(key: bytes) -> str:
+    """
+    Aba de palavras-chave
+    
+    Args:
+        key: Chave da análise (analysis_key)
+    
+    Returns:
+        str: HTML da aba
+    """
+    keywords = Analysis.from_bytes(key).keywords
+    present = (
+        '<ul class="keyword-list">' + "".join(f"<li>🟢 {_text(k)}</li>" for k in keywords.present) + "</ul>"
+        if keywords.present else
+        '<div class="notice notice-info">Nenhuma palavra-chave relevante identificada</div>'
+    )
+    missing = (
+        '<ul class="keyword-list">' + "".join(f"<li>🔴 {_text(k)}</li>" for k in keywords.missing) + "</ul>"
+        if keywords.missing else
+        '<div class="notice notice-success">Todas as palavras-chave importantes estão presentes!</div>'
+    )
+    return (
+        "<h3>🔑 Análise de Palavras-chave</h3>"
+        + _score_bar(keywords.score)
+        + _score_line(keywords.score)
+        + '<div class="results-columns">'
+        + _column("<h4>✅ Palavras-chave Identificadas</h4>", present)
+        + _column("<h4>❌ Palavras-chave Ausentes</h4>", missing)
+        + "</div><hr><h4>💡 Recomendações para Palavras-chave</h4>"
+        + _boxes(keywords.suggestions, "suggestion-box", "🔑 ")
+    )
+
+@functools.lru_cache(maxsize=128)
+def suggestions_html(key: bytes) -> str:
+    """
+    Aba de pontos fortes e oportunidades de melhoria
+    
+    Args:
+        key: Chave da análise (analysis_key)
+    
+    Returns:
+        str: HTML da aba
+    """
+    analysis = Analysis.from_bytes(key)
+    return (
+        '<div class="results-columns">'
+        + _column("<h3>⭐ Pontos Fortes Identificados</h3>", _boxes(analysis.strengths, "strength-box", "✅ "))
+        + _column("<h3>🔧 Oportunidades de Melhoria</h3>", _boxes(analysis.improvements, "improvement-box", "🔧 "))
+        + "</div>"
+    )
+
+# Blocos HTML de cada aba (a de relatório usa widgets de download)
+TAB_RENDERERS = {
+    RESULT_TABS[0]: clarity_structure_html,
+    RESULT_TABS[1]: keywords_html,
+    RESULT_TABS[2]: suggestions_html
+}
+
+@functools.lru_cache(maxsize=128)
+def report_text(key: bytes, filename: str, analyzed_at: datetime) -> str:
+    """
+    Relatório completo em texto para a prévia e o download
+    
+    Args:
+        key: Chave da análise (analysis_key)
+        filename: Nome do arquivo analisado
+        analyzed_at: Momento da análise (parte da chave do cache: a data não congela)
+    
+    Returns:
+        str: Relatório formatado
+    """
+    analysis = Analysis.from_bytes(key)
+    level = _level_name
+    return f"""
+RELATÓRIO DE ANÁLISE DE CURRÍCULO - SmartCV
+{'='*60}
+
+📄 INFORMAÇÕES GERAIS
+Data da Análise: {analyzed_at.strftime('%d/%m/%Y às %H:%M')}
+Arquivo Analisado: {filename}
+Powered by: Google Gemini AI
+
+🎯 AVALIAÇÃO GERAL
+Nota Final: {analysis.overall_score}/100 ({level(analysis.overall_score)})
+
+Resumo Executivo:
+{analysis.summary}
+
+{'='*60}
+📊 ANÁLISE DETALHADA POR CRITÉRIO
+{'='*60}
+
+📝 CLAREZA E COESÃO: {analysis.clarity.score}/100 ({level(analysis.clarity.score)})
+{'-'*40}
+{analysis.clarity.feedback}
+
+💡 Sugestões de Melhoria:
+{chr(10).join([f"   • {s}" for s in analysis.clarity.suggestions])}
+
+🏗️ ESTRUTURA E ORGANIZAÇÃO: {analysis.structure.score}/100 ({level(analysis.structure.score)})
+{'-'*40}
+{analysis.structure.feedback}
+
+💡 Sugestões de Melhoria:
+{chr(10).join([f"   • {s}" for s in analysis.structure.suggestions])}
+
+🔑 PALAVRAS-CHAVE E RELEVÂNCIA: {analysis.keywords.score}/100 ({level(analysis.keywords.score)})
+{'-'*40}
+
+✅ Palavras-chave Identificadas:
+{chr(10).join([f"   • {k}" for k in analysis.keywords.present]) if analysis.keywords.present else "   • Nenhuma palavra-chave relevante identificada"}
+
+❌ Palavras-chave Ausentes (Recomendadas):
+{chr(10).join([f"   • {k}" for k in analysis.keywords.missing]) if analysis.keywords.missing else "   • Todas as palavras-chave importantes estão presentes"}
+
+💡 Recomendações:
+{chr(10).join([f"   • {s}" for s in analysis.keywords.suggestions])}
+
+{'='*60}
+⭐ PONTOS FORTES IDENTIFICADOS
+{'='*60}
+{chr(10).join([f"✅ {s}" for s in analysis.strengths])}
+
+{'='*60}
+🔧 OPORTUNIDADES DE MELHORIA
+{'='*60}
+{chr(10).join([f"🔧 {s}" for s in analysis.improvements])}
+
+{'='*60}
+📈 RECOMENDAÇÕES FINAIS
+{'='*60}
+
+Com base na análise realizada pelo Google Gemini, seu currículo recebeu a nota {analysis.overall_score}/100.
+
+{
+"Parabéns! Seu currículo está muito bem estruturado. Continue refinando os detalhes para mantê-lo sempre atualizado." if analysis.overall_score >= 80
+else "Seu currículo tem uma boa base. Implemente as sugestões apresentadas para melhorar sua competitividade no mercado." if analysis.overall_score >= 60
+else "Recomendamos focar nas melhorias sugeridas, especialmente nas áreas com menor pontuação. Um currículo bem otimizado pode fazer toda a diferença no processo seletivo."
+}
+
+Lembre-se:
+• Mantenha seu currículo sempre atualizado
+• Adapte-o para cada vaga específica
+• Use palavras-chave relevantes para sua área
+• Mantenha a formatação limpa e profissional
+• Destaque suas conquistas com dados quantitativos
+
+---
+Relatório gerado automaticamente pelo SmartCV
+Analisador de Currículos com Inteligência Artificial
+Powered by Google Gemini | Desenvolvido com Streamlit
+
+Para mais análises, visite: https://smartcv.streamlit.app
+        """
+
+@functools.lru_cache(maxsize=128)
+def summary_report_text(key: bytes, filename: str, analyzed_at: datetime) -> str:
+    """
+    Relatório resumido em texto para download
+    
+    Args:
+        key: Chave da análise (analysis_key)
+        filename: Nome do arquivo analisado
+        analyzed_at: Momento da análise
+    
+    Returns:
+        str: Resumo formatado
+    """
+    analysis = Analysis.from_bytes(key)
+    return f"""
+SMARTCV - RELATÓRIO RESUMIDO
+Data: {analyzed_at.strftime('%d/%m/%Y')}
+Arquivo: {filename}
+
+NOTA GERAL: {analysis.overall_score}/100
+
+PONTUAÇÕES:
+• Clareza: {analysis.clarity.score}/100
+• Estrutura: {analysis.structure.score}/100
+• Palavras-chave: {analysis.keywords.score}/100
+
+PRINCIPAIS MELHORIAS:
+{chr(10).join([f"• {s}" for s in analysis.improvements[:3]])}
+
+Powered by Google Gemini
+            """
@@ -0,0 +1,298 @@
+"""
+Roteamento de análises entre modelos de custo e latência diferentes
+"""
+
+import time
+import threading
+from typing import Optional, Dict, Any, Callable, List, NamedTuple, Tuple, Union
+
+from compact import compact_generation_config, full_generation_config
+from config import GEMINI_MODEL, MODEL_ROUTING, OUTPUT_CONFIG, PACKING_CONFIG
+from metrics import REGISTRY, span
+from pipeline import AnalysisError, analyze_content, analyze_packed
+from prescore import PreScore, local_prescore
+
+REGISTRY.describe("smartcv_router_decisions_total", "counter", "Modelo escolhido na primeira tentativa")
+REGISTRY.describe("smartcv_router_escalations_total", "counter", "Escaladas para um modelo mais forte")
+REGISTRY.describe("smartcv_model_latency_seconds", "gauge", "Média móvel da latência por modelo")
+REGISTRY.describe("smartcv_packed_requests_total", "counter", "Chamadas com vários currículos por modelo")
+REGISTRY.describe("smartcv_packed_items_total", "counter", "Currículos enviados em lote por resultado")
+
+def routing_tiers() -> List[str]:
+    """Modelos usados no roteamento, do mais barato ao mais forte"""
+    return MODEL_ROUTING["tiers"] if MODEL_ROUTING["enabled"] else [GEMINI_MODEL]
+
+def build_gemini_models(api_key: str, limiter=None) -> Dict[str, Any]:
+    """
+    Cria os modelos Gemini de cada nível (a biblioteca só é importada aqui)
+    
+    Args:
+        api_key: Chave da API do Google Gemini
+        limiter: AdaptiveLimiter opcional aplicado a todas as chamadas
+        
+    Returns:
+        dict: Nome do modelo -> modelo pronto para generate_content
+    """
+    import google.generativeai as genai
+    
+    genai.configure(api_key=api_key)
+    models = {}
+    for name in dict.fromkeys(routing_tiers() + [GEMINI_MODEL]):
+        model = genai.GenerativeModel(name)
+        models[name] = limiter.wrap(model) if limiter is not None else model
+    return models
+
+def build_fake_models(latency: float, limiter=None) -> Dict[str, Any]:
+    """
+    Cria modelos simulados (fake_gemini) com os nomes de cada nível, para testes sem a API
+    
+    Args:
+        latency: Latência (s) de cada chamada
+        limiter: AdaptiveLimiter opcional aplicado a todas as chamadas
+        
+    Returns:
+        dict: Nome do modelo -> modelo simulado
+    """
+    from fake_gemini import FakeGeminiModel
+    
+    models = {}
+    for index, name in enumerate(dict.fromkeys(routing_tiers() + [GEMINI_MODEL])):
+        model = FakeGeminiModel(name, latency=latency, seed=index)
+        models[name] = limiter.wrap(model) if limiter is not None else model
+    return models
+
+def model_clock(model) -> Callable[[], float]:
+    """
+    Relógio para medir a latência de um modelo
+    
+    Com LimitedModel, conta só o tempo da chamada (sem a espera por vaga no
+    limitador); sob congestionamento, a fila não faz um modelo parecer lento.
+    """
+    return getattr(model, "upstream_seconds", None) or time.perf_counter
+
+class RoutedAnalysis(NamedTuple):
+    """Análise com o histórico de roteamento"""
+    analysis: Dict[str, Any]
+    model: str
+    attempts: List[Dict[str, Any]]
+    reason: str
+    prescore: PreScore
+
+class LatencyTracker:
+    """Média móvel exponencial da latência observada por modelo"""
+    
+    def __init__(self, alpha: float = MODEL_ROUTING["latency_alpha"]):
+        self.alpha = alpha
+        self._latencies: Dict[str, float] = {}
+        self._observed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, model: str, seconds: float):
+        """Registra a latência de uma chamada"""
+        with self._lock:
+            previous = self._latencies.get(model)
+            value = seconds if previous is None else self.alpha * seconds + (1 - self.alpha) * previous
+            self._latencies[model] = value
+            self._observed[model] = time.monotonic()
+        REGISTRY.set_gauge("smartcv_model_latency_seconds", value, model=model)
+    
+    def get(self, model: str) -> Optional[float]:
+        """Latência média atual (None se ainda não observada)"""
+        with self._lock:
+            return self._latencies.get(model)
+    
+    def claim_probe(self, model: str, interval: float) -> bool:
+        """
+        Reserva uma chamada de sondagem para um modelo sem observações há `interval` segundos
+        
+        Um modelo evitado não recebe tráfego e sua média não mudaria mais; a
+        sondagem mede de novo. Só uma chamada por intervalo é reservada.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._observed.get(model, now) < interval:
+                return False
+            self._observed[model] = now
+            return True
+
+class ModelRouter:
+    """
+    Escolhe o modelo de cada análise e escala em cascata quando a resposta é inválida
+    
+    Os modelos são ordenados do mais barato ao mais forte. Currículos curtos e
+    típicos (pré-avaliação local confiante) começam no primeiro nível; os demais
+    começam no segundo. Níveis com latência média acima do orçamento são pulados
+    enquanto houver alternativa, exceto por uma análise de sondagem a cada
+    latency_probe_interval, que deixa o nível voltar quando se recuperar. Se a resposta não passar na validação, a mesma
+    análise é refeita no próximo nível. Com `compact`, as análises individuais
+    pedem o formato compacto de resposta (OUTPUT_CONFIG).
+    """
+    
+    def __init__(self, models: Dict[str, Any], tiers: Optional[List[str]] = None,
+                 config: Optional[Dict[str, Any]] = None, compact: Optional[bool] = None):
+        self.models = models
+        self.tiers = [tier for tier in (tiers or list(models)) if tier in models]
+        if not self.tiers:
+            raise ValueError("Nenhum modelo configurado para o roteamento")
+        self.config = {**MODEL_ROUTING, **(config or {})}
+        self.latency = LatencyTracker(self.config["latency_alpha"])
+        self.compact = OUTPUT_CONFIG["compact"] if compact is None else compact
+        self.generation_config = compact_generation_config() if self.compact else full_generation_config()
+    
+    def choose_tier(self, content: str, prescore: PreScore) -> Tuple[int, str]:
+        """
+        Decide o nível inicial de uma análise
+        
+        Args:
+            content: Texto do currículo
+            prescore: Pré-avaliação local
+            
+        Returns:
+            tuple: (índice do nível, motivo da decisão)
+        """
+        if len(self.tiers) == 1:
+            return 0, "modelo único"
+        
+        if len(content) > self.config["fast_max_chars"]:
+            start, reason = 1, "currículo longo"
+        elif prescore.confidence < self.config["fast_min_confidence"]:
+            start, reason = 1, "pré-avaliação pouco confiável"
+        else:
+            start, reason = 0, "currículo curto e típico"
+        
+        # Evitar níveis degradados enquanto houver outro dentro do orçamento
+        budget = self.config["latency_budget"]
+        for index in range(start, len(self.tiers)):
+            latency = self.latency.get(self.tiers[index])
+            if latency is None or latency <= budget:
+                if index != start:
+                    reason += f"; {self.tiers[start]} lento"
+                return index, reason
+            if self.latency.claim_probe(self.tiers[index], self.config["latency_probe_interval"]):
+                return index, f"{reason}; sondagem de {self.tiers[index]}"
+        return start, reason
+    
+    def analyze(self, content: str) -> RoutedAnalysis:
+        """
+        Analisa o currículo escalando de nível enquanto a resposta for inválida
+        
+        Args:
+            content: Texto do currículo
+            
+        Returns:
+            RoutedAnalysis: Análise válida e o histórico de tentativas
+            
+        Raises:
+            AnalysisError: Se nenhum nível produzir uma resposta válida
+        """
+        with span("route_model"):
+            prescore = local_prescore(content)
+            start, reason = self.choose_tier(content, prescore)
+        REGISTRY.increment("smartcv_router_decisions_total", model=self.tiers[start])
+        
+        attempts: List[Dict[str, Any]] = []
+        last_error: Optional[AnalysisError] = None
+        for index in range(start, len(self.tiers)):
+            name = self.tiers[index]
+            clock = model_clock(self.models[name])
+            begin = clock()
+            try:
+                analysis = analyze_content(self.models[name], content, self.generation_config, self.compact)
+            except AnalysisError as e:
+                self.latency.observe(name, clock() - begin)
+                attempts.append({"model": name, "ok": False, "error": str(e)})
+                last_error = e
+                if index + 1 < len(self.tiers):
+                    REGISTRY.increment("smartcv_router_escalations_total", source=name, target=self.tiers[index + 1])
+                continue
+            self.latency.observe(name, clock() - begin)
+            attempts.append({"model": name, "ok": True})
+            return RoutedAnalysis(analysis, name, attempts, reason, prescore)
+        
+        raise last_error
+    
+    def _plan_packs(self, contents: List[str], prescores: List[PreScore]) -> Tuple[List[Tuple[int, List[int]]], List[int]]:
+        """
+        Agrupa os currículos curtos por nível inicial respeitando os limites de PACKING_CONFIG
+        
+        Returns:
+            tuple: (lotes como (nível, índices), índices analisados individualmente)
+        """
+        config = PACKING_CONFIG
+        by_tier: Dict[int, List[int]] = {}
+        singles: List[int] = []
+        for index, (content, prescore) in enumerate(zip(contents, prescores)):
+            if len(content) > config["max_item_chars"]:
+                singles.append(index)
+                continue
+            by_tier.setdefault(self.choose_tier(content, prescore)[0], []).append(index)
+        
+        packs: List[Tuple[int, List[int]]] = []
+        for tier, indexes in by_tier.items():
+            current: List[int] = []
+            total = 0
+            for index in indexes:
+                size = len(contents[index])
+                if current and (len(current) >= config["max_items"] or total + size > config["max_total_chars"]):
+                    packs.append((tier, current))
+                    current, total = [], 0
+                current.append(index)
+                total += size
+            if current:
+                packs.append((tier, current))
+        
+        # Um lote com um único currículo é apenas uma chamada individual
+        singles.extend(indexes[0] for _, indexes in packs if len(indexes) == 1)
+        return [pack for pack in packs if len(pack[1]) > 1], sorted(singles)
+    
+    def analyze_many(self, contents: List[str]) -> List[Union[RoutedAnalysis, Exception]]:
+        """
+        Analisa vários currículos, enviando os curtos em lotes de uma única chamada
+        
+        Cada item do lote é validado separadamente; os que falharem são
+        refeitos individualmente (com a escalada normal entre níveis).
+        
+        Args:
+            contents: Textos dos currículos
+            
+        Returns:
+            list: Para cada currículo, a análise roteada ou a exceção que a impediu
+        """
+        results: List[Union[RoutedAnalysis, Exception, None]] = [None] * len(contents)
+        if PACKING_CONFIG["enabled"] and len(contents) > 1:
+            with span("route_model"):
+                prescores = [local_prescore(content) for content in contents]
+                packs, singles = self._plan_packs(contents, prescores)
+        else:
+            prescores, packs, singles = [], [], list(range(len(contents)))
+        
+        for tier, indexes in packs:
+            name = self.tiers[tier]
+            REGISTRY.increment("smartcv_packed_requests_total", model=name)
+            clock = model_clock(self.models[name])
+            begin = clock()
+            try:
+                items = analyze_packed(self.models[name], [contents[index] for index in indexes])
+            except AnalysisError as e:
+                items = [e] * len(indexes)
+            except Exception as e:
+                # Falha da chamada (ex.: 429): nenhum item é refeito agora
+                for index in indexes:
+                    results[index] = e
+                continue
+            self.latency.observe(name, clock() - begin)
+            for index, item in zip(indexes, items):
+                if isinstance(item, AnalysisError):
+                    REGISTRY.increment("smartcv_packed_items_total", status="fallback")
+                    singles.append(index)
+                    continue
+                REGISTRY.increment("smartcv_packed_items_total", status="ok")
+                attempts = [{"model": name, "ok": True, "packed": len(indexes)}]
+                results[index] = RoutedAnalysis(item, name, attempts, f"lote de {len(indexes)}", prescores[index])
+        
+        for index in singles:
+            try:
+                results[index] = self.analyze(contents[index])
+            except Exception as e:
+                results[index] = e
+        return results
@@ -0,0 +1,233 @@
+"""
+Escalonador de análises com classes de prioridade, prazos e descarte de carga
+"""
+
+import time
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, Callable, Deque
+
+from config import SCHEDULER_CONFIG
+from metrics import REGISTRY, current_trace
+from profiler import follow_thread
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_REANALYSIS = "reanalysis"
+PRIORITY_SPECULATIVE = "speculative"  # Análise antecipada no upload (pode ser descartada)
+
+# Da maior para a menor prioridade (ordem usada no descarte de carga; o índice é gravado na fila de trabalhos)
+PRIORITIES = [PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_REANALYSIS, PRIORITY_SPECULATIVE]
+
+REGISTRY.describe("smartcv_scheduler_queue_depth", "gauge", "Análises aguardando por classe de prioridade")
+REGISTRY.describe("smartcv_scheduler_wait_seconds", "histogram", "Tempo em fila por classe de prioridade")
+REGISTRY.describe("smartcv_scheduler_shed_total", "counter", "Análises descartadas por excesso de fila")
+REGISTRY.describe("smartcv_scheduler_deadline_missed_total", "counter", "Análises expiradas antes de executar")
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar("smartcv_priority", default=PRIORITY_INTERACTIVE)
+
+def current_priority() -> str:
+    """Classe de prioridade da análise em execução na thread atual"""
+    return _current_priority.get()
+
+@contextmanager
+def priority_context(priority: str):
+    """
+    Define a classe de prioridade das chamadas feitas fora do escalonador
+    
+    Args:
+        priority: Classe de prioridade (ver PRIORITIES)
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Prioridade inválida: {priority}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+class LoadShedError(Exception):
+    """A análise foi descartada porque a fila está cheia"""
+
+class DeadlineExceededError(Exception):
+    """O prazo da análise venceu antes de ela começar"""
+
+class _Job:
+    """Análise enfileirada"""
+    
+    __slots__ = ("args", "kwargs", "priority", "deadline", "future", "context", "submitted_at")
+    
+    def __init__(self, args, kwargs, priority: str, deadline: Optional[float]):
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.deadline = deadline
+        self.future: Future = Future()
+        self.context = contextvars.copy_context()
+        self.submitted_at = time.monotonic()
+
+class AnalysisScheduler:
+    """
+    Fila de análises com compartilhamento ponderado entre classes de prioridade
+    
+    As classes são atendidas por stride scheduling: cada despacho avança o
+    "passo" da classe em 1/peso, e a classe com fila e menor passo é a próxima.
+    Parte dos workers fica reservada para análises interativas, de modo que um
+    lote grande nunca ocupa todas as vagas. Quando a fila passa do limite, o
+    trabalho mais recente da menor prioridade é descartado.
+    """
+    
+    def __init__(self, handler: Callable[..., Any], workers: Optional[int] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        self.handler = handler
+        self.config = {**SCHEDULER_CONFIG, **(config or {})}
+        self.workers = workers or self.config["workers"]
+        self.reserved = min(self.config["reserved_interactive"], self.workers - 1)
+        
+        self._queues: Dict[str, Deque[_Job]] = {priority: deque() for priority in PRIORITIES}
+        self._passes: Dict[str, float] = {priority: 0.0 for priority in PRIORITIES}
+        self._running: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        self._condition = threading.Condition()
+        self._closed = False
+        
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"smartcv-scheduler-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def submit(self, *args, priority: str = PRIORITY_INTERACTIVE, deadline: Optional[float] = None,
+               **kwargs) -> Future:
+        """
+        Enfileira uma análise
+        
+        Args:
+            *args: Argumentos repassados ao handler
+            priority: Classe de prioridade
+            deadline: Segundos até o prazo de início (padrão da classe se omitido)
+            **kwargs: Argumentos nomeados repassados ao handler
+        
+        Returns:
+            Future: Resultado do handler (ou LoadShedError/DeadlineExceededError)
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Prioridade inválida: {priority}")
+        if deadline is None:
+            deadline = self.config["deadlines"].get(priority)
+        job = _Job(args, kwargs, priority, time.monotonic() + deadline if deadline else None)
+        
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Escalonador encerrado")
+            if self._queued() >= self.config["max_queue"] and not self._shed_for(priority):
+                REGISTRY.increment("smartcv_scheduler_shed_total", priority=priority)
+                job.future.set_exception(LoadShedError("Fila de análises cheia, tente novamente"))
+                return job.future
+            
+            # Classe que volta a ter fila não acumula crédito do período ocioso
+            if not self._queues[priority]:
+                active = [self._passes[p] for p in PRIORITIES if self._queues[p]]
+                self._passes[priority] = max(self._passes[priority], min(active, default=0.0))
+            self._queues[priority].append(job)
+            self._update_depth(priority)
+            self._condition.notify()
+        return job.future
+    
+    def _queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+    
+    def _shed_for(self, priority: str) -> bool:
+        """Descarta o trabalho enfileirado de menor prioridade que a nova análise"""
+        for victim in reversed(PRIORITIES):
+            if victim == priority:
+                return False
+            if self._queues[victim]:
+                job = self._queues[victim].pop()
+                self._update_depth(victim)
+                REGISTRY.increment("smartcv_scheduler_shed_total", priority=victim)
+                job.future.set_exception(LoadShedError("Análise descartada para atender trabalho prioritário"))
+                return True
+        return False
+    
+    def _update_depth(self, priority: str):
+        REGISTRY.set_gauge("smartcv_scheduler_queue_depth", len(self._queues[priority]), priority=priority)
+    
+    def _next_job(self) -> Optional[_Job]:
+        """Escolhe a próxima análise (chamado com o lock adquirido)"""
+        busy_background = sum(self._running[p] for p in PRIORITIES if p != PRIORITY_INTERACTIVE)
+        background_allowed = busy_background < self.workers - self.reserved
+        
+        candidates = [
+            priority for priority in PRIORITIES
+            if self._queues[priority] and (priority == PRIORITY_INTERACTIVE or background_allowed)
+        ]
+        if not candidates:
+            return None
+        priority = min(candidates, key=lambda p: (self._passes[p], PRIORITIES.index(p)))
+        self._passes[priority] += 1.0 / self.config["weights"][priority]
+        job = self._queues[priority].popleft()
+        self._update_depth(priority)
+        return job
+    
+    def _worker(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    if self._closed:
+                        return
+                    self._condition.wait()
+                    job = self._next_job()
+                self._running[job.priority] += 1
+            
+            try:
+                self._run(job)
+            finally:
+                with self._condition:
+                    self._running[job.priority] -= 1
+                    self._condition.notify_all()
+    
+    def _run(self, job: _Job):
+        """Executa a análise no contexto de quem a enviou (trace e spans)"""
+        waited = time.monotonic() - job.submitted_at
+        REGISTRY.observe("smartcv_scheduler_wait_seconds", waited, priority=job.priority)
+        
+        if not job.future.set_running_or_notify_cancel():
+            return
+        if job.deadline is not None and time.monotonic() > job.deadline:
+            REGISTRY.increment("smartcv_scheduler_deadline_missed_total", priority=job.priority)
+            job.future.set_exception(DeadlineExceededError(f"Prazo vencido após {waited:.1f}s em fila"))
+            return
+        
+        try:
+            result = job.context.run(self._call, job, waited)
+        except BaseException as e:
+            job.future.set_exception(e)
+        else:
+            job.future.set_result(result)
+    
+    def _call(self, job: _Job, waited: float):
+        _current_priority.set(job.priority)
+        trace = current_trace()
+        if trace is not None:
+            trace.record("queue_wait", waited)
+        with follow_thread():
+            return self.handler(*job.args, **job.kwargs)
+    
+    def queue_depths(self) -> Dict[str, int]:
+        """Tamanho atual da fila por classe"""
+        with self._condition:
+            return {priority: len(queue) for priority, queue in self._queues.items()}
+    
+    def shutdown(self, wait: bool = True):
+        """Encerra os workers depois de esvaziar a fila"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
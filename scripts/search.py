@@ -0,0 +1,827 @@
+"""
+Busca textual nos currículos analisados: índice invertido com ranking BM25
+
+O índice fica em disco como segmentos imutáveis, lidos com mmap: cada
+segmento guarda, por termo, os documentos, as frequências e as posições
+(para buscas por frase) em arrays uint32 contíguos, consultados com numpy
+sem cópia. Cada currículo analisado vira um segmento pequeno; segmentos de
+tamanho parecido são fundidos em segundo plano (merge em camadas), então o
+número de segmentos cresce só com o logaritmo do número de documentos.
+
+Consultas:
+    python django             -> os dois termos (AND implícito)
+    python OR java            -> qualquer um dos termos
+    python NOT java, -java    -> exclui documentos com o termo
+    "analista de dados"       -> frase exata (palavras vazias contam posição)
+    (python OR java) sql      -> agrupamento com parênteses
+
+Os termos passam por dobra de acentos e um stemmer leve para português
+(plural e feminino), então "gestão", "gestoes" e "GESTÃO" se encontram.
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import time
+import uuid
+import struct
+import marshal
+import argparse
+import threading
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
+
+import numpy as np
+
+from config import SEARCH_CONFIG
+from storage import content_hash
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+QUERY_PATTERN = re.compile(r'-?"[^"]*"?|[()]|[^\s()"]+')
+
+# Palavras vazias (já sem acento); ocupam posição, mas não são indexadas
+STOPWORDS = frozenset("""
+    a o as os um uma uns umas de do da dos das em no na nos nas por pelo pela pelos pelas para pra com sem
+    e ou que se ao aos sua seu suas seus como mais mas ja foi ser ter the of and or to in on for with an at by
+""".split())
+
+# Versão da análise léxica gravada no manifesto (mudou -> reindexar)
+ANALYZER_VERSION = 1
+
+# Posições acima deste limite não são indexadas (chave de frase = documento << 20 | posição)
+POSITION_BITS = 20
+MAX_POSITIONS = 1 << POSITION_BITS
+
+SEGMENT_MAGIC = b"SCVSEG01"
+# Rodapé: magic, documentos, offset da tabela de documentos, offset do dicionário de termos
+SEGMENT_FOOTER = struct.Struct("<8sQQQ")
+
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = "index.lock"
+
+def fold(text: str) -> str:
+    """Minúsculas e sem acentos ("Gestão" -> "gestao")"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+# Sufixos de plural (RSLP simplificado), do mais longo ao mais curto
+_PLURAL_SUFFIXES = (("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("res", "r"), ("zes", "z"), ("ns", "m"))
+
+# Sufixos de feminino
+_FEMININE_SUFFIXES = (("eira", "eiro"), ("ora", "or"), ("ada", "ado"), ("ida", "ido"), ("iva", "ivo"),
+                      ("osa", "oso"), ("ica", "ico"), ("ina", "ino"))
+
+def stem(word: str) -> str:
+    """
+    Stemmer leve para português (plural e feminino), aplicado a palavras sem acento
+    
+    Conservador de propósito: junta variações de número e gênero
+    ("analistas", "desenvolvedoras" -> "analista", "desenvolvedor") sem
+    confundir palavras de sentidos diferentes. Plurais em inglês ("skills")
+    também perdem o "s".
+    """
+    if len(word) > 3 and word.endswith("s"):
+        for suffix, replacement in _PLURAL_SUFFIXES:
+            if word.endswith(suffix) and len(word) >= len(suffix) + 2:
+                word = word[:-len(suffix)] + replacement
+                break
+        else:
+            if not word.endswith(("ss", "us", "is")):
+                word = word[:-1]
+    if len(word) > 5:
+        for suffix, replacement in _FEMININE_SUFFIXES:
+            if word.endswith(suffix):
+                return word[:-len(suffix)] + replacement
+    return word
+
+@lru_cache(maxsize=200_000)
+def normalize_token(token: str) -> Optional[str]:
+    """Termo indexado de uma palavra (None para palavras vazias)"""
+    folded = fold(token)
+    if folded in STOPWORDS:
+        return None
+    return stem(folded)
+
+def analyze(text: str) -> List[Tuple[int, str]]:
+    """
+    Divide o texto em termos com a posição de cada um
+    
+    Args:
+        text: Texto do currículo ou da consulta
+    
+    Returns:
+        list: Pares (posição, termo); palavras vazias avançam a posição
+    """
+    terms = []
+    for position, token in enumerate(TOKEN_PATTERN.findall(text)):
+        term = normalize_token(token)
+        if term is not None:
+            terms.append((position, term))
+    return terms
+
+class Segment:
+    """Segmento imutável do índice, mapeado em memória"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        footer_start = len(self._mm) - SEGMENT_FOOTER.size
+        magic, self.doc_count, docs_offset, terms_offset = SEGMENT_FOOTER.unpack_from(self._mm, footer_start)
+        if magic != SEGMENT_MAGIC:
+            raise ValueError(f"Segmento inválido: {path}")
+        self.lengths = np.frombuffer(self._mm, dtype=np.uint32, count=self.doc_count, offset=docs_offset)
+        # V32 e não S32: bytes brutos, sem descartar zeros no fim do hash
+        self.keys = np.frombuffer(self._mm, dtype="V32", count=self.doc_count, offset=docs_offset + 4 * self.doc_count)
+        # termo -> (offset, documentos, posições)
+        self.terms: Dict[str, Tuple[int, int, int]] = marshal.loads(self._mm[terms_offset:footer_start])
+    
+    def document_frequency(self, term: str) -> int:
+        entry = self.terms.get(term)
+        return entry[1] if entry else 0
+    
+    def postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Documentos (ordenados) e frequências do termo, sem cópia"""
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        offset, df, _ = entry
+        docs = np.frombuffer(self._mm, dtype=np.uint32, count=df, offset=offset)
+        tfs = np.frombuffer(self._mm, dtype=np.uint32, count=df, offset=offset + 4 * df)
+        return docs, tfs
+    
+    def positions(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Documentos, frequências e posições (concatenadas na ordem dos documentos)"""
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        offset, df, count = entry
+        docs, tfs = self.postings(term)
+        return docs, tfs, np.frombuffer(self._mm, dtype=np.uint32, count=count, offset=offset + 8 * df)
+    
+    def close(self):
+        self.lengths = self.keys = None
+        try:
+            self._mm.close()
+        except BufferError:
+            # Arrays de uma consulta ainda apontam para o mmap; o GC fecha depois
+            pass
+
+def write_segment(path: str, lengths: List[int], keys: List[bytes], postings) -> Dict[str, int]:
+    """
+    Grava um segmento
+    
+    Args:
+        path: Arquivo de destino (gravado em temporário e renomeado)
+        lengths: Número de termos de cada documento
+        keys: Hash SHA-256 (32 bytes) de cada documento
+        postings: Iterável de (termo, documentos, frequências, posições) em ordem de termo
+    
+    Returns:
+        dict: Documentos e total de termos do segmento (para o manifesto)
+    """
+    temp_path = f"{path}.tmp"
+    terms: Dict[str, Tuple[int, int, int]] = {}
+    with open(temp_path, 'wb') as output:
+        offset = 0
+        for term, docs, tfs, positions in postings:
+            terms[term] = (offset, len(docs), len(positions))
+            for array in (docs, tfs, positions):
+                data = np.asarray(array, dtype=np.uint32).tobytes()
+                output.write(data)
+                offset += len(data)
+        docs_offset = offset
+        output.write(np.asarray(lengths, dtype=np.uint32).tobytes())
+        output.write(b"".join(keys))
+        terms_offset = docs_offset + 4 * len(lengths) + 32 * len(keys)
+        output.write(marshal.dumps(terms))
+        output.write(SEGMENT_FOOTER.pack(SEGMENT_MAGIC, len(lengths), docs_offset, terms_offset))
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temp_path, path)
+    return {"docs": len(lengths), "tokens": int(sum(lengths))}
+
+def _document_postings(documents: List[List[Tuple[int, str]]]):
+    """Postings de documentos recém-analisados, em ordem de termo"""
+    index: Dict[str, Tuple[List[int], List[int], List[int]]] = {}
+    for doc, terms in enumerate(documents):
+        by_term: Dict[str, List[int]] = {}
+        for position, term in terms:
+            if position < MAX_POSITIONS:
+                by_term.setdefault(term, []).append(position)
+        for term, positions in by_term.items():
+            entry = index.get(term)
+            if entry is None:
+                entry = index[term] = ([], [], [])
+            entry[0].append(doc)
+            entry[1].append(len(positions))
+            entry[2].extend(positions)
+    for term in sorted(index):
+        yield (term, *index[term])
+
+class SearchHit(NamedTuple):
+    """Currículo encontrado"""
+    content_hash: str
+    score: float
+
+class SearchResult(NamedTuple):
+    """Resultado de uma consulta"""
+    total: int
+    hits: List[SearchHit]
+
+def parse_query(query: str):
+    """
+    Converte a consulta em árvore: ('term', t), ('phrase', [(offset, t)...]),
+    ('and', [...]), ('or', [...]) e ('not', nó)
+    
+    Returns:
+        Árvore da consulta ou None se não sobrar nenhum termo
+    """
+    tokens = QUERY_PATTERN.findall(query)
+    position = 0
+    
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+    
+    def word_node(text: str):
+        terms = analyze(text)
+        if not terms:
+            return None
+        if len(terms) == 1:
+            return ("term", terms[0][1])
+        start = terms[0][0]
+        return ("phrase", [(offset - start, term) for offset, term in terms])
+    
+    def parse_or():
+        nonlocal position
+        children = [parse_and()]
+        while peek() == "OR":
+            position += 1
+            children.append(parse_and())
+        children = [child for child in children if child is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else ("or", children)
+    
+    def parse_and():
+        nonlocal position
+        children = []
+        while peek() is not None and peek() not in ("OR", ")"):
+            if peek() == "AND":
+                position += 1
+                continue
+            node = parse_unary()
+            if node is not None:
+                children.append(node)
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else ("and", children)
+    
+    def parse_unary():
+        nonlocal position
+        token = peek()
+        if token is None:
+            return None  # Consulta terminada em NOT, "-" ou "("
+        position += 1
+        if token == "NOT":
+            node = parse_unary()
+            return ("not", node) if node is not None else None
+        if token == "(":
+            node = parse_or()
+            if peek() == ")":
+                position += 1
+            return node
+        if token.startswith("-") and len(token) > 1:
+            node = word_node(token[1:].strip('"'))
+            return ("not", node) if node is not None else None
+        return word_node(token.strip('"'))
+    
+    tree = parse_or()
+    while position < len(tokens):
+        # Parêntese de fechamento sobrando: continua como AND
+        position += 1
+        rest = parse_or()
+        if rest is not None:
+            tree = rest if tree is None else ("and", [tree, rest])
+    return tree
+
+def _scoring_units(node, negated: bool = False, units=None) -> List[Any]:
+    """Termos e frases que contam para o BM25 (fora de NOT)"""
+    units = [] if units is None else units
+    kind = node[0]
+    if kind == "not":
+        _scoring_units(node[1], not negated, units)
+    elif kind in ("and", "or"):
+        for child in node[1]:
+            _scoring_units(child, negated, units)
+    elif not negated:
+        key = node if kind == "term" else ("phrase", tuple(node[1]))
+        if key not in units:
+            units.append(key)
+    return units
+
+class _SegmentQuery:
+    """Avaliação de uma consulta em um segmento"""
+    
+    def __init__(self, segment: Segment):
+        self.segment = segment
+        self._phrases: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+    
+    def all_docs(self) -> np.ndarray:
+        return np.arange(self.segment.doc_count, dtype=np.uint32)
+    
+    def phrase(self, terms) -> Tuple[np.ndarray, np.ndarray]:
+        """Documentos com a frase e quantas vezes ela aparece em cada um"""
+        key = tuple(terms)
+        if key in self._phrases:
+            return self._phrases[key]
+        matches = None
+        for offset, term in key:
+            postings = self.segment.positions(term)
+            if postings is None:
+                matches = np.empty(0, dtype=np.uint64)
+                break
+            docs, tfs, positions = postings
+            shifted = positions.astype(np.int64) - offset
+            valid = shifted >= 0
+            keys = (np.repeat(docs.astype(np.uint64), tfs) << np.uint64(POSITION_BITS)) | shifted.clip(0).astype(np.uint64)
+            keys = keys[valid]
+            matches = keys if matches is None else np.intersect1d(matches, keys, assume_unique=True)
+            if matches.size == 0:
+                break
+        docs, counts = np.unique(matches >> np.uint64(POSITION_BITS), return_counts=True)
+        result = (docs.astype(np.uint32), counts.astype(np.uint32))
+        self._phrases[key] = result
+        return result
+    
+    def evaluate(self, node) -> np.ndarray:
+        """Documentos (ordenados, únicos) que satisfazem o nó"""
+        kind = node[0]
+        if kind == "term":
+            postings = self.segment.postings(node[1])
+            return postings[0] if postings is not None else np.empty(0, dtype=np.uint32)
+        if kind == "phrase":
+            return self.phrase(node[1])[0]
+        if kind == "not":
+            return np.setdiff1d(self.all_docs(), self.evaluate(node[1]), assume_unique=True)
+        if kind == "or":
+            result = np.empty(0, dtype=np.uint32)
+            for child in node[1]:
+                result = np.union1d(result, self.evaluate(child))
+            return result
+        # AND: intersecta os positivos do menor para o maior e depois remove os negativos
+        positives = [self.evaluate(child) for child in node[1] if child[0] != "not"]
+        negatives = [child[1] for child in node[1] if child[0] == "not"]
+        if positives:
+            positives.sort(key=len)
+            result = positives[0]
+            for docs in positives[1:]:
+                if result.size == 0:
+                    break
+                result = np.intersect1d(result, docs, assume_unique=True)
+        else:
+            result = self.all_docs()
+        for negative in negatives:
+            if result.size == 0:
+                break
+            result = np.setdiff1d(result, self.evaluate(negative), assume_unique=True)
+        return result
+    
+    def unit_postings(self, unit) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if unit[0] == "term":
+            return self.segment.postings(unit[1])
+        return self.phrase(unit[1])
+
+class SearchIndex:
+    """
+    Índice invertido persistente dos currículos analisados
+    
+    O manifesto (JSON, trocado de forma atômica) lista os segmentos válidos;
+    gravações de processos diferentes (app, worker, watcher) são serializadas
+    por uma trava de arquivo, e cada processo recarrega o manifesto quando ele
+    muda. A fusão de segmentos lê apenas arquivos imutáveis e só troca o
+    manifesto se os segmentos fundidos ainda estiverem nele.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.config = {**SEARCH_CONFIG, **(config or {})}
+        self.directory = directory or self.config["index_dir"]
+        os.makedirs(self.directory, exist_ok=True)
+        self._manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+        self._lock = threading.RLock()
+        self._segments: Dict[str, Segment] = {}
+        self._manifest: Dict[str, Any] = {"analyzer": ANALYZER_VERSION, "segments": []}
+        self._manifest_stamp = None
+        self._keys: Optional[set] = None
+        self._merging = False
+        self._reload()
+    
+    @contextmanager
+    def _write_lock(self):
+        """Trava de escrita entre threads e entre processos"""
+        with self._lock:
+            with open(os.path.join(self.directory, LOCK_NAME), 'a+') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _reload(self, retries: int = 3):
+        """Relê o manifesto se outro processo (ou thread) o alterou"""
+        with self._lock:
+            try:
+                stat = os.stat(self._manifest_path)
+            except FileNotFoundError:
+                return
+            stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            if stamp == self._manifest_stamp:
+                return
+            with open(self._manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("analyzer") != ANALYZER_VERSION:
+                raise ValueError("Índice criado com outra versão da análise léxica; apague a pasta e reindexe")
+            names = {entry['name'] for entry in manifest['segments']}
+            opened = {}
+            try:
+                for name in names - set(self._segments):
+                    opened[name] = Segment(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                # Outro processo fundiu e apagou o segmento depois deste manifesto: relê
+                for segment in opened.values():
+                    segment.close()
+                if retries == 0:
+                    raise
+                return self._reload(retries - 1)
+            for name in list(self._segments):
+                if name not in names:
+                    self._segments.pop(name).close()
+                    self._keys = None
+            for name, segment in opened.items():
+                self._segments[name] = segment
+                if self._keys is not None:
+                    self._keys.update(segment.keys.tolist())
+            self._manifest = manifest
+            self._manifest_stamp = stamp
+    
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        temp_path = f"{self._manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._manifest_path)
+        self._reload()
+    
+    def _known_keys(self) -> set:
+        if self._keys is None:
+            self._keys = set()
+            for segment in self._segments.values():
+                self._keys.update(segment.keys.tolist())
+        return self._keys
+    
+    def add(self, content: str, key: Optional[str] = None) -> bool:
+        """
+        Indexa um currículo (idempotente pelo hash do texto)
+        
+        Args:
+            content: Texto limpo do currículo
+            key: Hash do conteúdo (padrão: storage.content_hash)
+        
+        Returns:
+            bool: True se o currículo entrou no índice agora
+        """
+        return self.add_many([(content, key)]) == 1
+    
+    def add_many(self, items: List[Tuple[str, Optional[str]]]) -> int:
+        """
+        Indexa vários currículos em um único segmento
+        
+        Args:
+            items: Pares (texto, hash ou None)
+        
+        Returns:
+            int: Currículos novos indexados
+        """
+        prepared = {}
+        for content, key in items:
+            digest = bytes.fromhex(key or content_hash(content))
+            if digest not in prepared:
+                prepared[digest] = content
+        with self._write_lock():
+            self._reload()
+            known = self._known_keys()
+            new = [(digest, content) for digest, content in prepared.items() if digest not in known]
+            if not new:
+                return 0
+            documents = [analyze(content) for _, content in new]
+            name = f"seg-{uuid.uuid4().hex[:16]}.idx"
+            stats = write_segment(
+                os.path.join(self.directory, name),
+                [len(terms) for terms in documents],
+                [digest for digest, _ in new],
+                _document_postings(documents)
+            )
+            manifest = {**self._manifest, "segments": self._manifest['segments'] + [{"name": name, **stats}]}
+            self._save_manifest(manifest)
+        self._maybe_merge()
+        return len(new)
+    
+    def _merge_candidates(self) -> Optional[List[str]]:
+        """Segmentos da menor camada de tamanho com pelo menos merge_factor membros"""
+        factor = self.config["merge_factor"]
+        tiers: Dict[int, List[str]] = {}
+        for entry in self._manifest['segments']:
+            tier = int(math.log(max(entry['docs'], 1), factor))
+            tiers.setdefault(tier, []).append(entry['name'])
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= factor:
+                return tiers[tier]
+        return None
+    
+    def _maybe_merge(self):
+        with self._lock:
+            if self._merging or self._merge_candidates() is None:
+                return
+            self._merging = True
+        if self.config["background_merge"]:
+            threading.Thread(target=self._merge_loop, name="smartcv-search-merge", daemon=True).start()
+        else:
+            self._merge_loop()
+    
+    def _merge_loop(self):
+        try:
+            while True:
+                with self._lock:
+                    self._reload()
+                    names = self._merge_candidates()
+                if names is None:
+                    return
+                self.merge(names)
+        finally:
+            with self._lock:
+                self._merging = False
+    
+    def merge(self, names: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Funde segmentos em um só (todos, se names for omitido)
+        
+        Documentos repetidos (gravados por dois processos ao mesmo tempo)
+        ficam uma única vez no segmento fundido.
+        
+        Args:
+            names: Segmentos a fundir
+        
+        Returns:
+            str: Nome do novo segmento ou None se não houve fusão
+        """
+        with self._lock:
+            self._reload()
+            names = list(names) if names is not None else [entry['name'] for entry in self._manifest['segments']]
+            segments = [self._segments[name] for name in names if name in self._segments]
+        if len(segments) < 2:
+            return None
+        
+        seen = set()
+        lengths: List[int] = []
+        keys: List[bytes] = []
+        remaps = []
+        for segment in segments:
+            remap = np.full(segment.doc_count, -1, dtype=np.int64)
+            for doc, key in enumerate(segment.keys.tolist()):
+                if key not in seen:
+                    seen.add(key)
+                    remap[doc] = len(keys)
+                    keys.append(key)
+                    lengths.append(int(segment.lengths[doc]))
+            remaps.append(remap)
+        
+        def merged_postings():
+            for term in sorted(set().union(*(segment.terms for segment in segments))):
+                parts = []
+                for segment, remap in zip(segments, remaps):
+                    postings = segment.positions(term)
+                    if postings is None:
+                        continue
+                    docs, tfs, positions = postings
+                    new_docs = remap[docs]
+                    keep = new_docs >= 0
+                    if not keep.all():
+                        positions = positions[np.repeat(keep, tfs)]
+                        new_docs, tfs = new_docs[keep], tfs[keep]
+                    parts.append((new_docs, tfs, positions))
+                if parts:
+                    yield (term, *(np.concatenate([part[i] for part in parts]) for i in range(3)))
+        
+        name = f"seg-{uuid.uuid4().hex[:16]}.idx"
+        path = os.path.join(self.directory, name)
+        stats = write_segment(path, lengths, keys, merged_postings())
+        
+        merged = {segment.name for segment in segments}
+        with self._write_lock():
+            self._reload()
+            current = [entry['name'] for entry in self._manifest['segments']]
+            if not merged.issubset(current):
+                # Outro processo fundiu estes segmentos antes
+                os.remove(path)
+                return None
+            remaining = [entry for entry in self._manifest['segments'] if entry['name'] not in merged]
+            self._save_manifest({**self._manifest, "segments": remaining + [{"name": name, **stats}]})
+        for old in merged:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
+        return name
+    
+    def search(self, query: str, limit: Optional[int] = None) -> SearchResult:
+        """
+        Busca currículos com ranking BM25
+        
+        Args:
+            query: Consulta (termos, "frases", AND, OR, NOT, -termo, parênteses)
+            limit: Máximo de resultados (padrão: SEARCH_CONFIG["max_results"])
+        
+        Returns:
+            SearchResult: Total de documentos encontrados e os melhores resultados
+        """
+        limit = limit or self.config["max_results"]
+        tree = parse_query(query)
+        with self._lock:
+            self._reload()
+            segments = list(self._segments.values())
+            entries = self._manifest['segments']
+        if tree is None or not segments:
+            return SearchResult(0, [])
+        
+        total_docs = sum(entry['docs'] for entry in entries)
+        average_length = max(sum(entry['tokens'] for entry in entries) / max(total_docs, 1), 1.0)
+        queries = [_SegmentQuery(segment) for segment in segments]
+        matches = [segment_query.evaluate(tree) for segment_query in queries]
+        
+        units = _scoring_units(tree)
+        idf = {}
+        for unit in units:
+            if unit[0] == "term":
+                df = sum(segment.document_frequency(unit[1]) for segment in segments)
+            else:
+                df = sum(len(segment_query.phrase(unit[1])[0]) for segment_query in queries)
+            idf[unit] = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+        
+        k1, b = self.config["k1"], self.config["b"]
+        candidates = []
+        for segment_query, docs in zip(queries, matches):
+            if docs.size == 0:
+                continue
+            norm = k1 * (1 - b + b * segment_query.segment.lengths[docs].astype(np.float64) / average_length)
+            scores = np.zeros(docs.size, dtype=np.float64)
+            for unit in units:
+                postings = segment_query.unit_postings(unit)
+                if postings is None or postings[0].size == 0:
+                    continue
+                unit_docs, tfs = postings
+                found = np.searchsorted(unit_docs, docs).clip(max=unit_docs.size - 1)
+                tf = np.where(unit_docs[found] == docs, tfs[found], 0).astype(np.float64)
+                scores += idf[unit] * tf * (k1 + 1) / (tf + norm)
+            if docs.size > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                docs, scores = docs[top], scores[top]
+            keys = segment_query.segment.keys[docs]
+            candidates.extend(zip(scores.tolist(), keys.tolist()))
+        
+        hits: Dict[bytes, float] = {}
+        for score, key in sorted(candidates, key=lambda item: -item[0]):
+            if key not in hits:
+                hits[key] = score
+            if len(hits) == limit:
+                break
+        total = sum(int(docs.size) for docs in matches)
+        return SearchResult(total, [SearchHit(key.hex(), round(score, 4)) for key, score in hits.items()])
+    
+    def stats(self) -> Dict[str, Any]:
+        """Documentos, segmentos e tamanho do índice em disco"""
+        with self._lock:
+            self._reload()
+            entries = self._manifest['segments']
+            size = sum(os.path.getsize(segment.path) for segment in self._segments.values())
+        documents = sum(entry['docs'] for entry in entries)
+        return {
+            "documents": documents,
+            "segments": len(entries),
+            "terms_per_document": round(sum(entry['tokens'] for entry in entries) / max(documents, 1), 1),
+            "bytes": size
+        }
+    
+    def count(self) -> int:
+        """Número de currículos indexados"""
+        return self.stats()["documents"]
+    
+    def close(self):
+        """Libera os segmentos mapeados"""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments = {}
+            self._manifest_stamp = None
+
+def run_benchmark(documents: int, directory: str, queries: List[str], seed: int = 7) -> Dict[str, Any]:
+    """
+    Indexa currículos sintéticos e mede o tempo das consultas
+    
+    Args:
+        documents: Currículos a indexar
+        directory: Pasta (vazia) do índice
+        queries: Consultas medidas
+        seed: Semente do corpus
+    
+    Returns:
+        dict: Tempos de indexação e p50/p95 por consulta (ms)
+    """
+    import random
+    from benchmark import summarize
+    from corpus import generate_cv_lines
+    
+    rng = random.Random(seed)
+    index = SearchIndex(directory, {"background_merge": False})
+    start = time.perf_counter()
+    batch = []
+    for number in range(documents):
+        text = "\n".join(generate_cv_lines(rng, 1))
+        batch.append((text, content_hash(f"{number}:{text}")))
+        if len(batch) == 1000:
+            index.add_many(batch)
+            batch = []
+    if batch:
+        index.add_many(batch)
+    indexing = time.perf_counter() - start
+    
+    results = {}
+    for query in queries:
+        durations = []
+        for _ in range(20):
+            start = time.perf_counter()
+            result = index.search(query)
+            durations.append(time.perf_counter() - start)
+        results[query] = {**summarize(durations), "total": result.total}
+    return {"documents": documents, "indexing_seconds": round(indexing, 1), **index.stats(), "queries": results}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Linha de comando: consultas, estatísticas, fusão e benchmark do índice"""
+    parser = argparse.ArgumentParser(description="Busca textual nos currículos analisados")
+    parser.add_argument("query", nargs="?", help='Consulta, ex.: \'python "analista de dados" -estágio\'')
+    parser.add_argument("--index", default=SEARCH_CONFIG["index_dir"], help="Pasta do índice")
+    parser.add_argument("--db", default=None, help="Banco das análises (para mostrar arquivo e notas)")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--stats", action="store_true", help="Mostra o tamanho do índice")
+    parser.add_argument("--optimize", action="store_true", help="Funde todos os segmentos em um")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Indexa N currículos sintéticos em uma pasta temporária")
+    args = parser.parse_args(argv)
+    
+    if args.benchmark:
+        import tempfile
+        queries = ["python", "python sql", '"analista de dados"', "(python OR java) -financeiro", '"gerente de projetos" dashboards']
+        with tempfile.TemporaryDirectory(prefix="smartcv-search-") as directory:
+            report = run_benchmark(args.benchmark, directory, queries)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    
+    index = SearchIndex(args.index)
+    if args.optimize:
+        merged = index.merge()
+        print(f"Segmentos fundidos em {merged}" if merged else "Nada a fundir")
+    if args.stats or not args.query:
+        print(json.dumps(index.stats(), indent=2))
+    if args.query:
+        start = time.perf_counter()
+        result = index.search(args.query, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{result.total} currículo(s) em {elapsed:.1f} ms")
+        records = {}
+        if result.hits:
+            from storage import AnalysisStore
+            store = AnalysisStore(args.db)
+            records = store.latest_by_content_hash([hit.content_hash for hit in result.hits])
+            store.close()
+        for position, hit in enumerate(result.hits, 1):
+            record = records.get(hit.content_hash)
+            label = f"{record['filename'] or '—'} (análise {record['id']}, nota {record['overall_score']:.0f})" if record else hit.content_hash[:16]
+            print(f"{position:>3}. {hit.score:7.3f}  {label}")
+    index.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Análise antecipada: a chamada ao modelo começa no upload, antes do clique
+
+Assim que o arquivo enviado é validado, a análise é enfileirada no
+escalonador com a prioridade mais baixa (speculative). No clique em
+"Analisar", o resultado em andamento (ou pronto) é aproveitado; se a análise
+ainda estiver na fila, ela é cancelada e reenviada como interativa.
+
+Trocar de arquivo cancela a análise antecipada. Se a chamada já tinha
+começado, ela conta como desperdiçada: há teto por sessão (na interface) e
+por hora no processo (SpeculationGate), além de um limite de análises
+antecipadas simultâneas.
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, Callable, Deque
+
+from config import SPECULATION_CONFIG
+from metrics import REGISTRY
+
+REGISTRY.describe("smartcv_speculative_total", "counter", "Análises antecipadas por desfecho")
+REGISTRY.describe("smartcv_speculative_head_start_seconds", "histogram",
+                  "Tempo entre o início da análise antecipada e o clique que a aproveitou")
+
+class Speculation:
+    """Análise antecipada de um currículo (guardada na sessão)"""
+    
+    def __init__(self, key: str, future: Future):
+        self.key = key
+        self.future = future
+        self.started_at = time.monotonic()
+    
+    def claim(self) -> Optional[Future]:
+        """
+        Aproveita a análise no clique
+        
+        Returns:
+            Future da análise em andamento ou concluída com sucesso; None se
+            ela ainda estava na fila (cancelada, para reenvio como interativa)
+            ou falhou
+        """
+        if self.future.cancel():
+            REGISTRY.increment("smartcv_speculative_total", outcome="requeued")
+            return None
+        if self.future.done() and self.future.exception() is not None:
+            REGISTRY.increment("smartcv_speculative_total", outcome="failed")
+            return None
+        REGISTRY.increment("smartcv_speculative_total", outcome="used")
+        REGISTRY.observe("smartcv_speculative_head_start_seconds", time.monotonic() - self.started_at)
+        return self.future
+    
+    def discard(self) -> bool:
+        """
+        Descarta a análise (arquivo trocado ou removido)
+        
+        Returns:
+            bool: True se a chamada ao modelo já tinha começado (desperdiçada)
+        """
+        if self.future.cancel():
+            REGISTRY.increment("smartcv_speculative_total", outcome="cancelled")
+            return False
+        REGISTRY.increment("smartcv_speculative_total", outcome="wasted")
+        return True
+
+class SpeculationGate:
+    """Limites do processo para as análises antecipadas (compartilhado entre sessões)"""
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = {**SPECULATION_CONFIG, **(config or {})}
+        self.inflight = 0
+        self._wasted: Deque[float] = deque()
+        self._lock = threading.Lock()
+    
+    def _wasted_last_hour(self, now: float) -> int:
+        while self._wasted and now - self._wasted[0] > 3600:
+            self._wasted.popleft()
+        return len(self._wasted)
+    
+    def start(self, key: str, submit: Callable[[], Future]) -> Optional[Speculation]:
+        """
+        Inicia uma análise antecipada se houver folga
+        
+        Args:
+            key: Hash do conteúdo do currículo
+            submit: Envia a análise ao escalonador e retorna o Future
+        
+        Returns:
+            Speculation ou None se o limite de simultâneas ou de desperdício foi atingido
+        """
+        with self._lock:
+            if (self.inflight >= self.config["max_inflight"]
+                    or self._wasted_last_hour(time.monotonic()) >= self.config["max_wasted_per_hour"]):
+                REGISTRY.increment("smartcv_speculative_total", outcome="skipped")
+                return None
+            self.inflight += 1
+        
+        try:
+            future = submit()
+        except Exception:
+            self._finished(None)
+            raise
+        future.add_done_callback(self._finished)
+        REGISTRY.increment("smartcv_speculative_total", outcome="started")
+        return Speculation(key, future)
+    
+    def _finished(self, _future):
+        with self._lock:
+            self.inflight -= 1
+    
+    def record_wasted(self):
+        """Conta uma análise antecipada desperdiçada no teto por hora"""
+        with self._lock:
+            self._wasted.append(time.monotonic())
@@ -0,0 +1,139 @@
+"""
+Benchmark de inicialização a frio do SmartCV
+
+Mede, em processos Python novos:
+- o custo de importação de app.py por módulo (python -X importtime)
+- o tempo até a primeira execução completa da página (AppTest, sem navegador)
+
+Uso:
+    python startup_benchmark.py                          # grava benchmarks/startup.json
+    python startup_benchmark.py --runs 5 --top 15
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Dict, Any, List
+
+from benchmark import git_commit
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+FIRST_RUN_SNIPPET = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file('app.py', default_timeout=120).run()
+elapsed = time.perf_counter() - start
+if app.exception:
+    raise SystemExit(str(app.exception))
+print(elapsed)
+"""
+
+def _python_env() -> Dict[str, str]:
+    """Ambiente dos subprocessos (chave falsa para não depender de secrets)"""
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "startup-benchmark")
+    env.setdefault("SMARTCV_METRICS", "0")
+    env["PYTHONDONTWRITEBYTECODE"] = "0"
+    return env
+
+def measure_import(top: int) -> Dict[str, Any]:
+    """
+    Mede o custo de importar app.py com -X importtime
+    
+    Args:
+        top: Quantidade de módulos mais caros a reportar
+        
+    Returns:
+        dict: Tempo total e imports diretos de app.py mais caros (ms, cumulativo)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=SCRIPTS_DIR, env=_python_env(), capture_output=True, text=True, check=True
+    )
+    # A árvore do importtime lista os filhos antes do pai, com 2 espaços por nível
+    children: List[Dict[str, Any]] = []
+    app_import_ms = None
+    modules: List[Dict[str, Any]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entry = {"module": name.strip(), "cumulative_ms": int(parts[1]) / 1000}
+        if depth == 1:
+            children.append(entry)
+        elif depth == 0:
+            if entry["module"] == "app":
+                app_import_ms = entry["cumulative_ms"]
+                modules = children
+            children = []
+    
+    modules.sort(key=lambda m: m["cumulative_ms"], reverse=True)
+    return {
+        "app_import_ms": app_import_ms,
+        "top_modules": modules[:top]
+    }
+
+def measure_first_run(runs: int) -> Dict[str, Any]:
+    """
+    Mede o tempo até a primeira execução completa da página em processos novos
+    
+    Args:
+        runs: Quantidade de processos a medir
+        
+    Returns:
+        dict: Mediana, mínimo e máximo (ms)
+    """
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_RUN_SNIPPET],
+            cwd=SCRIPTS_DIR, env=_python_env(), capture_output=True, text=True, check=True
+        )
+        samples.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+    return {
+        "runs": runs,
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização a frio do SmartCV")
+    parser.add_argument("--runs", type=int, default=3, help="Processos medidos para a primeira execução")
+    parser.add_argument("--top", type=int, default=10, help="Módulos mais caros a reportar")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "startup.json"))
+    args = parser.parse_args()
+    
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": sys.version.split()[0]
+        },
+        "import": measure_import(args.top),
+        "first_run": measure_first_run(args.runs)
+    }
+    
+    print(f"Importação de app.py: {report['import']['app_import_ms']:.0f} ms")
+    for module in report['import']['top_modules']:
+        print(f"  {module['module']:<28}{module['cumulative_ms']:>10.1f} ms")
+    print(f"Primeira execução da página (mediana de {args.runs}): {report['first_run']['median_ms']:.0f} ms")
+    
+    output = os.path.join(SCRIPTS_DIR, args.output) if not os.path.isabs(args.output) else args.output
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as output_file:
+        json.dump(report, output_file, ensure_ascii=False, indent=2)
+    print(f"📄 Resultado gravado em {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""
+Armazenamento persistente das análises do SmartCV
+"""
+
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
+
+from analysis_model import FORMAT_MARSHAL, FORMAT_MARSHAL_ZLIB, Analysis
+from config import STORAGE_CONFIG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash TEXT NOT NULL,
+    filename TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    overall_score REAL NOT NULL,
+    clarity_score REAL NOT NULL,
+    structure_score REAL NOT NULL,
+    keywords_score REAL NOT NULL,
+    analysis_json TEXT NOT NULL DEFAULT '',
+    source_key TEXT,
+    analysis_blob BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_content_hash ON analyses(content_hash);
+CREATE INDEX IF NOT EXISTS idx_analyses_overall ON analyses(overall_score, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_clarity ON analyses(clarity_score, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_structure ON analyses(structure_score, id);
+CREATE INDEX IF NOT EXISTS idx_analyses_keywords ON analyses(keywords_score, id);
+
+CREATE TABLE IF NOT EXISTS analysis_keywords (
+    keyword TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    analysis_id INTEGER NOT NULL REFERENCES analyses(id),
+    PRIMARY KEY (kind, keyword, analysis_id)
+) WITHOUT ROWID;
+"""
+
+# Versão do schema gravada em PRAGMA user_version
+SCHEMA_VERSION = 5
+
+# Tipos de palavra-chave indexados (atributos de Analysis.keywords)
+KEYWORD_KINDS = ['present', 'missing']
+
+# Critério de avaliação -> coluna de pontuação
+SCORE_COLUMNS = {
+    "overall": "overall_score",
+    "clarity": "clarity_score",
+    "structure": "structure_score",
+    "keywords": "keywords_score"
+}
+
+def content_hash(content: str) -> str:
+    """
+    Calcula o hash SHA-256 do conteúdo do currículo
+    
+    Args:
+        content: Texto do currículo
+    
+    Returns:
+        str: Hash hexadecimal do conteúdo
+    """
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+def normalize_keyword(keyword: str) -> str:
+    """Normaliza uma palavra-chave para indexação e busca"""
+    return " ".join(str(keyword).lower().split())
+
+class AnalysisStore:
+    """Armazena análises em SQLite (apenas o hash do currículo é guardado, nunca o texto)"""
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or STORAGE_CONFIG["db_path"]
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA journal_mode={STORAGE_CONFIG['journal_mode']}")
+        self._conn.execute("PRAGMA busy_timeout = 30000")
+        self._migrate()
+    
+    def _migrate(self):
+        """Cria o schema e atualiza bancos gravados em versões anteriores"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        self._conn.executescript(SCHEMA)
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(analyses)")}
+        if 'source_key' not in columns:
+            self._conn.execute("ALTER TABLE analyses ADD COLUMN source_key TEXT")
+        if 'analysis_blob' not in columns:
+            self._conn.execute("ALTER TABLE analyses ADD COLUMN analysis_blob BLOB")
+        # Chave de origem única: gravações repetidas do mesmo trabalho não duplicam a análise
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_analyses_source_key ON analyses(source_key) "
+            "WHERE source_key IS NOT NULL"
+        )
+        if version < 2:
+            rows = self._conn.execute("SELECT id, analysis_json FROM analyses").fetchall()
+            for row in rows:
+                self._insert_keywords(row['id'], Analysis.from_dict(json.loads(row['analysis_json'])))
+        if version < 5:
+            # Análises em JSON (até a v3) ou em marshal (v4) passam para o formato binário estável
+            rows = self._conn.execute(
+                "SELECT id, analysis_json, analysis_blob FROM analyses "
+                "WHERE analysis_blob IS NULL OR substr(analysis_blob, 1, 1) IN (?, ?)",
+                (bytes((FORMAT_MARSHAL,)), bytes((FORMAT_MARSHAL_ZLIB,)))
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE analyses SET analysis_blob = ?, analysis_json = '' WHERE id = ?",
+                [(blob, row['id']) for row in rows for blob in [_convert_blob(row)] if blob is not None]
+            )
+        if version < SCHEMA_VERSION:
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.commit()
+    
+    def _insert_keywords(self, analysis_id: int, analysis: Analysis):
+        """Indexa as palavras-chave presentes e ausentes de uma análise"""
+        rows = {
+            (normalize_keyword(keyword), kind, analysis_id)
+            for kind in KEYWORD_KINDS
+            for keyword in getattr(analysis.keywords, kind)
+            if normalize_keyword(keyword)
+        }
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO analysis_keywords (keyword, kind, analysis_id) VALUES (?, ?, ?)",
+            rows
+        )
+    
+    def save_analysis(self, analysis: Union[Analysis, Dict[str, Any]], filename: str = "", content: str = "",
+                      source_key: Optional[str] = None) -> int:
+        """
+        Grava uma análise validada
+        
+        Args:
+            analysis: Resultado da análise (tipado ou dicionário do modelo)
+            filename: Nome do arquivo analisado
+            content: Texto do currículo (usado apenas para o hash)
+            source_key: Chave idempotente da origem (ex.: id do trabalho na fila);
+                        se já existir, a análise gravada anteriormente é mantida
+        
+        Returns:
+            int: Identificador da análise gravada
+        """
+        analysis = Analysis.coerce(analysis)
+        row = (
+            content_hash(content),
+            filename or "",
+            datetime.now().isoformat(timespec="seconds"),
+            *analysis.scores,
+            analysis.to_bytes(),
+            source_key
+        )
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO analyses (content_hash, filename, created_at, overall_score,
+                                                clarity_score, structure_score, keywords_score,
+                                                analysis_json, analysis_blob, source_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, '', ?, ?)
+                """,
+                row
+            )
+            if cursor.rowcount == 0:
+                return self._conn.execute(
+                    "SELECT id FROM analyses WHERE source_key = ?", (source_key,)
+                ).fetchone()[0]
+            self._insert_keywords(cursor.lastrowid, analysis)
+            self._conn.commit()
+            return cursor.lastrowid
+    
+    def get_analysis(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Busca uma análise pelo identificador
+        
+        Args:
+            analysis_id: Identificador da análise
+        
+        Returns:
+            dict: Registro da análise ou None se não existir
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+        return _row_to_record(row) if row else None
+    
+    def find_by_source(self, source_key: str) -> Optional[int]:
+        """
+        Busca a análise gravada para uma chave de origem
+        
+        Args:
+            source_key: Chave idempotente usada em save_analysis
+        
+        Returns:
+            int: Identificador da análise ou None se ainda não gravada
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM analyses WHERE source_key = ?", (source_key,)).fetchone()
+        return row[0] if row else None
+    
+    def latest_by_content_hash(self, hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Análise mais recente de cada currículo, pelo hash do texto
+        
+        Args:
+            hashes: Hashes de conteúdo (ex.: resultados da busca textual)
+        
+        Returns:
+            dict: hash -> registro (sem a análise serializada)
+        """
+        if not hashes:
+            return {}
+        columns = ", ".join(SCORE_COLUMNS.values())
+        placeholders = ",".join("?" * len(hashes))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT id, content_hash, filename, created_at, {columns} FROM analyses
+                WHERE id IN (SELECT MAX(id) FROM analyses WHERE content_hash IN ({placeholders}) GROUP BY content_hash)
+                """,
+                list(hashes)
+            ).fetchall()
+        return {row['content_hash']: dict(row) for row in rows}
+    
+    def count(self) -> int:
+        """Retorna o número de análises armazenadas"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+    
+    def _ranking_filter(self, min_scores: Optional[Dict[str, float]] = None,
+                        keywords_present: Optional[List[str]] = None,
+                        keywords_missing: Optional[List[str]] = None) -> Tuple[str, List[Any]]:
+        """Monta a cláusula WHERE dos filtros de ranking"""
+        conditions = []
+        params: List[Any] = []
+        for criterion, minimum in (min_scores or {}).items():
+            if criterion not in SCORE_COLUMNS:
+                raise ValueError(f"Critério inválido: {criterion}")
+            if minimum:
+                conditions.append(f"{SCORE_COLUMNS[criterion]} >= ?")
+                params.append(minimum)
+        
+        for kind, keywords in (('present', keywords_present), ('missing', keywords_missing)):
+            for keyword in keywords or []:
+                keyword = normalize_keyword(keyword)
+                if keyword:
+                    conditions.append(
+                        "id IN (SELECT analysis_id FROM analysis_keywords WHERE kind = ? AND keyword = ?)"
+                    )
+                    params.extend([kind, keyword])
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+    
+    def count_ranking(self, min_scores: Optional[Dict[str, float]] = None,
+                      keywords_present: Optional[List[str]] = None,
+                      keywords_missing: Optional[List[str]] = None) -> int:
+        """
+        Conta as análises que atendem aos filtros de ranking
+        
+        Args:
+            min_scores: Pontuação mínima por critério
+            keywords_present: Palavras-chave que devem constar como presentes
+            keywords_missing: Palavras-chave que devem constar como ausentes
+        
+        Returns:
+            int: Total de análises filtradas
+        """
+        where, params = self._ranking_filter(min_scores, keywords_present, keywords_missing)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM analyses {where}", params).fetchone()[0]
+    
+    def query_ranking(self, sort_by: str = "overall", descending: bool = True,
+                      min_scores: Optional[Dict[str, float]] = None,
+                      keywords_present: Optional[List[str]] = None,
+                      keywords_missing: Optional[List[str]] = None,
+                      page: int = 1, page_size: int = 25) -> List[Dict[str, Any]]:
+        """
+        Consulta paginada de análises ordenadas por critério
+        
+        Os filtros usam os índices de pontuação e de palavras-chave, e apenas a
+        página solicitada é lida do banco.
+        
+        Args:
+            sort_by: Critério de ordenação (chave de SCORE_COLUMNS)
+            descending: Ordem decrescente
+            min_scores: Pontuação mínima por critério
+            keywords_present: Palavras-chave que devem constar como presentes
+            keywords_missing: Palavras-chave que devem constar como ausentes
+            page: Página (começando em 1)
+            page_size: Registros por página
+        
+        Returns:
+            list: Registros da página (sem a análise serializada)
+        """
+        if sort_by not in SCORE_COLUMNS:
+            raise ValueError(f"Critério de ordenação inválido: {sort_by}")
+        
+        where, params = self._ranking_filter(min_scores, keywords_present, keywords_missing)
+        order = "DESC" if descending else "ASC"
+        columns = ", ".join(SCORE_COLUMNS.values())
+        offset = (max(page, 1) - 1) * page_size
+        
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT id, filename, created_at, {columns} FROM analyses {where}
+                ORDER BY {SCORE_COLUMNS[sort_by]} {order}, id {order}
+                LIMIT ? OFFSET ?
+                """,
+                params + [page_size, offset]
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def top_keywords(self, kind: str = "present", limit: int = 50) -> List[Tuple[str, int]]:
+        """
+        Retorna as palavras-chave mais frequentes de um tipo
+        
+        Args:
+            kind: 'present' ou 'missing'
+            limit: Quantidade máxima de palavras-chave
+        
+        Returns:
+            list: Tuplas (palavra-chave, número de análises)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT keyword, COUNT(*) AS total FROM analysis_keywords
+                WHERE kind = ? GROUP BY keyword ORDER BY total DESC, keyword LIMIT ?
+                """,
+                (kind, limit)
+            ).fetchall()
+        return [(row['keyword'], row['total']) for row in rows]
+    
+    def iter_batches(self, batch_size: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Percorre todas as análises em lotes, sem carregar a base inteira em memória
+        
+        Args:
+            batch_size: Quantidade de registros por lote
+        
+        Returns:
+            Iterator: Lotes de registros ordenados por id
+        """
+        batch_size = batch_size or STORAGE_CONFIG["batch_size"]
+        last_id = 0
+        while True:
+            # Paginação por chave (id) para manter custo constante por lote
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT * FROM analyses WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1]['id']
+            yield [_row_to_record(row) for row in rows]
+    
+    def iter_score_rows(self, batch_size: Optional[int] = None) -> Iterator[List[tuple]]:
+        """
+        Percorre apenas as colunas de pontuação, sem decodificar as análises
+        
+        Args:
+            batch_size: Quantidade de registros por lote
+        
+        Returns:
+            Iterator: Lotes de tuplas (id, overall, clarity, structure, keywords)
+        """
+        batch_size = batch_size or STORAGE_CONFIG["batch_size"]
+        columns = ", ".join(SCORE_COLUMNS.values())
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {columns} FROM analyses WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [tuple(row) for row in rows]
+    
+    def iter_analyses(self, batch_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Percorre todas as análises uma a uma"""
+        for batch in self.iter_batches(batch_size):
+            yield from batch
+    
+    def close(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conn.close()
+
+def _convert_blob(row: sqlite3.Row) -> Optional[bytes]:
+    """
+    Regrava a análise de uma linha antiga no formato de Analysis.to_bytes
+    
+    O resultado só é usado depois de lido de volta com sucesso; até lá o JSON
+    original fica intacto.
+    
+    Returns:
+        bytes: Nova serialização ou None se a linha não pôde ser convertida
+    """
+    try:
+        if row['analysis_blob'] is not None:
+            analysis = Analysis.from_bytes(row['analysis_blob'])
+        else:
+            analysis = Analysis.from_dict(json.loads(row['analysis_json']))
+        blob = analysis.to_bytes()
+        if Analysis.from_bytes(blob) != analysis:
+            return None
+    except (ValueError, TypeError, EOFError, KeyError, zlib.error):
+        return None
+    return blob
+
+def _row_to_record(row: sqlite3.Row) -> Dict[str, Any]:
+    """Converte uma linha do SQLite em registro com a análise decodificada"""
+    if row['analysis_blob'] is not None:
+        analysis = Analysis.from_bytes(row['analysis_blob'])
+    else:
+        analysis = Analysis.from_dict(json.loads(row['analysis_json']))
+    return {
+        "id": row['id'],
+        "content_hash": row['content_hash'],
+        "filename": row['filename'],
+        "created_at": row['created_at'],
+        "analysis": analysis
+    }
@@ -0,0 +1,50 @@
+"""
+Testes do limitador adaptativo de chamadas simultâneas
+"""
+
+import threading
+
+import pytest
+
+from concurrency import AdaptiveLimiter
+from scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE
+
+def test_interrupted_waiter_does_not_block_queue(monkeypatch):
+    limiter = AdaptiveLimiter({"initial_limit": 1, "max_limit": 1})
+    limiter.acquire()
+    
+    def interrupted_wait(timeout=None):
+        raise KeyboardInterrupt
+    
+    monkeypatch.setattr(limiter._condition, "wait", interrupted_wait)
+    with pytest.raises(KeyboardInterrupt):
+        limiter.acquire()
+    monkeypatch.undo()
+    assert limiter._waiters == []
+    
+    limiter.release(0.1)
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()), daemon=True)
+    thread.start()
+    assert acquired.wait(2.0)
+    assert limiter.inflight == 1
+
+def test_interactive_waiter_goes_first():
+    limiter = AdaptiveLimiter({"initial_limit": 1, "max_limit": 1})
+    limiter.acquire()
+    order = []
+    
+    def waiter(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+        limiter.release(0.1)
+    
+    threads = [threading.Thread(target=waiter, args=(priority,)) for priority in (PRIORITY_BATCH, PRIORITY_INTERACTIVE)]
+    for thread in threads:
+        thread.start()
+    while len(limiter._waiters) < 2:
+        threading.Event().wait(0.01)
+    limiter.release(0.1)
+    for thread in threads:
+        thread.join(2.0)
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BATCH]
@@ -0,0 +1,79 @@
+"""
+Testes da fila de trabalhos (posse, expiração e limite de tentativas)
+"""
+
+import time
+
+import pytest
+
+from jobqueue import (InMemoryJobQueue, LEASE_EXPIRED_ERROR, SQLiteJobQueue,
+                      STATUS_DONE, STATUS_FAILED, STATUS_QUEUED)
+
+SHORT_LEASE = 0.01
+
+@pytest.fixture(params=["memory", "sqlite"])
+def job_queue(request, tmp_path):
+    job_queue = InMemoryJobQueue() if request.param == "memory" else SQLiteJobQueue(str(tmp_path / "queue.db"))
+    yield job_queue
+    job_queue.close()
+
+def expire():
+    time.sleep(SHORT_LEASE * 3)
+
+def test_enqueue_is_idempotent(job_queue):
+    assert job_queue.enqueue("a", {"path": "a.pdf"})
+    assert not job_queue.enqueue("a", {"path": "a.pdf"})
+    assert job_queue.stats()[STATUS_QUEUED] == 1
+
+def test_active_lease_is_not_shared(job_queue):
+    job_queue.enqueue("a", {})
+    assert job_queue.lease("w1") is not None
+    assert job_queue.lease("w2") is None
+
+def test_expired_lease_is_reassigned(job_queue):
+    job_queue.enqueue("a", {})
+    first = job_queue.lease("w1", SHORT_LEASE)
+    expire()
+    second = job_queue.lease("w2")
+    assert second.job_id == "a"
+    assert second.attempts == 2
+    assert second.lease_token > first.lease_token
+
+def test_stale_owner_is_fenced(job_queue):
+    job_queue.enqueue("a", {})
+    first = job_queue.lease("w1", SHORT_LEASE)
+    expire()
+    second = job_queue.lease("w2")
+    assert not job_queue.heartbeat(first)
+    assert not job_queue.complete(first, {"by": "w1"})
+    assert job_queue.complete(second, {"by": "w2"})
+    record = job_queue.get("a")
+    assert record['status'] == STATUS_DONE
+    assert record['result'] == {"by": "w2"}
+
+def test_expired_leases_stop_at_max_attempts(job_queue):
+    job_queue.enqueue("a", {})
+    for _ in range(2):
+        assert job_queue.lease("w", SHORT_LEASE, max_attempts=2) is not None
+        expire()
+    assert job_queue.lease("w", SHORT_LEASE, max_attempts=2) is None
+    record = job_queue.get("a")
+    assert record['status'] == STATUS_FAILED
+    assert record['attempts'] == 2
+    assert record['error'] == LEASE_EXPIRED_ERROR
+
+def test_fail_requeues_until_max_attempts(job_queue):
+    job_queue.enqueue("a", {})
+    job = job_queue.lease("w")
+    assert job_queue.fail(job, "429", max_attempts=2)
+    assert job_queue.get("a")['status'] == STATUS_QUEUED
+    job = job_queue.lease("w")
+    assert job_queue.fail(job, "429", max_attempts=2)
+    assert job_queue.get("a")['status'] == STATUS_FAILED
+
+def test_permanent_failure_is_not_retried(job_queue):
+    job_queue.enqueue("a", {})
+    job = job_queue.lease("w")
+    assert job_queue.fail(job, "arquivo inválido", retry=False)
+    assert job_queue.get("a")['status'] == STATUS_FAILED
+    assert job_queue.lease("w") is None
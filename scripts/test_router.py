@@ -0,0 +1,51 @@
+"""
+Testes do roteamento entre modelos (latência observada e recuperação de níveis lentos)
+"""
+
+import threading
+
+from concurrency import AdaptiveLimiter
+from config import ANALYSIS_CONFIG
+from prescore import local_prescore
+from router import ModelRouter, build_fake_models
+
+CV_TEXT = (
+    "Ana Costa\n"
+    "Engenheira de software com experiência em Python, Django e AWS.\n"
+    "Experiência: Empresa Z (2018-2024) - microsserviços e filas.\n"
+    "Formação: Engenharia da Computação (2017).\n"
+)
+
+def test_latency_excludes_limiter_wait():
+    limiter = AdaptiveLimiter({"initial_limit": 1, "max_limit": 1})
+    models = build_fake_models(0.05, limiter)
+    tier = next(iter(models))
+    router = ModelRouter(models, [tier], config={"latency_alpha": 1.0})
+    threads = [threading.Thread(target=router.analyze, args=(CV_TEXT,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Com uma vaga só, as últimas chamadas esperaram ~0,15 s na fila do limitador
+    assert router.latency.get(tier) < 0.1
+
+def test_slow_tier_gets_probe():
+    models = build_fake_models(0.0)
+    tiers = list(models)[:2]
+    router = ModelRouter(models, tiers, config={"latency_budget": 1.0, "latency_probe_interval": 0.0})
+    prescore = local_prescore(CV_TEXT)._replace(confidence=1.0)
+    router.latency.observe(tiers[0], 5.0)
+    index, reason = router.choose_tier(CV_TEXT, prescore)
+    assert index == 0 and "sondagem" in reason
+
+def test_slow_tier_skipped_between_probes():
+    models = build_fake_models(0.0)
+    tiers = list(models)[:2]
+    router = ModelRouter(models, tiers, config={"latency_budget": 1.0, "latency_probe_interval": 60.0})
+    prescore = local_prescore(CV_TEXT)._replace(confidence=1.0)
+    router.latency.observe(tiers[0], 5.0)
+    assert router.choose_tier(CV_TEXT, prescore)[0] == 1
+
+def test_full_format_uses_analysis_config():
+    router = ModelRouter(build_fake_models(0.0), compact=False)
+    assert router.generation_config == {key: ANALYSIS_CONFIG[key] for key in ("temperature", "top_p", "top_k", "max_output_tokens")}
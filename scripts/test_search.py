@@ -0,0 +1,15 @@
+"""
+Testes do parser de consultas da busca textual
+"""
+
+import pytest
+
+from search import parse_query
+
+@pytest.mark.parametrize("query", ["NOT", "python NOT", "python AND NOT", "(", "python (", "-", "python -", '""', 'python ""'])
+def test_dangling_operators_do_not_crash(query):
+    tree = parse_query(query)
+    assert tree is None or tree == ("term", "python")
+
+def test_not_excludes_term():
+    assert parse_query("python NOT java") == ("and", [("term", "python"), ("not", ("term", "java"))])
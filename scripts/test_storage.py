@@ -0,0 +1,77 @@
+"""
+Testes da serialização das análises e da migração do banco
+"""
+
+import json
+import zlib
+import marshal
+import sqlite3
+
+import pytest
+
+from analysis_model import FORMAT_JSON_ZLIB, FORMAT_MARSHAL_ZLIB, Analysis
+from storage import AnalysisStore
+
+ANALYSIS = Analysis.from_dict({
+    "overallScore": 78,
+    "clarity": {"score": 80, "feedback": "Texto objetivo.", "suggestions": ["Resuma o perfil"]},
+    "structure": {"score": 75, "feedback": "Seções claras.", "suggestions": ["Datas no mesmo formato"]},
+    "keywords": {"score": 79, "present": ["python", "sql"], "missing": ["docker"], "suggestions": ["Cite nuvem"]},
+    "improvements": ["Quantifique resultados"],
+    "strengths": ["Experiência relevante"],
+    "summary": "Bom currículo."
+})
+
+def insert_legacy(db_path, version, analysis_json, analysis_blob):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        INSERT INTO analyses (content_hash, filename, created_at, overall_score, clarity_score,
+                              structure_score, keywords_score, analysis_json, analysis_blob)
+        VALUES ('h', 'cv.pdf', '2024-01-01T00:00:00', ?, ?, ?, ?, ?, ?)
+        """,
+        (*ANALYSIS.scores, analysis_json, analysis_blob)
+    )
+    conn.execute(f"PRAGMA user_version = {version}")
+    conn.commit()
+    conn.close()
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "smartcv.db")
+    AnalysisStore(path).close()
+    return path
+
+def test_stored_format_is_json():
+    data = ANALYSIS.to_bytes()
+    assert data[0] == FORMAT_JSON_ZLIB
+    assert json.loads(zlib.decompress(data[1:]))[-1] == "Bom currículo."
+    assert Analysis.from_bytes(data) == ANALYSIS
+
+def test_key_round_trip():
+    assert Analysis.from_bytes(ANALYSIS.to_key()) == ANALYSIS
+
+@pytest.mark.parametrize("legacy", ["json", "marshal"])
+def test_legacy_rows_are_converted(db_path, legacy):
+    if legacy == "json":
+        insert_legacy(db_path, 3, json.dumps(ANALYSIS.to_dict()), None)
+    else:
+        blob = bytes((FORMAT_MARSHAL_ZLIB,)) + zlib.compress(marshal.dumps(ANALYSIS.to_tuple()))
+        insert_legacy(db_path, 4, "", blob)
+    store = AnalysisStore(db_path)
+    record = next(store.iter_analyses())
+    store.close()
+    assert record['analysis'] == ANALYSIS
+    conn = sqlite3.connect(db_path)
+    blob = conn.execute("SELECT analysis_blob FROM analyses").fetchone()[0]
+    conn.close()
+    assert blob[0] == FORMAT_JSON_ZLIB
+
+def test_unreadable_row_keeps_json(db_path):
+    insert_legacy(db_path, 3, json.dumps({"overallScore": 1}), None)
+    AnalysisStore(db_path).close()
+    conn = sqlite3.connect(db_path)
+    analysis_json, blob = conn.execute("SELECT analysis_json, analysis_blob FROM analyses").fetchone()
+    conn.close()
+    assert blob is None
+    assert json.loads(analysis_json) == {"overallScore": 1}
@@ -0,0 +1,76 @@
+"""
+Testes do daemon de ingestão por pasta
+"""
+
+import os
+
+import pytest
+
+from storage import AnalysisStore
+from watcher import WatchDaemon, error_path, is_processed, result_path
+from worker import build_router
+
+CV_TEXT = (
+    "Maria Souza\n"
+    "Desenvolvedora Python com 5 anos de experiência em APIs e dados.\n"
+    "Experiência: Empresa X (2019-2024) - APIs REST, PostgreSQL, Docker.\n"
+    "Formação: Bacharelado em Ciência da Computação (2018).\n"
+)
+
+class FailingRouter:
+    """Roteador que falha como a API com a cota esgotada"""
+    
+    def analyze_many(self, contents):
+        raise ConnectionError("429 quota")
+
+@pytest.fixture
+def store(tmp_path):
+    store = AnalysisStore(str(tmp_path / "smartcv.db"))
+    yield store
+    store.close()
+
+@pytest.fixture
+def inbox(tmp_path):
+    directory = tmp_path / "inbox"
+    directory.mkdir()
+    return directory
+
+def test_transient_failure_is_retried(inbox, store):
+    path = str(inbox / "cv.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(CV_TEXT)
+    
+    daemon = WatchDaemon(str(inbox), FailingRouter(), store, {"max_retries": 0})
+    daemon.run(once=True)
+    assert daemon.failed == 1
+    assert os.path.exists(error_path(path))
+    assert not os.path.exists(result_path(path))
+    assert not is_processed(path)
+    
+    daemon = WatchDaemon(str(inbox), build_router(0.0), store)
+    daemon.run(once=True)
+    assert daemon.processed == 1
+    assert is_processed(path)
+    assert not os.path.exists(error_path(path))
+
+def test_transient_failure_schedules_retry(inbox, store):
+    path = str(inbox / "cv.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(CV_TEXT)
+    
+    daemon = WatchDaemon(str(inbox), FailingRouter(), store, {"max_retries": 2, "retry_delay": 0.0})
+    daemon.run(once=True)
+    assert daemon.failed == 0
+    assert os.path.abspath(path) in daemon._retries
+
+def test_invalid_file_is_not_retried(inbox, store):
+    path = str(inbox / "short.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("curto")
+    
+    daemon = WatchDaemon(str(inbox), FailingRouter(), store)
+    daemon.run(once=True)
+    assert daemon.failed == 1
+    assert is_processed(path)
+    assert not os.path.exists(error_path(path))
+    assert not WatchDaemon(str(inbox), FailingRouter(), store).submit(path)
@@ -0,0 +1,43 @@
+"""
+Testes do worker distribuído sobre a fila em memória
+"""
+
+import pytest
+
+from jobqueue import InMemoryJobQueue, STATUS_DONE, STATUS_FAILED
+from storage import AnalysisStore
+from worker import Worker, build_router, enqueue_text
+
+CV_TEXT = (
+    "João Lima\n"
+    "Analista de dados com experiência em SQL, Python e painéis de BI.\n"
+    "Experiência: Empresa Y (2020-2024) - modelagem, ETL e relatórios.\n"
+    "Formação: Bacharelado em Estatística (2019).\n"
+)
+
+@pytest.fixture
+def store(tmp_path):
+    store = AnalysisStore(str(tmp_path / "smartcv.db"))
+    yield store
+    store.close()
+
+def make_worker(job_queue, store):
+    return Worker(job_queue, build_router(0.0), store, worker_id="w", concurrency=2, config={"poll_interval": 0.01})
+
+def test_drains_queue(store):
+    job_queue = InMemoryJobQueue()
+    enqueue_text(job_queue, CV_TEXT, "joao.txt")
+    enqueue_text(job_queue, "curto", "vazio.txt")
+    make_worker(job_queue, store).run(drain=True)
+    statuses = sorted(job_queue.get(job_id)['status'] for job_id in list(job_queue._jobs))
+    assert statuses == [STATUS_DONE, STATUS_FAILED]
+    assert job_queue.pending() == 0
+
+def test_reprocessed_job_reuses_analysis(store):
+    job_queue = InMemoryJobQueue()
+    enqueue_text(job_queue, CV_TEXT, "joao.txt")
+    worker = make_worker(job_queue, store)
+    job = job_queue.lease("w")
+    first = worker.process(job)
+    second = worker.process(job)
+    assert second == {"analysis_id": first['analysis_id'], "reused": True}
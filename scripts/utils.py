@@ -3,13 +3,18 @@ Utilitários para o SmartCV com Google Gemini
 """
 
 import streamlit as st
-import PyPDF2
+import numpy as np
 import io
 import json
 import re
+import bisect
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 
+from config import SCORE_THRESHOLDS
+from metrics import timed
+
+@timed("extract_text_from_pdf")
 def extract_text_from_pdf(pdf_file) -> Optional[str]:
     """
     Extrai texto de um arquivo PDF com tratamento robusto de erros
@@ -20,6 +25,8 @@ def extract_text_from_pdf(pdf_file) -> Optional[str]:
     Returns:
         str: Texto extraído ou None se houver erro
     """
+    import PyPDF2
+    
     try:
         pdf_reader = PyPDF2.PdfReader(pdf_file)
         text = ""
@@ -59,6 +66,7 @@ def extract_text_from_pdf(pdf_file) -> Optional[str]:
         st.error(f"❌ Erro ao processar PDF: {str(e)}")
         return None
 
+@timed("clean_extracted_text")
 def clean_extracted_text(text: str) -> str:
     """
     Limpa e normaliza texto extraído de PDFs
@@ -148,6 +156,93 @@ def validate_content(content: str) -> Tuple[bool, str]:
     
     return True, ""
 
+# Apresentação de cada faixa de pontuação (chaves de SCORE_THRESHOLDS)
+SCORE_LEVELS = {
+    "excellent": {
+        "emoji": "🟢",
+        "color": "#34a853",
+        "level": "Excelente",
+        "class": "score-excellent",
+        "description": "Currículo excepcional!"
+    },
+    "very_good": {
+        "emoji": "🟢",
+        "color": "#34a853",
+        "level": "Muito Bom",
+        "class": "score-excellent",
+        "description": "Currículo muito bem estruturado"
+    },
+    "good": {
+        "emoji": "🟡",
+        "color": "#fbbc04",
+        "level": "Bom",
+        "class": "score-good",
+        "description": "Bom currículo com potencial"
+    },
+    "regular": {
+        "emoji": "🟡",
+        "color": "#fbbc04",
+        "level": "Regular",
+        "class": "score-good",
+        "description": "Currículo adequado, mas pode melhorar"
+    },
+    "poor": {
+        "emoji": "🔴",
+        "color": "#ea4335",
+        "level": "Precisa Melhorar",
+        "class": "score-poor",
+        "description": "Currículo precisa de melhorias importantes"
+    }
+}
+
+# Limites inferiores em ordem crescente e a faixa correspondente a cada um
+LEVEL_KEYS = sorted(SCORE_THRESHOLDS, key=SCORE_THRESHOLDS.get)
+LEVEL_BOUNDS = [SCORE_THRESHOLDS[key] for key in LEVEL_KEYS]
+
+def get_level_index(score: float) -> int:
+    """
+    Retorna o índice da faixa da pontuação em LEVEL_KEYS
+    
+    Args:
+        score: Pontuação (0-100)
+        
+    Returns:
+        int: Índice da faixa (0 = pior)
+    """
+    return max(bisect.bisect_right(LEVEL_BOUNDS, score) - 1, 0)
+
+def get_level_key(score: float) -> str:
+    """Retorna a chave da faixa da pontuação (ex.: 'very_good')"""
+    return LEVEL_KEYS[get_level_index(score)]
+
+def classify_scores(scores) -> np.ndarray:
+    """
+    Classifica um vetor de pontuações de uma só vez
+    
+    Args:
+        scores: Sequência ou array de pontuações (0-100)
+        
+    Returns:
+        np.ndarray: Índices das faixas em LEVEL_KEYS
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    indices = np.searchsorted(LEVEL_BOUNDS, scores, side='right') - 1
+    return np.clip(indices, 0, len(LEVEL_KEYS) - 1)
+
+def label_scores(scores, field: str = "level") -> np.ndarray:
+    """
+    Rotula um vetor de pontuações com um campo de SCORE_LEVELS
+    
+    Args:
+        scores: Sequência ou array de pontuações (0-100)
+        field: Campo de apresentação ('level', 'emoji', 'class', ...)
+        
+    Returns:
+        np.ndarray: Rótulos na mesma ordem das pontuações
+    """
+    labels = np.array([SCORE_LEVELS[key][field] for key in LEVEL_KEYS], dtype=object)
+    return labels[classify_scores(scores)]
+
 def format_score_display(score: int) -> Dict[str, str]:
     """
     Formata a exibição da pontuação
@@ -158,46 +253,7 @@ def format_score_display(score: int) -> Dict[str, str]:
     Returns:
         dict: Informações de formatação
     """
-    if score >= 90:
-        return {
-            "emoji": "🟢",
-            "color": "#34a853",
-            "level": "Excelente",
-            "class": "score-excellent",
-            "description": "Currículo excepcional!"
-        }
-    elif score >= 80:
-        return {
-            "emoji": "🟢", 
-            "color": "#34a853",
-            "level": "Muito Bom",
-            "class": "score-excellent",
-            "description": "Currículo muito bem estruturado"
-        }
-    elif score >= 70:
-        return {
-            "emoji": "🟡",
-            "color": "#fbbc04",
-            "level": "Bom",
-            "class": "score-good",
-            "description": "Bom currículo com potencial"
-        }
-    elif score >= 60:
-        return {
-            "emoji": "🟡",
-            "color": "#fbbc04",
-            "level": "Regular",
-            "class": "score-good",
-            "description": "Currículo adequado, mas pode melhorar"
-        }
-    else:
-        return {
-            "emoji": "🔴",
-            "color": "#ea4335",
-            "level": "Precisa Melhorar",
-            "class": "score-poor",
-            "description": "Currículo precisa de melhorias importantes"
-        }
+    return dict(SCORE_LEVELS[get_level_key(score)])
 
 def validate_analysis_response(response_text: str) -> Tuple[bool, Optional[Dict[str, Any]], str]:
     """
@@ -408,6 +464,24 @@ Classificação: {format_score_display(analysis['overallScore'])['level']}
 SmartCV - Powered by Google Gemini
         """
 
+FINAL_RECOMMENDATIONS = {
+    "excellent": """
+🎉 EXCELENTE! Seu currículo está em estado excepcional. Continue refinando os pequenos detalhes e mantendo-o sempre atualizado. Você está no caminho certo para se destacar no mercado de trabalho.
+        """,
+    "very_good": """
+👍 MUITO BOM! Seu currículo tem uma base sólida e está bem estruturado. Implemente as sugestões apresentadas para alcançar a excelência e se destacar ainda mais no processo seletivo.
+        """,
+    "good": """
+📈 BOM POTENCIAL! Seu currículo tem uma boa base, mas há oportunidades claras de melhoria. Foque nas sugestões de maior impacto para aumentar significativamente sua competitividade.
+        """,
+    "regular": """
+⚠️ ATENÇÃO NECESSÁRIA! Seu currículo precisa de melhorias importantes. Dedique tempo para implementar as sugestões apresentadas, especialmente nas áreas com menor pontuação.
+        """,
+    "poor": """
+🚨 REVISÃO URGENTE! Seu currículo precisa de uma reformulação significativa. Recomendamos focar primeiro na estrutura básica e clareza, depois nas palavras-chave e detalhes específicos.
+        """
+}
+
 def get_final_recommendation(score: int) -> str:
     """
     Retorna recomendação final baseada na pontuação
@@ -418,26 +492,7 @@ def get_final_recommendation(score: int) -> str:
     Returns:
         str: Recomendação personalizada
     """
-    if score >= 90:
-        return """
-🎉 EXCELENTE! Seu currículo está em estado excepcional. Continue refinando os pequenos detalhes e mantendo-o sempre atualizado. Você está no caminho certo para se destacar no mercado de trabalho.
-        """
-    elif score >= 80:
-        return """
-👍 MUITO BOM! Seu currículo tem uma base sólida e está bem estruturado. Implemente as sugestões apresentadas para alcançar a excelência e se destacar ainda mais no processo seletivo.
-        """
-    elif score >= 70:
-        return """
-📈 BOM POTENCIAL! Seu currículo tem uma boa base, mas há oportunidades claras de melhoria. Foque nas sugestões de maior impacto para aumentar significativamente sua competitividade.
-        """
-    elif score >= 60:
-        return """
-⚠️ ATENÇÃO NECESSÁRIA! Seu currículo precisa de melhorias importantes. Dedique tempo para implementar as sugestões apresentadas, especialmente nas áreas com menor pontuação.
-        """
-    else:
-        return """
-🚨 REVISÃO URGENTE! Seu currículo precisa de uma reformulação significativa. Recomendamos focar primeiro na estrutura básica e clareza, depois nas palavras-chave e detalhes específicos.
-        """
+    return FINAL_RECOMMENDATIONS[get_level_key(score)]
 
 def get_content_statistics(content: str) -> Dict[str, Any]:
     """
@@ -0,0 +1,569 @@
+"""
+Daemon de ingestão: observa uma pasta e analisa os currículos que chegam, em estágios encadeados
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import select
+import signal
+import struct
+import hashlib
+import argparse
+import tempfile
+import threading
+import ctypes
+import ctypes.util
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+from analysis_model import Analysis
+from archive import TextArchive
+from config import ALLOWED_FILE_TYPES, ARCHIVE_CONFIG, PACKING_CONFIG, SEARCH_CONFIG, STORAGE_CONFIG, WATCH_CONFIG
+from metrics import REGISTRY
+from pipeline import extract_pdf_text
+from router import ModelRouter
+from scheduler import PRIORITY_BATCH, priority_context
+from search import SearchIndex
+from storage import AnalysisStore
+from utils import clean_extracted_text, validate_content, validate_file
+from worker import build_router
+
+REGISTRY.describe("smartcv_watch_files_total", "counter", "Arquivos da pasta observada processados por resultado")
+REGISTRY.describe("smartcv_watch_queue_depth", "gauge", "Itens aguardando em cada estágio do daemon")
+
+# Eventos inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+# Marca de encerramento que percorre as filas entre os estágios
+_STOP = object()
+
+class LocalFile:
+    """Arquivo em disco com a interface de UploadedFile usada por validate_file"""
+    
+    MIME_TYPES = {"pdf": "application/pdf", "txt": "text/plain"}
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.size = os.path.getsize(path)
+        self.type = self.MIME_TYPES.get(file_extension(path), "application/octet-stream")
+    
+    def getvalue(self) -> bytes:
+        """Conteúdo binário do arquivo"""
+        with open(self.path, 'rb') as f:
+            return f.read()
+    
+    read = getvalue
+
+def file_extension(path: str) -> str:
+    """Extensão do arquivo em minúsculas, sem o ponto"""
+    return os.path.splitext(path)[1].lower().lstrip('.')
+
+def result_path(path: str) -> str:
+    """Caminho do resultado gravado ao lado do arquivo de entrada"""
+    return path + WATCH_CONFIG["result_suffix"]
+
+def error_path(path: str) -> str:
+    """Caminho do registro de falha temporária gravado ao lado do arquivo de entrada"""
+    return path + WATCH_CONFIG["error_suffix"]
+
+def is_transient(error: Exception) -> bool:
+    """
+    Indica se vale tentar o arquivo de novo
+    
+    Arquivo inválido ou ilegível (ValueError/OSError) falha sempre igual; falhas
+    de rede e do modelo (cota esgotada, timeout, resposta inesperada) passam.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return not isinstance(error, (ValueError, OSError))
+
+def is_candidate(path: str) -> bool:
+    """Indica se o arquivo é um currículo a analisar (ignora ocultos, temporários e resultados)"""
+    name = os.path.basename(path)
+    return not name.startswith('.') and file_extension(name) in ALLOWED_FILE_TYPES
+
+def is_processed(path: str) -> bool:
+    """
+    Indica se já existe resultado mais recente que o arquivo de entrada
+    
+    Falhas temporárias ficam em error_path() e não contam: o arquivo volta a
+    ser analisado na próxima varredura ou reinício do daemon.
+    """
+    try:
+        return os.path.getmtime(result_path(path)) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+def list_candidates(directory: str) -> List[str]:
+    """Currículos presentes na pasta (sem subpastas), em ordem de nome"""
+    with os.scandir(directory) as entries:
+        return sorted(entry.path for entry in entries if entry.is_file() and is_candidate(entry.path))
+
+def write_atomic(path: str, text: str):
+    """
+    Grava um arquivo de forma atômica (temporário na mesma pasta + rename)
+    
+    Quem lê a pasta (ex.: o ATS) nunca encontra um resultado pela metade.
+    
+    Args:
+        path: Caminho final
+        text: Conteúdo
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp cria com 0600; o resultado precisa ser legível por quem consome a pasta
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+class InotifyWatcher:
+    """Observa a pasta com inotify (Linux), sem dependências externas"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify indisponível nesta plataforma")
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        # Só arquivos completos: fechados após escrita ou movidos para a pasta
+        watch = libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if watch < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch falhou em {directory}")
+    
+    def wait(self, timeout: float) -> List[str]:
+        """
+        Aguarda arquivos novos
+        
+        Args:
+            timeout: Espera máxima (s)
+        
+        Returns:
+            list: Caminhos dos arquivos concluídos desde a última chamada
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Eventos perdidos: varre a pasta inteira
+                paths.extend(list_candidates(self.directory))
+            elif name and not mask & IN_ISDIR:
+                paths.append(os.path.join(self.directory, os.fsdecode(name)))
+        return paths
+    
+    def close(self):
+        """Libera o descritor do inotify"""
+        os.close(self._fd)
+
+class PollingWatcher:
+    """
+    Observa a pasta por varredura periódica
+    
+    Um arquivo só é entregue quando tamanho e data de modificação ficam iguais
+    em duas varreduras seguidas (cópia concluída). Funciona em pastas de rede
+    (NFS/SMB), onde o inotify não recebe eventos de outras máquinas.
+    """
+    
+    def __init__(self, directory: str, interval: Optional[float] = None):
+        self.directory = directory
+        self.interval = interval or WATCH_CONFIG["poll_interval"]
+        self._seen: Dict[str, Tuple[int, int]] = {}
+        self._reported: Dict[str, Tuple[int, int]] = {}
+    
+    def wait(self, timeout: float) -> List[str]:
+        """Aguarda até a próxima varredura e retorna os arquivos estáveis ainda não entregues"""
+        time.sleep(min(timeout, self.interval))
+        current = {}
+        for path in list_candidates(self.directory):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            current[path] = (stat.st_size, stat.st_mtime_ns)
+        ready = [
+            path for path, signature in current.items()
+            if self._seen.get(path) == signature and self._reported.get(path) != signature
+        ]
+        for path in ready:
+            self._reported[path] = current[path]
+        self._seen = current
+        self._reported = {path: self._reported[path] for path in self._reported if path in current}
+        return ready
+    
+    def close(self):
+        pass
+
+def open_watcher(directory: str, mode: Optional[str] = None):
+    """
+    Cria o observador da pasta
+    
+    Args:
+        directory: Pasta observada
+        mode: 'inotify', 'poll' ou 'auto' (inotify quando disponível)
+    
+    Returns:
+        InotifyWatcher ou PollingWatcher
+    """
+    mode = mode or WATCH_CONFIG["mode"]
+    if mode == "poll":
+        return PollingWatcher(directory)
+    try:
+        return InotifyWatcher(directory)
+    except (OSError, AttributeError):
+        if mode == "inotify":
+            raise
+        return PollingWatcher(directory)
+
+class WatchDaemon:
+    """
+    Processa os currículos que chegam em uma pasta
+    
+    Cada arquivo passa por estágios encadeados por filas limitadas:
+    validação (validate_file) -> extração -> limpeza -> análise -> gravação.
+    Os estágios rodam em threads próprias e se sobrepõem: enquanto um lote
+    aguarda o modelo, os próximos arquivos já estão sendo extraídos. Quando um
+    estágio fica para trás, a fila cheia bloqueia o anterior (contrapressão)
+    em vez de acumular arquivos em memória.
+    
+    O resultado é gravado atomicamente ao lado da entrada (<arquivo>.smartcv.json)
+    e a análise vai para o AnalysisStore com o hash do arquivo como chave de
+    origem, então reiniciar o daemon não repete chamadas ao modelo. Arquivos
+    inválidos também recebem esse resultado, com o campo "error". Falhas
+    temporárias (ex.: cota da API) vão para <arquivo>.smartcv.error.json e o
+    arquivo é reenviado com espera crescente, até WATCH_CONFIG["max_retries"].
+    """
+    
+    def __init__(self, directory: str, router: ModelRouter, store: AnalysisStore,
+                 config: Optional[Dict[str, Any]] = None, watcher=None,
+                 search_index: Optional[SearchIndex] = None, archive: Optional[TextArchive] = None):
+        self.directory = os.path.abspath(directory)
+        self.router = router
+        self.store = store
+        self.search_index = search_index
+        self.archive = archive
+        self.config = {**WATCH_CONFIG, **(config or {})}
+        self.watcher = watcher
+        self.processed = 0
+        self.failed = 0
+        self._inflight: Dict[str, bool] = {}
+        self._retries: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        size = self.config["queue_size"]
+        self._queues = {name: queue.Queue(maxsize=size) for name in ("validate", "extract", "clean", "analyze", "write")}
+        self._stages = [
+            ("validate", self._validate, "extract", 1),
+            ("extract", self._extract, "clean", self.config["extract_workers"]),
+            ("clean", self._clean, "analyze", 1),
+            ("analyze", None, "write", self.config["analyze_workers"]),
+            ("write", None, None, 1)
+        ]
+        self._threads: List[Tuple[str, List[threading.Thread]]] = []
+    
+    def submit(self, path: str, attempt: int = 0) -> bool:
+        """
+        Coloca um arquivo na fila de validação (bloqueia se o pipeline estiver cheio)
+        
+        Args:
+            path: Caminho do arquivo
+            attempt: Novas tentativas já feitas após falha temporária
+        
+        Returns:
+            bool: False se o arquivo foi ignorado (já processado ou em andamento)
+        """
+        path = os.path.abspath(path)
+        if not is_candidate(path) or not os.path.isfile(path) or is_processed(path):
+            return False
+        with self._lock:
+            if path in self._inflight:
+                return False
+            self._inflight[path] = True
+        self._put("validate", {"path": path, "filename": os.path.basename(path), "attempt": attempt,
+                              "started": time.perf_counter()})
+        return True
+    
+    def _submit_due_retries(self):
+        """Reenvia os arquivos com falha temporária cuja espera terminou"""
+        now = time.monotonic()
+        with self._lock:
+            due = [path for path, (when, _) in self._retries.items() if when <= now]
+            attempts = {path: self._retries.pop(path)[1] for path in due}
+        for path, attempt in attempts.items():
+            self.submit(path, attempt)
+    
+    def _put(self, stage: str, item: Any):
+        """Entrega um item ao estágio e atualiza a métrica de profundidade"""
+        self._queues[stage].put(item)
+        REGISTRY.set_gauge("smartcv_watch_queue_depth", self._queues[stage].qsize(), stage=stage)
+    
+    def _validate(self, item: Dict[str, Any]):
+        """Valida o arquivo e reaproveita a análise se o mesmo conteúdo já foi analisado"""
+        local_file = LocalFile(item['path'])
+        is_valid, message = validate_file(local_file)
+        if not is_valid:
+            raise ValueError(message)
+        item['data'] = local_file.getvalue()
+        item['file_id'] = hashlib.sha256(item['data']).hexdigest()
+        existing = self.store.find_by_source(item['file_id'])
+        if existing is not None:
+            record = self.store.get_analysis(existing)
+            if record is not None:
+                item.update(analysis=record['analysis'], analysis_id=existing, reused=True)
+    
+    def _extract(self, item: Dict[str, Any]):
+        """Extrai o texto bruto (CPU)"""
+        data = item.pop('data')
+        if file_extension(item['path']) == 'pdf':
+            item['raw_text'] = extract_pdf_text(data)
+        else:
+            item['content'] = data.decode("utf-8", errors="replace")
+    
+    def _clean(self, item: Dict[str, Any]):
+        """Limpa o texto extraído do PDF e valida o conteúdo"""
+        if 'raw_text' in item:
+            item['content'] = clean_extracted_text(item.pop('raw_text'))
+        is_valid, message = validate_content(item['content'])
+        if not is_valid:
+            raise ValueError(message)
+    
+    def _stage_loop(self, name: str, handler: Callable[[Dict[str, Any]], None], next_stage: str):
+        """Laço de uma thread de estágio: itens com erro ou já analisados seguem adiante"""
+        inbox = self._queues[name]
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                inbox.put(_STOP)
+                return
+            if 'error' not in item and 'analysis' not in item:
+                try:
+                    handler(item)
+                except Exception as e:
+                    item['error'] = str(e) if isinstance(e, (ValueError, OSError)) else f"{type(e).__name__}: {e}"
+                    item['retry'] = is_transient(e)
+            self._put(next_stage, item)
+    
+    def _analyze_loop(self):
+        """
+        Laço de uma thread de análise
+        
+        Junta os itens já disponíveis na fila (até PACKING_CONFIG["max_items"])
+        para que currículos curtos sigam em uma única chamada ao modelo.
+        """
+        inbox = self._queues["analyze"]
+        limit = PACKING_CONFIG["max_items"] if PACKING_CONFIG["enabled"] else 1
+        stopping = False
+        while not stopping:
+            first = inbox.get()
+            if first is _STOP:
+                inbox.put(_STOP)
+                return
+            group = [first]
+            while len(group) < limit:
+                try:
+                    item = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    inbox.put(_STOP)
+                    stopping = True
+                    break
+                group.append(item)
+            
+            pending = [item for item in group if 'error' not in item and 'analysis' not in item]
+            if pending:
+                with priority_context(PRIORITY_BATCH):
+                    try:
+                        routed_items = self.router.analyze_many([item['content'] for item in pending])
+                    except Exception as e:
+                        routed_items = [e] * len(pending)
+                for item, routed in zip(pending, routed_items):
+                    if isinstance(routed, Exception):
+                        item['error'] = f"{type(routed).__name__}: {routed}"
+                        item['retry'] = is_transient(routed)
+                    else:
+                        item.update(analysis=routed.analysis, model=routed.model)
+            for item in group:
+                self._put("write", item)
+    
+    def _write_loop(self):
+        """Grava a análise no banco e o resultado ao lado do arquivo de entrada"""
+        inbox = self._queues["write"]
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                return
+            try:
+                self._write(item)
+            except Exception as e:
+                item.update(error=f"{type(e).__name__}: {e}", retry=True)
+                print(f"⚠️ {item['filename']}: {item['error']}", file=sys.stderr)
+            status = "error" if 'error' in item else "reused" if item.get('reused') else "done"
+            if status == "error" and item.get('retry') and item['attempt'] < self.config["max_retries"]:
+                status = "retry"
+            REGISTRY.increment("smartcv_watch_files_total", status=status)
+            with self._lock:
+                self._inflight.pop(item['path'], None)
+                if status == "retry":
+                    delay = self.config["retry_delay"] * 2 ** item['attempt']
+                    self._retries[item['path']] = (time.monotonic() + delay, item['attempt'] + 1)
+                elif status == "error":
+                    self.failed += 1
+                else:
+                    self.processed += 1
+    
+    def _write(self, item: Dict[str, Any]):
+        """Monta e grava o resultado de um arquivo (ou o registro da falha temporária)"""
+        result: Dict[str, Any] = {
+            "file": item['filename'],
+            "processed_at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(time.perf_counter() - item['started'], 3)
+        }
+        if 'error' in item:
+            result["error"] = item['error']
+            if item.get('retry'):
+                result["attempt"] = item['attempt'] + 1
+                write_atomic(error_path(item['path']), json.dumps(result, ensure_ascii=False, indent=2))
+                return
+        else:
+            analysis = Analysis.coerce(item['analysis'])
+            if 'analysis_id' not in item:
+                item['analysis_id'] = self.store.save_analysis(
+                    analysis, item['filename'], item['content'], source_key=item['file_id']
+                )
+                if self.search_index is not None:
+                    self.search_index.add(item['content'])
+                if self.archive is not None:
+                    self.archive.add_analysis(item['content'], analysis)
+            result.update(analysis_id=item['analysis_id'], model=item.get('model'),
+                          reused=bool(item.get('reused')), analysis=analysis.to_dict())
+        write_atomic(result_path(item['path']), json.dumps(result, ensure_ascii=False, indent=2))
+        try:
+            os.remove(error_path(item['path']))
+        except FileNotFoundError:
+            pass
+    
+    def start(self):
+        """Inicia as threads dos estágios"""
+        for name, handler, next_stage, workers in self._stages:
+            if name == "analyze":
+                target, args = self._analyze_loop, ()
+            elif name == "write":
+                target, args = self._write_loop, ()
+            else:
+                target, args = self._stage_loop, (name, handler, next_stage)
+            threads = [
+                threading.Thread(target=target, args=args, name=f"smartcv-watch-{name}-{i}", daemon=True)
+                for i in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+            self._threads.append((name, threads))
+    
+    def drain(self):
+        """Encerra os estágios em ordem, depois de processar tudo o que já entrou"""
+        for name, threads in self._threads:
+            self._queues[name].put(_STOP)
+            for thread in threads:
+                thread.join()
+        self._threads = []
+    
+    def pending(self) -> int:
+        """Arquivos ainda em algum estágio"""
+        with self._lock:
+            return len(self._inflight)
+    
+    def run(self, once: bool = False):
+        """
+        Executa o daemon
+        
+        Os arquivos já presentes na pasta e sem resultado atualizado são
+        processados primeiro; depois, os que chegarem e os que falharam por
+        motivo temporário, após a espera.
+        
+        Args:
+            once: Processar apenas os arquivos já presentes e encerrar (sem novas tentativas)
+        """
+        self.start()
+        try:
+            for path in list_candidates(self.directory):
+                self.submit(path)
+            if once:
+                return
+            self.watcher = self.watcher or open_watcher(self.directory, self.config["mode"])
+            while not self._stop.is_set():
+                for path in self.watcher.wait(1.0):
+                    self.submit(path)
+                self._submit_due_retries()
+        finally:
+            self.drain()
+            if self.watcher is not None:
+                self.watcher.close()
+    
+    def stop(self):
+        """Pede o encerramento (os arquivos em andamento são concluídos)"""
+        self._stop.set()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Linha de comando do daemon"""
+    parser = argparse.ArgumentParser(description="Observa uma pasta e analisa os currículos que chegam")
+    parser.add_argument("directory", help="Pasta onde o ATS deposita os currículos")
+    parser.add_argument("--db", default=STORAGE_CONFIG["db_path"], help="Banco de análises")
+    parser.add_argument("--mode", choices=["auto", "inotify", "poll"], default=WATCH_CONFIG["mode"])
+    parser.add_argument("--once", action="store_true", help="Processar os arquivos existentes e encerrar")
+    parser.add_argument("--fake-latency", type=float, default=None,
+                        help="Usar o Gemini simulado com esta latência (s)")
+    args = parser.parse_args(argv)
+    
+    if not os.path.isdir(args.directory):
+        parser.error(f"Pasta não encontrada: {args.directory}")
+    
+    store = AnalysisStore(args.db)
+    search_index = SearchIndex() if SEARCH_CONFIG["enabled"] else None
+    archive = TextArchive() if ARCHIVE_CONFIG["enabled"] else None
+    daemon = WatchDaemon(args.directory, build_router(args.fake_latency), store, {"mode": args.mode},
+                         search_index=search_index, archive=archive)
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    start = time.perf_counter()
+    try:
+        daemon.run(once=args.once)
+    except KeyboardInterrupt:
+        daemon.stop()
+    elapsed = time.perf_counter() - start
+    print(f"{daemon.processed} arquivo(s) processado(s), {daemon.failed} com erro, em {elapsed:.1f}s")
+    if search_index is not None:
+        search_index.close()
+    if archive is not None:
+        archive.close()
+    store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+"""
+Worker distribuído do SmartCV: consome trabalhos de extração e análise de uma fila compartilhada
+"""
+
+import os
+import sys
+import time
+import socket
+import hashlib
+import argparse
+import threading
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+from archive import TextArchive
+from concurrency import AdaptiveLimiter
+from config import (ALLOWED_FILE_TYPES, ARCHIVE_CONFIG, DEDUP_CONFIG, GEMINI_API_KEY, PACKING_CONFIG, SEARCH_CONFIG, STORAGE_CONFIG,
+                    WORKER_CONFIG)
+from dedup import DuplicateIndex
+from jobqueue import Job, open_queue
+from metrics import REGISTRY, request_trace
+from pipeline import AnalysisError, extract_text
+from profiler import profile_request
+from router import ModelRouter, build_fake_models, build_gemini_models, routing_tiers
+from scheduler import PRIORITY_BATCH, priority_context
+from search import SearchIndex
+from storage import AnalysisStore, content_hash
+from utils import validate_content
+
+REGISTRY.describe("smartcv_worker_jobs_total", "counter", "Trabalhos processados pelo worker por resultado")
+REGISTRY.describe("smartcv_worker_leases_lost_total", "counter", "Trabalhos cuja posse expirou durante o processamento")
+REGISTRY.describe("smartcv_dedup_hits_total", "counter", "Currículos quase duplicados encontrados no modo lote")
+
+class Worker:
+    """
+    Processo worker que toma posse de trabalhos da fila e grava as análises
+    
+    Cada worker roda `concurrency` threads que pegam trabalhos da fila e uma
+    thread de heartbeat que renova a posse dos trabalhos em andamento. A
+    gravação usa o id do trabalho como chave idempotente no AnalysisStore:
+    se o trabalho for reprocessado (posse expirada, worker reiniciado), a
+    análise existente é reaproveitada em vez de duplicada. As chamadas ao
+    modelo passam pelo limitador adaptativo do worker com prioridade de lote.
+    
+    Cada thread toma posse de até PACKING_CONFIG["max_items"] trabalhos de uma
+    vez para que os currículos curtos sigam juntos em uma única chamada.
+    
+    Com um índice de duplicatas, currículos quase idênticos a um já analisado
+    não chamam o modelo: a análise existente é copiada ('reuse') ou o trabalho
+    apenas aponta para ela ('skip'), conforme DEDUP_CONFIG["batch_action"].
+    """
+    
+    def __init__(self, queue, router: ModelRouter, store: AnalysisStore,
+                 worker_id: Optional[str] = None, concurrency: Optional[int] = None,
+                 config: Optional[Dict[str, Any]] = None, duplicates: Optional[DuplicateIndex] = None,
+                 search_index: Optional[SearchIndex] = None, archive: Optional[TextArchive] = None):
+        self.queue = queue
+        self.router = router
+        self.store = store
+        self.duplicates = duplicates
+        self.search_index = search_index
+        self.archive = archive
+        self.config = {**WORKER_CONFIG, **(config or {})}
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = concurrency or self.config["concurrency"]
+        self.processed = 0
+        self._inflight: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+    
+    def _prepare(self, job: Job) -> Tuple[Optional[Dict[str, Any]], str, Any]:
+        """
+        Extrai e valida o texto de um trabalho, resolvendo repetições sem chamar o modelo
+        
+        Args:
+            job: Trabalho em posse deste worker
+        
+        Returns:
+            tuple: (resultado pronto ou None, texto do currículo, assinatura MinHash)
+        
+        Raises:
+            ValueError: Se o arquivo não puder ser analisado (erro definitivo)
+        """
+        existing = self.store.find_by_source(job.job_id)
+        if existing is not None:
+            return {"analysis_id": existing, "reused": True}, "", None
+        
+        payload = job.payload
+        if 'content' in payload:
+            content = payload['content']
+        else:
+            with open(payload['path'], 'rb') as f:
+                data = f.read()
+            file_type = os.path.splitext(payload['path'])[1].lower().lstrip('.')
+            if file_type not in ALLOWED_FILE_TYPES:
+                raise ValueError(f"Tipo de arquivo não suportado: {file_type}")
+            content = extract_text(data, file_type)
+        
+        is_valid, message = validate_content(content)
+        if not is_valid:
+            raise ValueError(message)
+        
+        signature = None
+        if self.duplicates is not None:
+            signature = self.duplicates.hasher.signature(content)
+            duplicate = self._handle_duplicate(job, content, signature)
+            if duplicate is not None:
+                return duplicate, content, signature
+        return None, content, signature
+    
+    def process_batch(self, jobs: List[Job]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Extrai o texto e analisa os currículos de vários trabalhos
+        
+        Os currículos que precisam do modelo vão juntos para o roteador, que
+        envia os curtos em uma única chamada (PACKING_CONFIG).
+        
+        Args:
+            jobs: Trabalhos em posse deste worker
+        
+        Returns:
+            list: Para cada trabalho, o resultado gravado na fila ou a exceção
+        """
+        outcomes: List[Union[Dict[str, Any], Exception, None]] = [None] * len(jobs)
+        pending = []
+        for index, job in enumerate(jobs):
+            try:
+                result, content, signature = self._prepare(job)
+            except Exception as e:
+                outcomes[index] = e
+                continue
+            if result is not None:
+                outcomes[index] = result
+            else:
+                pending.append((index, content, signature))
+        if not pending:
+            return outcomes
+        
+        with priority_context(PRIORITY_BATCH):
+            routed_items = self.router.analyze_many([content for _, content, _ in pending])
+        for (index, content, signature), routed in zip(pending, routed_items):
+            if isinstance(routed, Exception):
+                outcomes[index] = routed
+                continue
+            try:
+                analysis_id = self.store.save_analysis(
+                    routed.analysis, jobs[index].payload.get('filename', ''), content, source_key=jobs[index].job_id
+                )
+                if self.duplicates is not None:
+                    self.duplicates.add(content, analysis_id, signature)
+                if self.search_index is not None:
+                    self.search_index.add(content)
+                if self.archive is not None:
+                    self.archive.add_analysis(content, routed.analysis)
+            except Exception as e:
+                outcomes[index] = e
+                continue
+            outcomes[index] = {"analysis_id": analysis_id, "model": routed.model}
+        return outcomes
+    
+    def process(self, job: Job) -> Dict[str, Any]:
+        """
+        Extrai o texto e analisa o currículo de um trabalho
+        
+        Args:
+            job: Trabalho em posse deste worker
+        
+        Returns:
+            dict: Resultado gravado na fila (id da análise e modelo usado)
+        
+        Raises:
+            ValueError: Se o arquivo não puder ser analisado (erro definitivo)
+            AnalysisError: Se o modelo não produzir uma análise válida
+        """
+        outcome = self.process_batch([job])[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    
+    def _handle_duplicate(self, job: Job, content: str, signature) -> Optional[Dict[str, Any]]:
+        """
+        Reaproveita a análise de um currículo quase idêntico, se houver
+        
+        Args:
+            job: Trabalho em posse deste worker
+            content: Texto do currículo
+            signature: Assinatura MinHash do texto
+        
+        Returns:
+            dict: Resultado do trabalho ou None se o currículo precisar ser analisado
+        """
+        action = self.duplicates.config["batch_action"]
+        if action not in ("reuse", "skip"):
+            return None
+        match = self.duplicates.find_analyzed(content, signature=signature)
+        if match is None:
+            return None
+        record = self.store.get_analysis(match.analysis_id)
+        if record is None:
+            return None
+        
+        REGISTRY.increment("smartcv_dedup_hits_total", action=action)
+        result = {"duplicate_of": match.analysis_id, "similarity": round(match.similarity, 3)}
+        if action == "skip":
+            self.duplicates.add(content, None, signature)
+            return result
+        analysis_id = self.store.save_analysis(
+            record['analysis'], job.payload.get('filename', ''), content, source_key=job.job_id
+        )
+        self.duplicates.add(content, analysis_id, signature)
+        if self.search_index is not None:
+            self.search_index.add(content)
+        return {"analysis_id": analysis_id, **result}
+    
+    def _record(self, job: Job, outcome: Union[Dict[str, Any], Exception]):
+        """Registra na fila o desfecho de um trabalho"""
+        if isinstance(outcome, (ValueError, OSError)):
+            self.queue.fail(job, str(outcome), retry=False)
+            REGISTRY.increment("smartcv_worker_jobs_total", status="invalid")
+        elif isinstance(outcome, AnalysisError):
+            self.queue.fail(job, str(outcome), max_attempts=self.config["max_attempts"])
+            REGISTRY.increment("smartcv_worker_jobs_total", status="error")
+        elif isinstance(outcome, Exception):
+            self.queue.fail(job, f"{type(outcome).__name__}: {outcome}", max_attempts=self.config["max_attempts"])
+            REGISTRY.increment("smartcv_worker_jobs_total", status="error")
+        elif self.queue.complete(job, outcome):
+            REGISTRY.increment("smartcv_worker_jobs_total", status="done")
+            with self._lock:
+                self.processed += 1
+        else:
+            # Outro worker reassumiu o trabalho; a gravação idempotente evita duplicatas
+            REGISTRY.increment("smartcv_worker_leases_lost_total")
+    
+    def _handle(self, jobs: List[Job]):
+        """Processa os trabalhos e registra o desfecho de cada um na fila"""
+        with self._lock:
+            for job in jobs:
+                self._inflight[job.job_id] = job
+        try:
+            with request_trace(jobs[0].job_id[:12]) as trace, profile_request(trace.request_id):
+                try:
+                    outcomes = self.process_batch(jobs)
+                except Exception as e:
+                    outcomes = [e] * len(jobs)
+            for job, outcome in zip(jobs, outcomes):
+                self._record(job, outcome)
+        finally:
+            with self._lock:
+                for job in jobs:
+                    self._inflight.pop(job.job_id, None)
+    
+    def _lease_group(self) -> List[Job]:
+        """Toma posse de até PACKING_CONFIG["max_items"] trabalhos para enviar em lote"""
+        size = PACKING_CONFIG["max_items"] if PACKING_CONFIG["enabled"] else 1
+        jobs: List[Job] = []
+        while len(jobs) < size:
+            job = self.queue.lease(self.worker_id, self.config["lease_seconds"], self.config["max_attempts"])
+            if job is None:
+                break
+            jobs.append(job)
+        return jobs
+    
+    def _loop(self, drain: bool):
+        """Laço de uma thread: toma posse e processa trabalhos até ser parada"""
+        while not self._stop.is_set():
+            jobs = self._lease_group()
+            if not jobs:
+                if drain and self.queue.pending() == 0:
+                    return
+                self._stop.wait(self.config["poll_interval"])
+                continue
+            self._handle(jobs)
+    
+    def _heartbeat_loop(self):
+        """Renova periodicamente a posse dos trabalhos em andamento"""
+        while not self._stop.wait(self.config["heartbeat_interval"]):
+            with self._lock:
+                jobs = list(self._inflight.values())
+            for job in jobs:
+                self.queue.heartbeat(job, self.config["lease_seconds"])
+    
+    def run(self, drain: bool = False):
+        """
+        Executa o worker
+        
+        Args:
+            drain: Encerrar quando não houver mais trabalhos pendentes na fila
+        """
+        threads = [
+            threading.Thread(target=self._loop, args=(drain,), name=f"smartcv-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="smartcv-heartbeat", daemon=True)
+        heartbeat.start()
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)
+        finally:
+            self._stop.set()
+            heartbeat.join()
+    
+    def stop(self):
+        """Pede o encerramento após os trabalhos em andamento"""
+        self._stop.set()
+
+def file_job_id(path: str) -> str:
+    """
+    Chave idempotente de um arquivo: hash SHA-256 do conteúdo binário
+    
+    Args:
+        path: Caminho do arquivo
+    
+    Returns:
+        str: Hash hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def enqueue_paths(queue, paths: List[str], priority: str = PRIORITY_BATCH) -> int:
+    """
+    Enfileira arquivos de currículo (diretórios são percorridos recursivamente)
+    
+    O caminho gravado no trabalho precisa ser acessível por todos os workers
+    (armazenamento compartilhado).
+    
+    Args:
+        queue: Fila de trabalhos
+        paths: Arquivos ou diretórios
+        priority: Classe de prioridade
+    
+    Returns:
+        int: Número de trabalhos novos
+    """
+    created = 0
+    for path in paths:
+        if os.path.isdir(path):
+            files = [
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in sorted(names)
+            ]
+        else:
+            files = [path]
+        for file_path in files:
+            if os.path.splitext(file_path)[1].lower().lstrip('.') not in ALLOWED_FILE_TYPES:
+                continue
+            payload = {"path": os.path.abspath(file_path), "filename": os.path.basename(file_path)}
+            created += queue.enqueue(file_job_id(file_path), payload, priority)
+    return created
+
+def enqueue_text(queue, content: str, filename: str = "", priority: str = PRIORITY_BATCH) -> bool:
+    """Enfileira um currículo já extraído (chave: hash do texto)"""
+    return queue.enqueue(content_hash(content), {"content": content, "filename": filename}, priority)
+
+def build_router(fake_latency: Optional[float] = None, limiter: Optional[AdaptiveLimiter] = None) -> ModelRouter:
+    """
+    Monta o roteador de modelos do worker
+    
+    Args:
+        fake_latency: Se informado, usa o substituto local do Gemini com esta latência
+        limiter: Limitador adaptativo compartilhado pelas threads do worker
+    
+    Returns:
+        ModelRouter: Roteador pronto para uso
+    """
+    limiter = limiter or AdaptiveLimiter()
+    if fake_latency is not None:
+        return ModelRouter(build_fake_models(fake_latency, limiter), routing_tiers())
+    if not GEMINI_API_KEY:
+        raise SystemExit("GEMINI_API_KEY não configurada (use --fake-latency para testar sem a API)")
+    return ModelRouter(build_gemini_models(GEMINI_API_KEY, limiter), routing_tiers())
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Linha de comando: enqueue, run e status"""
+    parser = argparse.ArgumentParser(description="Worker distribuído do SmartCV")
+    parser.add_argument("--queue", default=WORKER_CONFIG["queue_path"], help="Banco SQLite da fila compartilhada")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    enqueue_parser = commands.add_parser("enqueue", help="Enfileira arquivos ou diretórios")
+    enqueue_parser.add_argument("paths", nargs="+")
+    
+    run_parser = commands.add_parser("run", help="Processa trabalhos da fila")
+    run_parser.add_argument("--db", default=STORAGE_CONFIG["db_path"], help="Banco de análises")
+    run_parser.add_argument("--concurrency", type=int, default=WORKER_CONFIG["concurrency"])
+    run_parser.add_argument("--worker-id", default=None)
+    run_parser.add_argument("--drain", action="store_true", help="Encerrar quando a fila esvaziar")
+    run_parser.add_argument("--fake-latency", type=float, default=None,
+                            help="Usar o Gemini simulado com esta latência (s)")
+    
+    commands.add_parser("status", help="Mostra a quantidade de trabalhos por estado")
+    
+    args = parser.parse_args(argv)
+    queue = open_queue(args.queue)
+    
+    if args.command == "enqueue":
+        created = enqueue_paths(queue, args.paths)
+        print(f"{created} trabalho(s) enfileirado(s); pendentes: {queue.pending()}")
+    elif args.command == "status":
+        for status, total in queue.stats().items():
+            print(f"{status:>8}: {total}")
+    else:
+        store = AnalysisStore(args.db)
+        duplicates = DuplicateIndex(args.db) if DEDUP_CONFIG["enabled"] else None
+        search_index = SearchIndex() if SEARCH_CONFIG["enabled"] else None
+        archive = TextArchive() if ARCHIVE_CONFIG["enabled"] else None
+        worker = Worker(queue, build_router(args.fake_latency), store, args.worker_id, args.concurrency,
+                        duplicates=duplicates, search_index=search_index, archive=archive)
+        start = time.perf_counter()
+        try:
+            worker.run(drain=args.drain)
+        except KeyboardInterrupt:
+            worker.stop()
+        elapsed = time.perf_counter() - start
+        print(f"[{worker.worker_id}] {worker.processed} análise(s) em {elapsed:.1f}s "
+              f"({worker.processed / elapsed if elapsed else 0:.2f}/s)")
+        store.close()
+        if duplicates is not None:
+            duplicates.close()
+        if search_index is not None:
+            search_index.close()
+        if archive is not None:
+            archive.close()
+    queue.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())